@@ -12,7 +12,6 @@ Uses the OOP architecture with ABC pattern for consistent, maintainable code.
 import os
 import sys
 import argparse
-import json
 import csv
 from datetime import datetime
 from typing import List, Type
@@ -29,6 +28,14 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from src.databases import MongoBenchmark, ArangoBenchmark, RavenBenchmark
 from src.base import DatabaseBenchmark
+from src.base.benchmark_base import MUTATION_MODES
+from src.base.codec import CODECS, get_codec
+from src.base.ingestion import CSV_ENGINES, is_jsonl
+from src.base.parse_benchmark import compare_csv_engines
+from src.base.query_model import INDEX_MODES, Aggregate, Comparison, Contains, Index, Or, Query, TextQuery, TextSearch
+from src.base.load_generator import LOAD_MODES
+from src.base.statistics import differs_significantly
+from src.base.workloads import DISTRIBUTIONS, WORKLOADS
 
 
 # ============================================================================
@@ -45,6 +52,102 @@ DATASETS = [
     (os.path.join(DATA_DIR, 'amazon_reviews.csv'), 'amazon', 'Amazon'),
 ]
 
+# Queries per collection, compiled by each backend to MQL, AQL or RQL ('match' drives reads,
+# updates and the load generator; every other query is measured as its own "Query" phase)
+DATASET_QUERIES = {
+    'goodreads': {
+        'match': Query(where=Or(
+            Comparison('rating', '>=', 3),
+            Contains('review_text', ['Fantastic', 'suspense', 'story'])
+        )),
+        'most_voted': Query(
+            where=Comparison('rating', '>=', 4),
+            select=['review_id', 'book_id', 'n_votes'],
+            sort=[('n_votes', False)],
+            limit=100
+        ),
+    },
+    'amazon': {
+        'match': Query(where=Or(
+            Comparison('Score', '>', 4),
+            Contains('Summary', ['good'])
+        )),
+        'most_helpful': Query(
+            where=Comparison('Score', '==', 5),
+            select=['ProductId', 'UserId', 'HelpfulnessNumerator'],
+            sort=[('HelpfulnessNumerator', False)],
+            limit=100
+        ),
+    },
+}
+
+# Secondary indexes per collection, built (and timed) by the index phase before the query phases.
+# They serve the declared Query phases; 'match' ORs in a substring match no B-tree index can serve
+DATASET_INDEXES = {
+    'goodreads': [
+        Index('rating', ['rating']),
+        Index('n_votes', ['n_votes']),
+        Index('book_id', ['book_id']),
+    ],
+    'amazon': [
+        Index('Score', ['Score']),
+        Index('HelpfulnessNumerator', ['HelpfulnessNumerator']),
+        Index('ProductId', ['ProductId']),
+    ],
+}
+
+# Full-text searches per collection, run against each database's native text index (--text-search)
+DATASET_TEXT_SEARCHES = {
+    'goodreads': TextSearch(['review_text'], {
+        'term': TextQuery('suspense'),
+        'phrase': TextQuery('page turner', phrase=True),
+        'multi_term': TextQuery('fantastic suspense story'),
+    }),
+    'amazon': TextSearch(['Summary'], {
+        'term': TextQuery('delicious'),
+        'phrase': TextQuery('highly recommend', phrase=True),
+        'multi_term': TextQuery('good great tasty'),
+    }),
+}
+
+# Analytical aggregations per collection (--analytics): Mongo pipelines, AQL COLLECT, RavenDB map-reduce indexes
+DATASET_AGGREGATIONS = {
+    'goodreads': {
+        'avg_rating_per_book': Query(
+            group_by='book_id',
+            aggregates={'reviews': Aggregate('count'), 'avg_rating': Aggregate('avg', 'rating')}
+        ),
+        'rating_histogram': Query(
+            group_by='rating',
+            aggregates={'reviews': Aggregate('count')},
+            sort=[('rating', True)]
+        ),
+        'reviews_per_user': Query(
+            group_by='user_id',
+            aggregates={'reviews': Aggregate('count')},
+            then=Query(group_by='reviews', aggregates={'users': Aggregate('count')}, sort=[('reviews', True)])
+        ),
+    },
+    'amazon': {
+        'top_products': Query(
+            group_by='ProductId',
+            aggregates={'reviews': Aggregate('count'), 'avg_score': Aggregate('avg', 'Score')},
+            sort=[('reviews', False)],
+            limit=100
+        ),
+        'score_histogram': Query(
+            group_by='Score',
+            aggregates={'reviews': Aggregate('count')},
+            sort=[('Score', True)]
+        ),
+        'reviews_per_user': Query(
+            group_by='UserId',
+            aggregates={'reviews': Aggregate('count')},
+            then=Query(group_by='reviews', aggregates={'users': Aggregate('count')}, sort=[('reviews', True)])
+        ),
+    },
+}
+
 # Database configurations (credentials from environment variables)
 DB_CONFIGS = {
     'mongodb': {
@@ -79,12 +182,13 @@ DB_CONFIGS = {
 }
 
 
-def run_single_benchmark(db_name: str) -> dict:
+def run_single_benchmark(db_name: str, options: dict = None) -> dict:
     """
     Run benchmark for a single database.
     
     Args:
         db_name: Database identifier (mongodb, arangodb, ravendb)
+        options: Run options forwarded to DatabaseBenchmark.configure
         
     Returns:
         Dictionary containing benchmark metrics
@@ -103,15 +207,25 @@ def run_single_benchmark(db_name: str) -> dict:
     print(f"{'='*70}")
     
     benchmark = benchmark_class(**kwargs)
+    benchmark.configure(
+        queries=DATASET_QUERIES,
+        indexes=DATASET_INDEXES,
+        text_searches=DATASET_TEXT_SEARCHES,
+        aggregations=DATASET_AGGREGATIONS,
+        **(options or {})
+    )
     benchmark.run_full_benchmark(DATASETS)
     
     return benchmark.metrics
 
 
-def run_all_benchmarks() -> dict:
+def run_all_benchmarks(options: dict = None) -> dict:
     """
     Run benchmarks for all configured databases.
     
+    Args:
+        options: Run options forwarded to DatabaseBenchmark.configure
+    
     Returns:
         Dictionary mapping database names to their metrics
     """
@@ -119,7 +233,7 @@ def run_all_benchmarks() -> dict:
     
     for db_name in DB_CONFIGS:
         try:
-            metrics = run_single_benchmark(db_name)
+            metrics = run_single_benchmark(db_name, options)
             all_results[db_name] = metrics
         except Exception as e:
             print(f"\nError running {db_name} benchmark: {e}")
@@ -130,10 +244,58 @@ def run_all_benchmarks() -> dict:
     return all_results
 
 
+LATENCY_COLUMNS = ('p50_ms', 'p95_ms', 'p99_ms', 'p999_ms')
+STATISTICS_COLUMNS = ('stddev', 'ci_low', 'ci_high')
+CLIENT_COLUMNS = ('cpu_percent', 'rss_peak_mb')
+IO_COLUMNS = ('net_rx_bytes', 'net_tx_bytes', 'disk_read_bytes', 'disk_write_bytes', 'disk_read_iops', 'disk_write_iops')
+
+
+def primary_latency(data: dict) -> dict:
+    """Return the latency percentiles of an operation's most frequent request series."""
+    series = data.get('latency') or {}
+    if not series:
+        return {}
+    return max(series.values(), key=lambda stats: stats.get('count', 0))
+
+
+def run_durations(data: dict) -> list:
+    """Return the per-run durations of a repeated operation (a single value otherwise)."""
+    runs = data.get('runs')
+    if runs:
+        return [run['duration_seconds'] for run in runs]
+    return [data['duration_seconds']] if 'duration_seconds' in data else []
+
+
+def compare_to_fastest(op: str, results: dict) -> tuple:
+    """
+    Find the fastest database for an operation and the ones not significantly slower.
+    
+    Returns:
+        (fastest database or '', databases whose difference from it is not significant)
+    """
+    durations = {
+        db: run_durations(metrics[op]) for db, metrics in results.items()
+        if isinstance(metrics, dict) and op in metrics and run_durations(metrics[op])
+    }
+    if not durations:
+        return '', []
+    fastest = min(durations, key=lambda db: sum(durations[db]) / len(durations[db]))
+    ties = [
+        db for db, values in durations.items()
+        if db != fastest and not differs_significantly(durations[fastest], values)
+    ]
+    return fastest, ties
+
+
 def generate_comparative_report(results: dict) -> str:
     """
     Generate a comparative CSV report from all benchmark results.
     
+    Repeated operations report their mean duration with its standard deviation
+    and bootstrap CI; the last columns name the fastest database and the
+    databases whose difference from it is not statistically significant (with
+    single runs every difference is reported as not significant).
+    
     Args:
         results: Dictionary of results from all databases
         
@@ -158,6 +320,12 @@ def generate_comparative_report(results: dict) -> str:
         header = ['Operation']
         for db in results.keys():
             header.extend([f'{db}_duration_s', f'{db}_cpu_avg', f'{db}_ram_mb'])
+            header.extend(f'{db}_duration_{column}' for column in STATISTICS_COLUMNS)
+            header.extend(f'{db}_{column}' for column in LATENCY_COLUMNS)
+            header.extend(f'{db}_{column}' for column in IO_COLUMNS)
+            header.append(f'{db}_disk_write_bytes_per_doc')
+            header.extend(f'{db}_client_{column}' for column in CLIENT_COLUMNS)
+        header.extend(['fastest', 'not_significant_vs_fastest'])
         writer.writerow(header)
         
         # Data rows
@@ -169,14 +337,61 @@ def generate_comparative_report(results: dict) -> str:
                     row.append(data.get('duration_seconds', 'N/A'))
                     row.append(data.get('resources', {}).get('container_cpu_avg', 'N/A'))
                     row.append(data.get('resources', {}).get('container_mem_avg_mb', 'N/A'))
+                    stats = data.get('statistics', {})
+                    row.extend(stats.get(column, 'N/A') for column in STATISTICS_COLUMNS)
+                    latency = primary_latency(data)
+                    row.extend(latency.get(column, 'N/A') for column in LATENCY_COLUMNS)
+                    resources = data.get('resources', {})
+                    row.extend(
+                        'N/A' if resources.get(column) is None else resources[column] for column in IO_COLUMNS
+                    )
+                    per_doc = data.get('bytes_per_document', {}).get('disk_write')
+                    row.append('N/A' if per_doc is None else per_doc)
+                    client = data.get('client', {})
+                    row.extend(
+                        'N/A' if client.get(column) is None else client[column] for column in CLIENT_COLUMNS
+                    )
                 else:
-                    row.extend(['N/A', 'N/A', 'N/A'])
+                    row.extend(['N/A'] * (
+                        3 + len(STATISTICS_COLUMNS) + len(LATENCY_COLUMNS) + len(IO_COLUMNS) + 1 + len(CLIENT_COLUMNS)
+                    ))
+            fastest, ties = compare_to_fastest(op, results)
+            row.extend([fastest, ';'.join(ties)])
             writer.writerow(row)
     
     print(f"\nComparative report saved to: {report_path}")
     return report_path
 
 
+def run_csv_reader_comparison(json_codec: str = 'auto') -> str:
+    """
+    Compare the CSV reader engines on every CSV dataset, without any database.
+    
+    Args:
+        json_codec: Codec writing the results file (see src.base.codec)
+    
+    Returns:
+        Path to the JSON results file
+    """
+    results = {}
+    for file_path, _, label in DATASETS:
+        if is_jsonl(file_path):
+            continue
+        if not os.path.exists(file_path):
+            print(f"Dataset not found: {file_path}")
+            continue
+        results[label] = compare_csv_engines(file_path)
+    
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    report_path = os.path.join(RESULTS_DIR, f'csv_reader_benchmark_{timestamp}.json')
+    with open(report_path, 'wb') as f:
+        f.write(get_codec(json_codec).dumps_pretty(results))
+    
+    print(f"\nCSV reader comparison saved to: {report_path}")
+    return report_path
+
+
 def main():
     """Main entry point with CLI argument parsing."""
     parser = argparse.ArgumentParser(
@@ -188,6 +403,21 @@ Examples:
   python main.py --db mongodb       # Run only MongoDB benchmark
   python main.py --db arangodb ravendb  # Run ArangoDB and RavenDB
   python main.py --list             # List available databases
+  python main.py --parse-workers 4  # Parse JSONL imports in 4 worker processes
+  python main.py --dataset-cache    # Import from pre-parsed dataset copies in data/.cache
+  python main.py --writers 1 4 8    # Repeat each import with 1, 4 and 8 concurrent writers
+  python main.py --adaptive-batch   # Tune import batch sizes from measured latency
+  python main.py --csv-engine arrow # Read CSV datasets with PyArrow
+  python main.py --compare-csv-readers  # Compare pandas vs PyArrow CSV parsing only
+  python main.py --json-codec stdlib    # Force the standard library JSON codec
+  python main.py --trace-allocations    # Add tracemalloc peaks and allocation counts to the client metrics
+  python main.py --repetitions 5 --warmup 1  # Repeat CRUD 5 times after 1 warmup run
+  python main.py --load-test --load-workers 16  # Closed-loop query load from 16 workers
+  python main.py --load-test --load-mode open --load-rates 50 100 200  # Fixed arrival rates
+  python main.py --ycsb a b c --ycsb-distribution uniform  # YCSB-style mixed workloads
+  python main.py --point-reads --multi-get-sizes 10 100  # Gets and multi-gets by primary key
+  python main.py --index-mode both  # Query phases without, then with secondary indexes
+  python main.py --text-search      # Full-text index build and ranked term/phrase searches
         """
     )
     
@@ -210,7 +440,204 @@ Examples:
         help='Skip comparative report generation'
     )
     
+    parser.add_argument(
+        '--parse-workers',
+        type=int,
+        default=1,
+        help='Worker processes used to parse JSONL datasets during import (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--dataset-cache',
+        action='store_true',
+        help='Parse each dataset once into data/.cache and import from the pre-parsed copy'
+    )
+    
+    parser.add_argument(
+        '--writers',
+        nargs='+',
+        type=int,
+        default=[1],
+        help='Concurrent writer counts for imports; each count is measured separately (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--adaptive-batch',
+        action='store_true',
+        help='Adapt import batch sizes to measured per-batch latency instead of fixed sizes'
+    )
+    
+    parser.add_argument(
+        '--csv-engine',
+        choices=list(CSV_ENGINES),
+        default='pandas',
+        help='CSV reader used for imports (default: pandas; arrow requires pyarrow)'
+    )
+    
+    parser.add_argument(
+        '--compare-csv-readers',
+        action='store_true',
+        help='Benchmark CSV parse throughput and peak RSS of each engine, then exit'
+    )
+    
+    parser.add_argument(
+        '--json-codec',
+        choices=list(CODECS),
+        default='auto',
+        help='JSON codec for import, export and results (default: auto = orjson > ujson > stdlib)'
+    )
+    
+    parser.add_argument(
+        '--trace-allocations',
+        action='store_true',
+        help='Trace client allocations with tracemalloc (slower; adds peak traced memory and allocation counts per phase)'
+    )
+    
+    parser.add_argument(
+        '--repetitions',
+        type=int,
+        default=1,
+        help='Measured runs of each CRUD phase, summarized with mean/stddev/bootstrap CI (default: 1)'
+    )
+    
+    parser.add_argument(
+        '--warmup',
+        type=int,
+        default=0,
+        help='Unmeasured warmup runs before the measured CRUD runs (default: 0)'
+    )
+    
+    parser.add_argument(
+        '--load-test',
+        action='store_true',
+        help='Replay each dataset query from concurrent workers after the import'
+    )
+    
+    parser.add_argument(
+        '--load-mode',
+        choices=list(LOAD_MODES),
+        default='closed',
+        help='closed = max throughput, open = fixed arrival rates from --load-rates (default: closed)'
+    )
+    
+    parser.add_argument(
+        '--load-workers',
+        type=int,
+        default=4,
+        help='Concurrent load-generator workers (default: 4)'
+    )
+    
+    parser.add_argument(
+        '--load-duration',
+        type=float,
+        default=10.0,
+        help='Seconds of load per level (default: 10)'
+    )
+    
+    parser.add_argument(
+        '--load-rates',
+        nargs='+',
+        type=float,
+        default=[],
+        help='Target requests/second for open-loop load, one measured level per rate'
+    )
+    
+    parser.add_argument(
+        '--ycsb',
+        nargs='+',
+        choices=list(WORKLOADS),
+        default=[],
+        help='YCSB-style workloads to run after the export, using --load-workers and --load-duration'
+    )
+    
+    parser.add_argument(
+        '--ycsb-distribution',
+        choices=list(DISTRIBUTIONS),
+        default=None,
+        help='Key distribution for all workloads (default: zipfian, latest for workload d)'
+    )
+    
+    parser.add_argument(
+        '--ycsb-records',
+        type=int,
+        default=100000,
+        help='Existing record keys sampled as the workload key space (default: 100000)'
+    )
+    
+    parser.add_argument(
+        '--point-reads',
+        action='store_true',
+        help='Fetch keys sampled during the import by primary key, singly and in multi-get batches'
+    )
+    
+    parser.add_argument(
+        '--point-read-keys',
+        type=int,
+        default=10000,
+        help='Keys sampled uniformly during each import for the point reads (default: 10000)'
+    )
+    
+    parser.add_argument(
+        '--multi-get-sizes',
+        nargs='+',
+        type=int,
+        default=[100],
+        help='Keys per multi-get request, one measured phase per size (default: 100)'
+    )
+    
+    parser.add_argument(
+        '--fetch-all',
+        action='store_true',
+        help='Add a phase fetching every document matching the dataset query to the client '
+             '(the CRUD read phase only counts matches on the server)'
+    )
+    
+    parser.add_argument(
+        '--mutation-mode',
+        choices=list(MUTATION_MODES),
+        default='client',
+        help='Run CRUD updates and deletes by round-tripping documents through the client (client), '
+             'as set-based server statements (server), or both, one CRUD phase each (default: client)'
+    )
+    
+    parser.add_argument(
+        '--index-mode',
+        choices=list(INDEX_MODES),
+        default='indexed',
+        help='Build the declared secondary indexes before the query phases (indexed), skip them (none) '
+             'or run the query phases without and then with them (both) (default: indexed)'
+    )
+    
+    parser.add_argument(
+        '--text-search',
+        action='store_true',
+        help='Build a native full-text index per dataset and measure relevance-ranked searches'
+    )
+    
+    parser.add_argument(
+        '--text-search-runs',
+        type=int,
+        default=20,
+        help='Times each text search is repeated for its latency percentiles (default: 20)'
+    )
+    
+    parser.add_argument(
+        '--analytics',
+        action='store_true',
+        help='Measure the declared aggregations (per-group averages, histograms, distributions) '
+             'with their server memory peak'
+    )
+    
+    parser.add_argument(
+        '--aggregation-runs',
+        type=int,
+        default=5,
+        help='Times each aggregation is repeated for its latency percentiles (default: 5)'
+    )
+    
     args = parser.parse_args()
+    if args.load_test and args.load_mode == 'open' and not args.load_rates:
+        parser.error("--load-mode open requires --load-rates")
     
     if args.list:
         print("Available databases:")
@@ -218,18 +645,52 @@ Examples:
             print(f"  - {db}")
         return
     
+    if args.compare_csv_readers:
+        run_csv_reader_comparison(args.json_codec)
+        return
+    
     print(f"\n{'='*70}")
     print("DATABASE BENCHMARKING SUITE")
     print(f"Started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print(f"{'='*70}")
     
+    options = {
+        'parse_workers': max(1, args.parse_workers),
+        'use_dataset_cache': args.dataset_cache,
+        'import_writers': [max(1, w) for w in args.writers],
+        'adaptive_batching': args.adaptive_batch,
+        'csv_engine': args.csv_engine,
+        'json_codec': args.json_codec,
+        'trace_allocations': args.trace_allocations,
+        'repetitions': max(1, args.repetitions),
+        'warmup': max(0, args.warmup),
+        'load_test': args.load_test,
+        'load_mode': args.load_mode,
+        'load_workers': max(1, args.load_workers),
+        'load_duration': args.load_duration,
+        'load_rates': args.load_rates,
+        'ycsb_workloads': args.ycsb,
+        'ycsb_distribution': args.ycsb_distribution,
+        'ycsb_records': max(1, args.ycsb_records),
+        'point_reads': args.point_reads,
+        'point_read_keys': max(1, args.point_read_keys),
+        'multi_get_sizes': [max(1, size) for size in args.multi_get_sizes],
+        'fetch_all': args.fetch_all,
+        'mutation_mode': args.mutation_mode,
+        'index_mode': args.index_mode,
+        'full_text_search': args.text_search,
+        'text_search_runs': max(1, args.text_search_runs),
+        'analytics': args.analytics,
+        'aggregation_runs': max(1, args.aggregation_runs),
+    }
+    
     # Run benchmarks
     if args.db:
         results = {}
         for db in args.db:
-            results[db] = run_single_benchmark(db)
+            results[db] = run_single_benchmark(db, options)
     else:
-        results = run_all_benchmarks()
+        results = run_all_benchmarks(options)
     
     # Generate report
     if not args.no_report and any(
@@ -246,8 +707,8 @@ Examples:
     
     # Save combined results
     combined_path = os.path.join(RESULTS_DIR, 'all_metrics.json')
-    with open(combined_path, 'w') as f:
-        json.dump(results, f, indent=2)
+    with open(combined_path, 'wb') as f:
+        f.write(get_codec(args.json_codec).dumps_pretty(results))
     print(f"All metrics saved to: {combined_path}")
 
 
@@ -1,6 +1,25 @@
-# src/base/__init__.py
 """Base classes for database benchmarking."""
 from .benchmark_base import DatabaseBenchmark
 from .resource_monitor import DockerResourceMonitor
+from .client_monitor import ClientResourceMonitor
+from .ingestion import IngestionPipeline
+from .dataset_cache import DatasetCache
+from .adaptive_batch import AdaptiveBatcher
+from .latency import LatencyHistogram
+from .load_generator import LoadGenerator
+from .workloads import Workload, WorkloadRunner
+from .sampling import ReservoirSampler
 
-__all__ = ['DatabaseBenchmark', 'DockerResourceMonitor']
+__all__ = [
+    'DatabaseBenchmark',
+    'DockerResourceMonitor',
+    'ClientResourceMonitor',
+    'IngestionPipeline',
+    'DatasetCache',
+    'AdaptiveBatcher',
+    'LatencyHistogram',
+    'LoadGenerator',
+    'Workload',
+    'WorkloadRunner',
+    'ReservoirSampler',
+]
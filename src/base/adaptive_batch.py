@@ -0,0 +1,116 @@
+"""
+Adaptive Batch Sizing - Picks insert batch sizes from measured round-trip latency.
+
+The batcher hill-climbs on observed throughput: it keeps scaling the batch
+size in the same direction while documents per second improve and reverses
+when they drop. Payload bytes cap the size so large documents never exceed
+the server's message limits.
+"""
+import json
+import statistics
+import threading
+from typing import Any, Dict, List, Tuple
+
+
+class AdaptiveBatcher:
+    """Thread-safe hill-climbing controller for the ingestion batch size."""
+
+    def __init__(
+        self,
+        initial_size: int = 10000,
+        min_size: int = 500,
+        max_size: int = 100000,
+        max_bytes: int = 32 * 1024 * 1024,
+        growth: float = 1.5,
+        samples_per_step: int = 3
+    ):
+        """
+        Initialize the batcher.
+
+        Args:
+            initial_size: Starting batch size (documents)
+            min_size: Smallest batch size the batcher may choose
+            max_size: Largest batch size the batcher may choose
+            max_bytes: Upper bound on the estimated payload of one batch
+            growth: Multiplicative step applied when changing the size
+            samples_per_step: Batches observed at a size before deciding the next step
+        """
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.growth = growth
+        self.samples_per_step = samples_per_step
+        self._size = max(min_size, min(initial_size, max_size))
+        self._direction = 1
+        self._samples: List[float] = []
+        self._previous_throughput = 0.0
+        self._avg_doc_bytes = 0.0
+        self._history: List[Tuple[int, float]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def batch_size(self) -> int:
+        """Current batch size in documents."""
+        return self._size
+
+    @staticmethod
+    def estimate_bytes(batch: List[Dict[str, Any]], sample: int = 8) -> int:
+        """Estimate the encoded payload of a batch from a few sampled documents."""
+        if not batch:
+            return 0
+        step = max(1, len(batch) // sample)
+        sampled = batch[::step][:sample]
+        sampled_bytes = sum(len(json.dumps(doc, default=str)) for doc in sampled)
+        return sampled_bytes * len(batch) // len(sampled)
+
+    def observe(self, docs: int, payload_bytes: int, seconds: float) -> None:
+        """
+        Record one batch round trip and adjust the batch size.
+
+        Args:
+            docs: Number of documents in the batch
+            payload_bytes: Estimated payload size of the batch
+            seconds: Time the sink took to write the batch
+        """
+        if docs <= 0 or seconds <= 0:
+            return
+        with self._lock:
+            self._avg_doc_bytes = payload_bytes / docs
+            if docs != self._size:
+                # Batch was cut at an earlier size (still queued when the size changed)
+                return
+            self._samples.append(docs / seconds)
+            if len(self._samples) < self.samples_per_step:
+                return
+
+            throughput = statistics.median(self._samples)
+            self._history.append((self._size, round(throughput, 2)))
+            self._samples = []
+
+            if throughput < self._previous_throughput:
+                self._direction = -self._direction
+            self._previous_throughput = throughput
+
+            if self._direction > 0:
+                size = int(self._size * self.growth)
+            else:
+                size = int(self._size / self.growth)
+            if self._avg_doc_bytes > 0:
+                size = min(size, int(self.max_bytes / self._avg_doc_bytes))
+            self._size = max(self.min_size, min(size, self.max_size))
+
+    def summary(self) -> Dict[str, Any]:
+        """Return the chosen sizes and the throughput measured at each step."""
+        with self._lock:
+            history = list(self._history)
+        best_size, best_throughput = max(history, key=lambda h: h[1]) if history else (self._size, 0.0)
+        sizes = [size for size, _ in history] or [self._size]
+        return {
+            "final_batch_size": self._size,
+            "best_batch_size": best_size,
+            "best_docs_per_second": best_throughput,
+            "min_batch_size": min(sizes),
+            "max_batch_size": max(sizes),
+            "avg_doc_bytes": round(self._avg_doc_bytes, 1),
+            "history": [{"batch_size": size, "docs_per_second": tp} for size, tp in history],
+        }
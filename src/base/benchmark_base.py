@@ -5,12 +5,38 @@ This module defines the contract that all database implementations must follow,
 while providing reusable concrete methods for common operations.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
-import json
+from typing import Any, Callable, ContextManager, Dict, List, Optional, Sequence
 import os
+import random
 import time
 
+from .adaptive_batch import AdaptiveBatcher
+from .client_monitor import ClientResourceMonitor
+from .codec import JsonCodec, get_codec
+from .dataset_cache import DatasetCache
+from .ingestion import IngestionPipeline
+from .latency import LatencyHistogram
+from .query_model import SHARED_QUERIES, Index, Query, TextQuery, TextSearch
+from .load_generator import LoadGenerator
 from .resource_monitor import DockerResourceMonitor
+from .sampling import ReservoirSampler
+from .statistics import summarize
+from .workloads import WORKLOADS, KeyChooser, Workload, WorkloadRunner
+from .timing import PhaseTimer
+
+MUTATION_MODES = ('client', 'server', 'both')
+
+# Attributes configure may set; everything else (methods, metrics, connection...) is rejected
+RUN_OPTIONS = frozenset({
+    'parse_workers', 'use_dataset_cache', 'import_writers', 'adaptive_batching',
+    'csv_engine', 'json_codec', 'trace_allocations', 'repetitions', 'warmup',
+    'load_test', 'load_mode', 'load_workers', 'load_duration', 'load_rates',
+    'ycsb_workloads', 'ycsb_distribution', 'ycsb_records',
+    'queries', 'indexes', 'index_mode',
+    'text_searches', 'full_text_search', 'text_search_runs',
+    'aggregations', 'analytics', 'aggregation_runs',
+    'fetch_all', 'mutation_mode', 'point_reads', 'point_read_keys', 'multi_get_sizes',
+})
 
 
 class DatabaseBenchmark(ABC):
@@ -18,15 +44,34 @@ class DatabaseBenchmark(ABC):
     Abstract Base Class for database benchmarking.
     
     Concrete Methods (DRY - shared logic):
+        - configure: Apply run options (e.g. parse_workers) from the CLI
+        - create_pipeline: Build an IngestionPipeline honouring the run options
+          (parse workers, dataset cache, adaptive batch sizing, CSV engine, JSON codec)
+        - record_metric: Attach an extra value to the operation being measured
+        - latency: Per-request latency histogram of the operation being measured
+        - sample_inserted: Offer inserted keys to the point-read key sample
+        - dataset_query: Named query declared for a collection (see query_model)
+        - create_aggregation_indexes: Hook precomputing declared aggregations (no-op by default)
         - measure_execution_time: Times operations with resource monitoring
+        - measure_repeated: Times an operation several times after warmup runs
         - save_results: Writes benchmark results to JSON
+        - save_timeline: Writes the run's resource time series to JSON
         - run_full_benchmark: Template method orchestrating the benchmark flow
         - print_summary: Displays formatted results
     
     Abstract Methods (must be implemented by subclasses):
         - connect: Establish database connection
+        - reset_collection: Empty a collection before an import (not measured)
         - insert_data: Bulk insert documents
         - read_data: Read operations (find one, find many)
+        - count_query, run_query: Compile and run a declared Query (MQL, AQL, RQL)
+        - fetch_matches: Transfer every document matching a query to the client
+        - create_indexes: Build declared secondary indexes and report their build time and size
+        - create_text_index, text_search: Native full-text index and relevance-ranked searches
+        - open_query_worker: Per-worker connection running the dataset query (load generator)
+        - sample_keys, read_record, update_record, insert_record, scan_records:
+          Single-record operations replayed by the YCSB-style workloads
+        - read_records: Multi-get of many documents by key (point reads)
         - update_data: Update operations
         - delete_data: Delete operations
         - export_data: Export collection to file
@@ -49,16 +94,204 @@ class DatabaseBenchmark(ABC):
         self.results_dir = os.path.join(base_dir, 'results')
         self.metrics: Dict[str, Any] = {}
         self.connection: Optional[Any] = None
+        self._phase_extras: Dict[str, Any] = {}
+        self.timer = PhaseTimer()
+        self._latencies: Dict[str, LatencyHistogram] = {}
+        self.monitor: Optional[DockerResourceMonitor] = None  # Run-long sampler (see run_full_benchmark)
+        
+        # Run options (overridable through configure, see RUN_OPTIONS)
+        self.parse_workers = 1
+        self.use_dataset_cache = False
+        self.import_writers = [1]
+        self.adaptive_batching = False
+        self.csv_engine = 'pandas'
+        self.json_codec = 'auto'
+        self.trace_allocations = False
+        self.repetitions = 1
+        self.warmup = 0
+        self.load_test = False
+        self.load_mode = 'closed'
+        self.load_workers = 4
+        self.load_duration = 10.0
+        self.load_rates: list = []
+        self.ycsb_workloads: list = []
+        self.ycsb_distribution: Optional[str] = None  # None = each workload's default
+        self.ycsb_records = 100000
+        self.queries: Dict[str, Dict[str, Query]] = {}  # Named queries per collection (e.g. DATASET_QUERIES)
+        self.indexes: Dict[str, List[Index]] = {}  # Secondary indexes per collection (e.g. DATASET_INDEXES)
+        self.index_mode = 'indexed'
+        self.text_searches: Dict[str, TextSearch] = {}  # Full-text workload per collection (e.g. DATASET_TEXT_SEARCHES)
+        self.full_text_search = False
+        self.text_search_runs = 20
+        self.aggregations: Dict[str, Dict[str, Query]] = {}  # Analytical queries per collection (e.g. DATASET_AGGREGATIONS)
+        self.analytics = False
+        self.aggregation_runs = 5
+        self.fetch_all = False
+        self.mutation_mode = 'client'
+        self.point_reads = False
+        self.point_read_keys = 10000
+        self.multi_get_sizes = [100]
+        self._key_sampler: Optional[ReservoirSampler] = None
+        self._sampled_keys: Dict[str, List[Any]] = {}  # Point-read keys per collection, from the last import
+        self._batcher: Optional[AdaptiveBatcher] = None
+        self._pipeline: Optional[IngestionPipeline] = None  # Pipeline of the running import
+        self.dataset_cache = DatasetCache(os.path.join(self.data_dir, '.cache'))
         
         # Ensure results directory exists
         os.makedirs(self.results_dir, exist_ok=True)
 
     # ==================== CONCRETE METHODS (DRY) ====================
 
+    def configure(self, **options) -> None:
+        """
+        Apply run options to the benchmark.
+        
+        Args:
+            **options: Option names and values (e.g. parse_workers=4)
+            
+        Raises:
+            ValueError: If an option is not one of RUN_OPTIONS
+        """
+        unknown = sorted(set(options) - RUN_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown benchmark option(s): {', '.join(unknown)}")
+        for key, value in options.items():
+            setattr(self, key, value)
+
+    @property
+    def codec(self) -> JsonCodec:
+        """JSON codec selected by the `json_codec` option, shared by import, export and results."""
+        return get_codec(self.json_codec)
+
+    def create_pipeline(
+        self,
+        file_path: str,
+        batch_size: int,
+        clean: Optional[Callable[[dict], dict]] = None,
+        adaptive: bool = True
+    ) -> IngestionPipeline:
+        """
+        Create an ingestion pipeline configured with the run options.
+        
+        Args:
+            file_path: Path to the data file (JSON lines or CSV)
+            batch_size: Number of documents per batch
+            clean: Optional per-document transform (must be picklable for parse_workers > 1)
+            adaptive: False when the sink's per-batch latency is no server signal (e.g. it only
+                buffers client-side), so adaptive batch sizing would tune to noise
+            
+        Returns:
+            A ready-to-run IngestionPipeline
+        """
+        cache = self.dataset_cache if self.use_dataset_cache else None
+        self._batcher = AdaptiveBatcher(initial_size=batch_size) if self.adaptive_batching and adaptive else None
+        if self.adaptive_batching and not adaptive:
+            print(f"  Adaptive batching disabled for {self.db_name}: batch latency is not a server round trip")
+            self.record_metric("adaptive_batching", None)
+        self.record_metric("parse_workers", self.parse_workers)
+        self.record_metric("from_dataset_cache", bool(cache and cache.is_fresh(file_path)))
+        self.record_metric("csv_engine", self.csv_engine)
+        self.record_metric("codec", self.codec.name)
+        self._pipeline = IngestionPipeline(
+            file_path,
+            batch_size=batch_size,
+            clean=clean,
+            parse_workers=self.parse_workers,
+            cache=cache,
+            batcher=self._batcher,
+            csv_engine=self.csv_engine,
+            codec=self.json_codec,
+            timer=self.timer,
+            latency=self.latency("insert_batch")
+        )
+        return self._pipeline
+
+    def record_metric(self, key: str, value: Any) -> None:
+        """
+        Attach an extra value to the metrics of the operation currently being measured.
+        
+        Args:
+            key: Metric name
+            value: JSON-serializable value
+        """
+        self._phase_extras[key] = value
+
+    def latency(self, series: str) -> LatencyHistogram:
+        """
+        Return the latency histogram of a request series (e.g. "query", "export_page")
+        for the operation currently being measured, creating it on first use.
+        
+        Args:
+            series: Series name used as the key under `latency` in the metrics
+            
+        Returns:
+            The series' LatencyHistogram
+        """
+        histogram = self._latencies.get(series)
+        if histogram is None:
+            histogram = self._latencies.setdefault(series, LatencyHistogram())
+        return histogram
+
+    def sample_inserted(self, items: Sequence[Any], key: Optional[Callable[[Any], Any]] = None) -> None:
+        """
+        Offer the keys of an inserted batch to the point-read key sample (no-op when
+        point reads are disabled).
+        
+        Args:
+            items: Inserted documents or keys
+            key: Optional function extracting the key from an item
+        """
+        if self._key_sampler is not None:
+            self._key_sampler.add_many(items, key)
+
+    def dataset_query(self, collection_name: str, name: str = 'match') -> Query:
+        """
+        Return a query declared for a collection.
+        
+        Args:
+            collection_name: Collection the query runs on
+            name: Query name ('match' is the realistic filter used by reads, updates and load)
+            
+        Returns:
+            The declared Query
+            
+        Raises:
+            ValueError: If the collection does not declare the query
+        """
+        try:
+            return self.queries[collection_name][name]
+        except KeyError:
+            raise ValueError(f"No '{name}' query declared for collection {collection_name}") from None
+
+    def create_aggregation_indexes(self, collection_name: str, aggregations: Dict[str, Query]) -> Dict[str, Dict[str, Any]]:
+        """
+        Precompute the declared aggregations before they are queried.
+        
+        Databases aggregating at query time need nothing here; backends that serve
+        aggregations from materialized views (e.g. RavenDB map-reduce indexes) override it.
+        
+        Args:
+            collection_name: Name of the collection
+            aggregations: Aggregation name -> grouped Query
+            
+        Returns:
+            Index name -> build statistics (empty when nothing is built)
+        """
+        return {}
+
     def measure_execution_time(self, operation_name: str, func: callable, *args, **kwargs) -> Any:
         """
         Measure execution time and resource usage of an operation.
         
+        Implementations attribute their hot paths to phases through `self.timer`
+        (read, parse, encode, server, write); the per-phase seconds are stored under
+        `breakdown` next to `duration_seconds`. Per-request latencies fed to
+        `self.latency(series)` are stored as percentiles under `latency`.
+        
+        Resources are sliced out of the run-long monitor when one is running,
+        otherwise a monitor is started for this operation alone. The benchmark
+        process's own CPU time, peak RSS and allocations are stored under `client`.
+        
         Args:
             operation_name: Human-readable name for the operation
             func: The function to execute
@@ -68,10 +301,19 @@ class DatabaseBenchmark(ABC):
             The result of the function call
         """
         print(f"--- Starting {operation_name} ---")
-        monitor = DockerResourceMonitor(self.container_name)
-        monitor.start()
+        self._phase_extras = {}
+        self.timer = PhaseTimer()
+        self._latencies = {}
+        monitor = self.monitor
+        owns_monitor = monitor is None or not monitor.is_alive()
+        if owns_monitor:
+            monitor = DockerResourceMonitor(self.container_name)
+            monitor.start()
+        client_monitor = ClientResourceMonitor(trace_allocations=self.trace_allocations)
+        client_monitor.start()
 
-        start_time = time.time()
+        phase_start = monitor.elapsed()
+        start_time = time.perf_counter_ns()
         try:
             result = func(*args, **kwargs)
         except Exception as e:
@@ -79,22 +321,110 @@ class DatabaseBenchmark(ABC):
             import traceback
             traceback.print_exc()
             result = None
-        end_time = time.time()
+        end_time = time.perf_counter_ns()
+        phase_end = monitor.elapsed()
+        client = client_monitor.stop()
 
-        resources = monitor.stop()
-        duration = end_time - start_time
+        if owns_monitor:
+            resources = monitor.stop()
+        else:
+            monitor.add_phase(operation_name, phase_start, phase_end)
+            resources = monitor.summarize(phase_start, phase_end)
+        duration = (end_time - start_time) / 1e9
+        breakdown = self.timer.snapshot(duration)
+        latency = {
+            series: histogram.summary()
+            for series, histogram in self._latencies.items() if histogram.count
+        }
 
         print(f"Finished {operation_name} in {duration:.4f} seconds")
         print(f"Container Resources: CPU avg={resources['container_cpu_avg']}%, "
               f"RAM avg={resources['container_mem_avg_mb']}MB")
+        print("Container I/O: " + ", ".join(
+            f"{name}={resources[f'{name}_bytes'] / 1e6:.2f}MB" if resources.get(f'{name}_bytes') is not None
+            else f"{name}=N/A"
+            for name in ('net_rx', 'net_tx', 'disk_read', 'disk_write')
+        ))
+        print(f"Client Process: CPU={client['cpu_percent']}% of one core "
+              f"(user={client['cpu_user_seconds']}s, sys={client['cpu_system_seconds']}s), "
+              f"RSS peak={client['rss_peak_mb']}MB, allocated blocks delta={client['allocated_blocks_delta']}")
+        if 'traced_blocks_allocated' in client:
+            print(f"Client Allocations: +{client['traced_blocks_allocated']} blocks ({client['traced_allocated_mb']}MB), "
+                  f"-{client['traced_blocks_freed']} blocks ({client['traced_freed_mb']}MB)")
+        if client['saturated']:
+            print(f"WARNING: client saturated ({client['cpu_capacity_percent']}% CPU of "
+                  f"{client['active_workers']} active workers) during {operation_name}; "
+                  f"the harness, not the database, may be the bottleneck")
+        print("Time Breakdown: " + ", ".join(
+            f"{phase.replace('_seconds', '')}={seconds:.4f}s" for phase, seconds in breakdown.items()
+        ))
+        for series, stats in latency.items():
+            print(f"Latency {series}: n={stats['count']}, p50={stats['p50_ms']}ms, "
+                  f"p95={stats['p95_ms']}ms, p99={stats['p99_ms']}ms, p99.9={stats['p999_ms']}ms")
 
         self.metrics[operation_name] = {
             "duration_seconds": round(duration, 4),
-            "resources": resources
+            "breakdown": breakdown,
+            "latency": latency,
+            "resources": resources,
+            "client": client,
+            **self._phase_extras
         }
         
         return result
 
+    def measure_repeated(self, operation_name: str, func: callable, *args, **kwargs) -> Any:
+        """
+        Run an operation `warmup` times unmeasured, then measure it `repetitions` times.
+        
+        With several repetitions the metrics of the median-duration run are kept as
+        the operation's metrics, `duration_seconds` becomes the mean, `statistics`
+        summarizes the durations (mean, stddev, min, median, bootstrap CI) and
+        `runs` lists each run's duration and resources.
+        
+        Args:
+            operation_name: Human-readable name for the operation
+            func: The function to execute
+            *args, **kwargs: Arguments to pass to the function
+            
+        Returns:
+            The result of the last run
+        """
+        for i in range(self.warmup):
+            print(f"--- Warmup {i + 1}/{self.warmup}: {operation_name} ---")
+            try:
+                func(*args, **kwargs)
+            except Exception as e:
+                print(f"Error during warmup of {operation_name}: {e}")
+        
+        if self.repetitions <= 1:
+            return self.measure_execution_time(operation_name, func, *args, **kwargs)
+        
+        runs = []
+        result = None
+        for i in range(self.repetitions):
+            run_name = f"{operation_name} (run {i + 1}/{self.repetitions})"
+            result = self.measure_execution_time(run_name, func, *args, **kwargs)
+            runs.append(self.metrics.pop(run_name))
+        
+        durations = [run["duration_seconds"] for run in runs]
+        stats = summarize(durations)
+        representative = sorted(runs, key=lambda run: run["duration_seconds"])[(len(runs) - 1) // 2]
+        self.metrics[operation_name] = {
+            **representative,
+            "duration_seconds": stats["mean"],
+            "statistics": stats,
+            "warmup": self.warmup,
+            "runs": [
+                {"duration_seconds": run["duration_seconds"], "resources": run["resources"]}
+                for run in runs
+            ]
+        }
+        print(f"{operation_name}: mean={stats['mean']:.4f}s, stddev={stats['stddev']:.4f}s, "
+              f"median={stats['median']:.4f}s, {int(stats['confidence'] * 100)}% CI="
+              f"[{stats['ci_low']:.4f}, {stats['ci_high']:.4f}]s over {stats['n']} runs")
+        return result
+
     def save_results(self, suffix: str = "") -> str:
         """
         Save benchmark results to a JSON file.
@@ -108,12 +438,33 @@ class DatabaseBenchmark(ABC):
         filename = f"metrics_{self.db_name.lower()}{suffix}.json"
         results_path = os.path.join(self.results_dir, filename)
         
-        with open(results_path, "w") as f:
-            json.dump(self.metrics, f, indent=2)
+        with open(results_path, "wb") as f:
+            f.write(self.codec.dumps_pretty(self.metrics))
         
         print(f"\nMetrics saved to {results_path}")
         return results_path
 
+    def save_timeline(self, suffix: str = "") -> Optional[str]:
+        """
+        Save the run-long resource time series, with each operation's start/end, to a JSON file.
+        
+        Args:
+            suffix: Optional suffix for the filename
+            
+        Returns:
+            Path to the saved file, or None if no run-long monitor was used
+        """
+        if self.monitor is None:
+            return None
+        filename = f"timeline_{self.db_name.lower()}{suffix}.json"
+        timeline_path = os.path.join(self.results_dir, filename)
+        
+        with open(timeline_path, "wb") as f:
+            f.write(self.codec.dumps(self.monitor.timeline()))
+        
+        print(f"Resource timeline saved to {timeline_path}")
+        return timeline_path
+
     def print_summary(self) -> None:
         """Print a formatted summary of the benchmark results."""
         print("\n" + "=" * 60)
@@ -133,6 +484,9 @@ class DatabaseBenchmark(ABC):
         Args:
             datasets: List of tuples (file_path, collection_name, dataset_label)
         """
+        # One sampler covers the whole run, including work between phases (e.g. background indexing)
+        self.monitor = DockerResourceMonitor(self.container_name)
+        self.monitor.start()
         try:
             # 1. Connect
             print(f"\n{'='*60}")
@@ -148,23 +502,41 @@ class DatabaseBenchmark(ABC):
                     
                 print(f"\n=== Benchmarking {label} Dataset ===")
                 
-                # Insert
-                self.measure_execution_time(
-                    f"Import {label}",
-                    self.insert_data, file_path, collection_name
-                )
+                # Pre-parse the dataset once, outside the measured import
+                if self.use_dataset_cache:
+                    self.dataset_cache.ensure(file_path, parse_workers=self.parse_workers)
                 
-                # CRUD (Read, Update, Delete)
-                self.measure_execution_time(
-                    f"CRUD {label}",
-                    self._run_crud, collection_name
-                )
+                # Insert (once per configured writer count; the last import feeds the next phases)
+                for writers in self.import_writers:
+                    self._run_import(file_path, collection_name, label, writers)
+                
+                # Query phases without secondary indexes, then build them and query again
+                if self.index_mode == 'both':
+                    self._run_query_phases(file_path, collection_name, f"{label} (no indexes)", mutations=False)
+                if self.index_mode != 'none':
+                    self.measure_execution_time(
+                        f"Index {label}",
+                        self._build_indexes, collection_name
+                    )
+                self._run_query_phases(file_path, collection_name, f"{label} (indexed)" if self.index_mode == 'both' else label)
+                
+                # Full-text index build and relevance-ranked searches
+                if self.full_text_search:
+                    self._run_text_search(collection_name, label)
+                
+                # Analytical aggregations (group-by, histograms, distributions)
+                if self.analytics:
+                    self._run_aggregations(collection_name, label)
                 
                 # Export
                 self.measure_execution_time(
                     f"Export {label}",
                     self.export_data, collection_name
                 )
+                
+                # YCSB-style mixed workloads (last, since they insert and update records)
+                if self.ycsb_workloads:
+                    self._run_ycsb(collection_name, label)
 
             # 3. Save results and print summary
             self.save_results("")
@@ -175,14 +547,349 @@ class DatabaseBenchmark(ABC):
             import traceback
             traceback.print_exc()
         finally:
-            # 4. Close connection
+            # 4. Close connection and save the resource timeline
             self.close()
+            self.monitor.stop()
+            self.save_timeline("")
+
+    def _run_query_phases(self, file_path: str, collection_name: str, label: str, mutations: bool = True) -> None:
+        """
+        Internal method to run the load, point-read, declared-query and CRUD phases.
+        
+        With `mutations` off the CRUD phases are skipped, so a pass compared with a later
+        one (index_mode both) leaves the collection unchanged for it.
+        """
+        # Concurrent query load (before CRUD mutates the collection)
+        if self.load_test:
+            self._run_load(collection_name, label)
+        
+        # Point reads of the keys sampled during the import (before CRUD deletes documents)
+        if self.point_reads:
+            self._run_point_reads(collection_name, label)
+        
+        # Additional query shapes declared for the dataset
+        self._run_queries(collection_name, label)
+        
+        # Bulk transfer of every match (CRUD only counts them on the server)
+        if self.fetch_all:
+            self.measure_execution_time(
+                f"Fetch all matches {label}",
+                self._fetch_all_matches, collection_name
+            )
+        
+        # Read-only counterpart of CRUD's read, measured in both passes of an index comparison
+        if self.index_mode == 'both':
+            self.measure_repeated(f"Read {label}", self.read_data, collection_name)
+        if not mutations:
+            return
+        
+        # CRUD (Read, Update, Delete), repeated after warmup runs when configured; with both
+        # mutation modes, client round-trip mutations run first, then set-based server ones
+        modes = ['client', 'server'] if self.mutation_mode == 'both' else [self.mutation_mode]
+        for i, mode in enumerate(modes):
+            if i:
+                # The previous mode deleted its matches; reload so every mode mutates the same documents
+                self._reload_collection(file_path, collection_name)
+            self.measure_repeated(
+                f"CRUD {label} ({mode}-side mutations)" if len(modes) > 1 else f"CRUD {label}",
+                self._run_crud, collection_name, server_side=mode == 'server'
+            )
+
+    def _reload_collection(self, file_path: str, collection_name: str) -> None:
+        """Re-import the dataset and rebuild its secondary indexes, outside any measured phase."""
+        print(f"  Reloading {collection_name} (not measured)")
+        self.reset_collection(collection_name)
+        self.insert_data(file_path, collection_name, writers=self.import_writers[-1])
+        if self.index_mode != 'none' and self.indexes.get(collection_name):
+            self.create_indexes(collection_name, self.indexes[collection_name])
+
+    def _build_indexes(self, collection_name: str) -> Dict[str, Dict[str, Any]]:
+        """Build the collection's declared indexes, recording each one's build time and size."""
+        indexes = self.indexes.get(collection_name, [])
+        if not indexes:
+            print(f"  No indexes declared for {collection_name}")
+            return {}
+        built = self.create_indexes(collection_name, indexes)
+        self.record_metric("indexes", built)
+        for name, stats in built.items():
+            size = f"{stats['size_bytes'] / 1e6:.2f}MB" if stats.get('size_bytes') is not None else "N/A"
+            print(f"  Index {name} on {stats['fields']}: built in {stats['build_seconds']:.4f}s, size {size}")
+        return built
+
+    def _run_text_search(self, collection_name: str, label: str) -> None:
+        """Internal method to build the collection's full-text index, then measure each declared search."""
+        search = self.text_searches.get(collection_name)
+        if search is None:
+            print(f"No text search declared for {collection_name}, skipping")
+            return
+        self.measure_execution_time(
+            f"Text index {label}",
+            self._build_text_index, collection_name, search.fields
+        )
+        for name, query in search.queries.items():
+            self.measure_execution_time(
+                f"Text search {label}: {name}",
+                self._run_text_query, collection_name, search.fields, query
+            )
+
+    def _build_text_index(self, collection_name: str, fields: List[str]) -> Dict[str, Any]:
+        """Build the full-text index, recording its fields and size."""
+        built = self.create_text_index(collection_name, fields)
+        for key, value in built.items():
+            self.record_metric(key, value)
+        size = f"{built['size_bytes'] / 1e6:.2f}MB" if built.get('size_bytes') is not None else "N/A"
+        print(f"  Text index {built.get('name')} on {fields}: size {size}")
+        return built
+
+    def _run_text_query(self, collection_name: str, fields: List[str], query: TextQuery) -> List[dict]:
+        """Run one search `text_search_runs` times, recording per-search latency and the hit count."""
+        search_latency = self.latency("text_search")
+        hits: List[dict] = []
+        for _ in range(self.text_search_runs):
+            with search_latency.time():
+                hits = self.text_search(collection_name, fields, query)
+        self.record_metric("text", query.text)
+        self.record_metric("phrase", query.phrase)
+        self.record_metric("runs", self.text_search_runs)
+        self.record_metric("results", len(hits))
+        print(f"  {len(hits)} results for {'phrase ' if query.phrase else ''}'{query.text}'")
+        return hits
+
+    def _run_aggregations(self, collection_name: str, label: str) -> None:
+        """Internal method to prepare the declared aggregations, then measure each one with its server memory peak."""
+        aggregations = self.aggregations.get(collection_name, {})
+        if not aggregations:
+            print(f"No aggregations declared for {collection_name}, skipping")
+            return
+        self.measure_execution_time(
+            f"Aggregation index {label}",
+            self._build_aggregation_indexes, collection_name, aggregations
+        )
+        for name, query in aggregations.items():
+            operation_name = f"Aggregation {label}: {name}"
+            self.measure_execution_time(operation_name, self._run_aggregation, collection_name, query)
+            metrics = self.metrics[operation_name]
+            metrics["server_mem_peak_mb"] = metrics["resources"].get("container_mem_max_mb")
+            print(f"  Server memory peak: {metrics['server_mem_peak_mb']}MB")
+
+    def _build_aggregation_indexes(self, collection_name: str, aggregations: Dict[str, Query]) -> Dict[str, Dict[str, Any]]:
+        """Build whatever the backend precomputes for the aggregations, recording each index's statistics."""
+        built = self.create_aggregation_indexes(collection_name, aggregations)
+        self.record_metric("indexes", built)
+        if not built:
+            print("  Aggregations run at query time, nothing to build")
+        for name, stats in built.items():
+            size = f"{stats['size_bytes'] / 1e6:.2f}MB" if stats.get('size_bytes') is not None else "N/A"
+            print(f"  Aggregation index {name}: built in {stats['build_seconds']:.4f}s, size {size}")
+        return built
+
+    def _run_aggregation(self, collection_name: str, query: Query) -> List[dict]:
+        """Run one aggregation `aggregation_runs` times, recording per-run latency and the row count."""
+        aggregate_latency = self.latency("aggregate")
+        rows: List[dict] = []
+        for _ in range(self.aggregation_runs):
+            with aggregate_latency.time():
+                rows = self.run_query(collection_name, query)
+        self.record_metric("runs", self.aggregation_runs)
+        self.record_metric("results", len(rows))
+        print(f"  {len(rows)} groups")
+        return rows
+
+    def _run_import(self, file_path: str, collection_name: str, label: str, writers: int) -> None:
+        """Internal method to run one timed import and record its throughput."""
+        operation_name = f"Import {label}"
+        if len(self.import_writers) > 1:
+            operation_name += f" ({writers} writers)"
+        
+        self.reset_collection(collection_name)
+        self._key_sampler = ReservoirSampler(self.point_read_keys, seed=0) if self.point_reads else None
+        try:
+            count = self.measure_execution_time(
+                operation_name,
+                self.insert_data, file_path, collection_name, writers=writers
+            )
+        finally:
+            if self._key_sampler is not None:
+                self._sampled_keys[collection_name] = self._key_sampler.keys
+            self._key_sampler = None
+        
+        metrics = self.metrics[operation_name]
+        duration = metrics["duration_seconds"]
+        metrics["writers"] = writers
+        metrics["documents"] = count or 0
+        metrics["docs_per_second"] = round(count / duration, 2) if count and duration else 0
+        resources = metrics["resources"]
+        metrics["bytes_per_document"] = {
+            name: round(resources[f"{name}_bytes"] / count, 2) if count and resources.get(f"{name}_bytes") is not None else None
+            for name in ('net_rx', 'net_tx', 'disk_read', 'disk_write')
+        }
+        if self._batcher is not None:
+            metrics["adaptive_batching"] = self._batcher.summary()
+            self._batcher = None
+        if self._pipeline is not None:
+            metrics["skipped_lines"] = self._pipeline.skipped_lines
+            if self._pipeline.skipped_lines:
+                print(f"WARNING: {self._pipeline.skipped_lines} lines of {file_path} could not be decoded and were skipped")
+            self._pipeline = None
+
+    def _run_load(self, collection_name: str, label: str) -> None:
+        """Internal method to replay the dataset query under load, once per target rate (open loop)."""
+        generator = LoadGenerator(
+            lambda: self.open_query_worker(collection_name),
+            workers=self.load_workers,
+            duration=self.load_duration
+        )
+        rates = self.load_rates if self.load_mode == 'open' else [None]
+        if not rates:
+            raise ValueError("Open-loop load requires at least one target rate (load_rates)")
+        for rate in rates:
+            if rate is None:
+                operation_name = f"Load {label} (closed, {self.load_workers} workers)"
+            else:
+                operation_name = f"Load {label} ({rate:g} ops/s)"
+            self.measure_execution_time(operation_name, self._run_load_level, generator, rate)
+
+    def _run_load_level(self, generator: LoadGenerator, rate: Optional[float]) -> Dict[str, Any]:
+        """Run one load level, recording its throughput and latencies on the current operation."""
+        result = generator.run(
+            rate,
+            latency=self.latency("load"),
+            service_time=self.latency("service_time") if rate is not None else None
+        )
+        for key, value in result.items():
+            self.record_metric(key, value)
+        print(f"  {result['operations']} operations ({result['errors']} errors) at "
+              f"{result['ops_per_second']} ops/s")
+        return result
+
+    def _run_point_reads(self, collection_name: str, label: str) -> None:
+        """Internal method to fetch the sampled keys one at a time, then in multi-get batches of each size."""
+        keys = [key for key in self._sampled_keys.get(collection_name, []) if key is not None]
+        if not keys:
+            print(f"No keys sampled from {collection_name}, skipping point reads")
+            return
+        # Shuffled once, so lookups do not follow insertion order; every phase reads the same order
+        random.Random(0).shuffle(keys)
+        
+        self.measure_execution_time(f"Point reads {label}", self._read_keys_singly, collection_name, keys)
+        for size in self.multi_get_sizes:
+            self.measure_execution_time(
+                f"Multi-get {label} ({size} keys)",
+                self._read_keys_batched, collection_name, keys, size
+            )
+
+    def _record_gets(self, keys: List[Any], found: int, elapsed: float) -> None:
+        """Record lookup counts and throughput on the current operation."""
+        gets_per_second = round(len(keys) / elapsed, 2) if elapsed else 0
+        self.record_metric("gets", len(keys))
+        self.record_metric("found", found)
+        self.record_metric("gets_per_second", gets_per_second)
+        print(f"  {found}/{len(keys)} documents found at {gets_per_second} gets/s")
+
+    def _read_keys_singly(self, collection_name: str, keys: List[Any]) -> int:
+        """Fetch each key with its own request."""
+        get_latency = self.latency("get")
+        found = 0
+        start = time.perf_counter()
+        for key in keys:
+            with get_latency.time():
+                doc = self.read_record(collection_name, key)
+            found += doc is not None
+        self._record_gets(keys, found, time.perf_counter() - start)
+        return found
+
+    def _read_keys_batched(self, collection_name: str, keys: List[Any], size: int) -> int:
+        """Fetch the keys `size` at a time with multi-get requests."""
+        batch_latency = self.latency("multi_get")
+        found = 0
+        start = time.perf_counter()
+        for i in range(0, len(keys), size):
+            with batch_latency.time():
+                found += self.read_records(collection_name, keys[i:i + size])
+        self.record_metric("batch_size", size)
+        self._record_gets(keys, found, time.perf_counter() - start)
+        return found
+
+    def _run_queries(self, collection_name: str, label: str) -> None:
+        """Internal method to measure every declared query not already run by a shared phase."""
+        for name, query in self.queries.get(collection_name, {}).items():
+            if name not in SHARED_QUERIES:
+                self.measure_execution_time(f"Query {label}: {name}", self._run_query, collection_name, query)
+
+    def _run_query(self, collection_name: str, query: Query) -> List[dict]:
+        """Run one declared query, recording its latency and result count."""
+        with self.latency("query").time():
+            rows = self.run_query(collection_name, query)
+        self.record_metric("results", len(rows))
+        print(f"  {len(rows)} results")
+        return rows
+
+    def _fetch_all_matches(self, collection_name: str) -> int:
+        """Fetch every document matching the dataset query, recording the transfer throughput."""
+        start = time.perf_counter()
+        fetched = self.fetch_matches(collection_name, self.dataset_query(collection_name))
+        elapsed = time.perf_counter() - start
+        docs_per_second = round(fetched / elapsed, 2) if elapsed else 0
+        self.record_metric("documents", fetched)
+        self.record_metric("docs_per_second", docs_per_second)
+        print(f"  Fetched {fetched} matching documents at {docs_per_second} docs/s")
+        return fetched
+
+    def _run_ycsb(self, collection_name: str, label: str) -> None:
+        """Internal method to sample record keys once, then replay each configured workload."""
+        keys = self.sample_keys(collection_name, self.ycsb_records)
+        if not keys:
+            print(f"No records in {collection_name}, skipping YCSB workloads")
+            return
+        # Inserted records copy an existing document, without its database-specific key fields
+        sample = self.read_record(collection_name, keys[0]) or {}
+        template = {k: v for k, v in dict(sample).items() if not k.startswith('_') and not k.startswith('@')}
+        
+        for name in self.ycsb_workloads:
+            workload = WORKLOADS[name]
+            self.measure_execution_time(
+                f"YCSB {label} {name.upper()} ({workload.description})",
+                self._run_workload, collection_name, workload, keys, template
+            )
+
+    def _run_workload(
+        self,
+        collection_name: str,
+        workload: Workload,
+        keys: List[Any],
+        template: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Replay one workload from `load_workers` workers for `load_duration` seconds."""
+        distribution = self.ycsb_distribution or workload.distribution
+        runner = WorkloadRunner(
+            workload, self, collection_name, KeyChooser(keys, distribution), template,
+            latency=self.latency, seed=0
+        )
+        generator = LoadGenerator(runner.open_worker, workers=self.load_workers, duration=self.load_duration)
+        result = generator.run(latency=self.latency("ycsb"))
+        self.record_metric("workload", workload.name)
+        self.record_metric("distribution", distribution)
+        self.record_metric("records", len(keys))
+        self.record_metric("operation_counts", runner.counts)
+        for key, value in result.items():
+            self.record_metric(key, value)
+        print(f"  {result['operations']} operations ({result['errors']} errors) at "
+              f"{result['ops_per_second']} ops/s: {runner.counts}")
+        return result
 
-    def _run_crud(self, collection_name: str) -> None:
+    def _run_crud(self, collection_name: str, server_side: bool = False) -> None:
         """Internal method to run all CRUD operations."""
+        self.record_metric("mutation_mode", 'server' if server_side else 'client')
         self.read_data(collection_name)
-        self.update_data(collection_name)
-        self.delete_data(collection_name)
+        self.record_metric("updated", self.update_data(collection_name, server_side=server_side))
+        
+        start = time.perf_counter()
+        deleted = self.delete_data(collection_name, server_side=server_side) or 0
+        elapsed = time.perf_counter() - start
+        deletes_per_second = round(deleted / elapsed, 2) if elapsed else 0
+        self.record_metric("deleted", deleted)
+        self.record_metric("deletes_per_second", deletes_per_second)
+        print(f"  Deleted {deleted} documents at {deletes_per_second} deletes/s")
 
     # ==================== ABSTRACT METHODS (Interface) ====================
 
@@ -192,13 +899,27 @@ class DatabaseBenchmark(ABC):
         pass
 
     @abstractmethod
-    def insert_data(self, file_path: str, collection_name: str) -> int:
+    def reset_collection(self, collection_name: str) -> None:
+        """
+        Remove the collection's documents (and secondary indexes) left by an earlier import.
+        
+        Called before each import outside the measured phase, so a costly clear (e.g. a
+        server-side delete of every document) is not charged to import throughput.
+        
+        Args:
+            collection_name: Collection to empty
+        """
+        pass
+
+    @abstractmethod
+    def insert_data(self, file_path: str, collection_name: str, writers: int = 1) -> int:
         """
         Insert data from file into the collection.
         
         Args:
             file_path: Path to the data file (JSON lines or CSV)
             collection_name: Target collection/table name
+            writers: Number of concurrent writers, each with its own connection/stream
             
         Returns:
             Number of documents inserted
@@ -216,12 +937,200 @@ class DatabaseBenchmark(ABC):
         pass
 
     @abstractmethod
-    def update_data(self, collection_name: str) -> int:
+    def count_query(self, collection_name: str, query: Query) -> int:
+        """
+        Count the documents matching a query's filter on the server.
+        
+        Args:
+            collection_name: Collection to query
+            query: Query whose `where` predicate is counted
+            
+        Returns:
+            Number of matching documents
+        """
+        pass
+
+    @abstractmethod
+    def fetch_matches(self, collection_name: str, query: Query) -> int:
+        """
+        Fetch every document matching a query's filter to the client, streaming when supported.
+        
+        Args:
+            collection_name: Collection to query
+            query: Query whose `where` predicate selects the documents
+            
+        Returns:
+            Number of documents received
+        """
+        pass
+
+    @abstractmethod
+    def run_query(self, collection_name: str, query: Query) -> List[dict]:
+        """
+        Compile a query to the database's query language and return its results.
+        
+        Args:
+            collection_name: Collection to query
+            query: Filter, projection, sort, limit and aggregations to run
+            
+        Returns:
+            Result documents, projected documents or one row per group
+        """
+        pass
+
+    @abstractmethod
+    def create_indexes(self, collection_name: str, indexes: List[Index]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build secondary indexes and wait until they are ready to serve queries.
+        
+        Args:
+            collection_name: Collection to index
+            indexes: Declared indexes
+            
+        Returns:
+            Dictionary of index name -> fields, build_seconds and size_bytes (None if unknown)
+        """
+        pass
+
+    @abstractmethod
+    def create_text_index(self, collection_name: str, fields: List[str]) -> Dict[str, Any]:
+        """
+        Build the database's native full-text index over text fields and wait until it is searchable.
+        
+        Args:
+            collection_name: Collection to index
+            fields: Text fields
+            
+        Returns:
+            Dictionary with the index name and size_bytes (None if unknown)
+        """
+        pass
+
+    @abstractmethod
+    def text_search(self, collection_name: str, fields: List[str], query: TextQuery) -> List[dict]:
+        """
+        Search the full-text index, best match first.
+        
+        Args:
+            collection_name: Collection to search
+            fields: Text fields covered by the index
+            query: Term, multi-term or phrase search
+            
+        Returns:
+            Up to `query.limit` matching documents ranked by relevance
+        """
+        pass
+
+    @abstractmethod
+    def open_query_worker(self, collection_name: str) -> ContextManager[Callable[[], Any]]:
+        """
+        Open a connection for one load-generator worker.
+        
+        Args:
+            collection_name: Collection to query
+            
+        Returns:
+            Context manager yielding a function that runs the dataset's query once
+        """
+        pass
+
+    @abstractmethod
+    def sample_keys(self, collection_name: str, limit: int) -> List[Any]:
+        """
+        Return up to `limit` existing document keys, in key order.
+        
+        Generated keys should come back in generation order where the backend's key
+        order allows it, since the `latest` distribution favours the end of the list.
+        
+        Args:
+            collection_name: Collection to sample
+            limit: Maximum number of keys
+            
+        Returns:
+            List of keys accepted by the *_record methods
+        """
+        pass
+
+    @abstractmethod
+    def read_record(self, collection_name: str, key: Any) -> Optional[dict]:
+        """
+        Fetch one document by key.
+        
+        Args:
+            collection_name: Collection to read from
+            key: Document key
+            
+        Returns:
+            The document, or None if it does not exist
+        """
+        pass
+
+    @abstractmethod
+    def read_records(self, collection_name: str, keys: List[Any]) -> int:
+        """
+        Fetch many documents by key in one request (multi-get).
+        
+        Args:
+            collection_name: Collection to read from
+            keys: Document keys
+            
+        Returns:
+            Number of documents found
+        """
+        pass
+
+    @abstractmethod
+    def update_record(self, collection_name: str, key: Any, fields: Dict[str, Any]) -> None:
+        """
+        Set fields on one document by key.
+        
+        Args:
+            collection_name: Collection to update
+            key: Document key
+            fields: Field names and values to set
+        """
+        pass
+
+    @abstractmethod
+    def insert_record(self, collection_name: str, document: Dict[str, Any]) -> Any:
+        """
+        Insert one document.
+        
+        Args:
+            collection_name: Collection to insert into
+            document: Document without a key
+            
+        Returns:
+            Key of the new document
+        """
+        pass
+
+    @abstractmethod
+    def scan_records(self, collection_name: str, start_key: Any, count: int) -> int:
+        """
+        Read up to `count` documents in key order, starting at `start_key`.
+        
+        Args:
+            collection_name: Collection to scan
+            start_key: First key of the range
+            count: Maximum number of documents
+            
+        Returns:
+            Number of documents read
+        """
+        pass
+
+    @abstractmethod
+    def update_data(self, collection_name: str, server_side: bool = False) -> int:
         """
         Perform update operations on the collection.
         
         Args:
             collection_name: Collection to update
+            server_side: Mutate with one set-based statement instead of round-tripping
+                the selected documents (or their keys) through the client; the statement
+                flags every document matching the dataset query, while the client path
+                stops at the backend's update limit
             
         Returns:
             Number of documents updated
@@ -229,12 +1138,13 @@ class DatabaseBenchmark(ABC):
         pass
 
     @abstractmethod
-    def delete_data(self, collection_name: str) -> int:
+    def delete_data(self, collection_name: str, server_side: bool = False) -> int:
         """
         Perform delete operations on the collection.
         
         Args:
             collection_name: Collection to delete from
+            server_side: Delete with one set-based statement (see update_data)
             
         Returns:
             Number of documents deleted
@@ -0,0 +1,202 @@
+"""
+Client Resource Monitor - Accounts for the benchmark process itself.
+
+Container metrics show how hard the database works; these show whether the
+Python harness (parsing, encoding, driver code) was the bottleneck instead.
+CPU time comes from os.times() and, for worker processes still running, from
+psutil; resident memory is sampled with psutil and allocations are counted
+from the interpreter (optionally traced with tracemalloc, which slows
+allocation-heavy code down noticeably).
+
+Saturation is judged against the parallelism the operation actually used:
+the threads and child processes that were busy during it, capped by the
+cores of the machine, so one busy writer out of eight is not flagged and a
+process pool is charged for its workers' CPU.
+"""
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from typing import Any, Dict, Optional
+
+try:
+    import psutil
+except ImportError:
+    psutil = None  # psutil not installed: RSS is not reported
+
+# Allocation sites listed per operation when tracing allocations
+TOP_ALLOCATION_SITES = 5
+# Client CPU (own and child processes) over wall time x usable cores at or above which the client is saturated
+SATURATION_THRESHOLD = 0.9
+# Share of the wall time a thread or child process must spend on CPU to count as an active worker
+ACTIVE_WORKER_THRESHOLD = 0.1
+
+
+class ClientResourceMonitor(threading.Thread):
+    """Measure CPU time, peak RSS and allocations of the benchmark process during one operation."""
+
+    def __init__(self, interval: float = 0.05, trace_allocations: bool = False):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval: Seconds between RSS samples
+            trace_allocations: Also record the peak traced allocation size and per-site
+                allocation counts (tracemalloc snapshot diff)
+        """
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.trace_allocations = trace_allocations
+        self.running = True
+        self.process = psutil.Process() if psutil is not None else None
+        self.peak_rss = 0
+        self._children_seen: Dict[int, float] = {}  # Last CPU seconds of each child process seen
+
+    def _rss(self) -> int:
+        return self.process.memory_info().rss if self.process is not None else 0
+
+    def _thread_cpu(self) -> Optional[Dict[int, float]]:
+        """CPU seconds per thread of this process (None without psutil or per-thread times)."""
+        if self.process is None:
+            return None
+        try:
+            return {thread.id: thread.user_time + thread.system_time for thread in self.process.threads()}
+        except psutil.Error:
+            return None
+
+    def _children_cpu(self) -> Dict[int, float]:
+        """CPU seconds of each running child process (e.g. parse or pool workers)."""
+        if self.process is None:
+            return {}
+        cpu = {}
+        for child in self.process.children():
+            try:
+                times = child.cpu_times()
+            except psutil.Error:
+                continue  # Exited meanwhile: counted by os.times() once reaped
+            cpu[child.pid] = times.user + times.system
+        return cpu
+
+    def start(self) -> None:
+        """Take the starting counters and begin sampling RSS."""
+        self._started_tracing = self.trace_allocations and not tracemalloc.is_tracing()
+        if self._started_tracing:
+            tracemalloc.start()
+        elif self.trace_allocations:
+            tracemalloc.reset_peak()
+        self._snapshot_start = self._snapshot() if self.trace_allocations else None
+        self._gc_start = [stats['collections'] for stats in gc.get_stats()]
+        self._blocks_start = sys.getallocatedblocks()
+        self.peak_rss = self._rss()
+        self._threads_start = self._thread_cpu()
+        self._children_start = self._children_cpu()
+        self._children_seen = dict(self._children_start)
+        self._times_start = os.times()
+        self._wall_start = time.perf_counter()
+        super().start()
+
+    @staticmethod
+    def _snapshot() -> tracemalloc.Snapshot:
+        """Snapshot of the traced blocks, without tracemalloc's own allocations."""
+        return tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+
+    def _allocation_diff(self) -> Dict[str, Any]:
+        """
+        Compare the traced blocks with the starting snapshot, per source line.
+
+        Growth and release are summed separately, so a phase that allocates as much
+        as it frees (churn) still shows both instead of a net delta near zero.
+        Blocks allocated and freed between the two snapshots are not visible.
+        """
+        diff = self._snapshot().compare_to(self._snapshot_start, 'lineno')
+        grown = [stat for stat in diff if stat.count_diff > 0]
+        released = [stat for stat in diff if stat.count_diff < 0]
+        top = sorted(grown, key=lambda stat: stat.size_diff, reverse=True)[:TOP_ALLOCATION_SITES]
+        return {
+            "traced_blocks_allocated": sum(stat.count_diff for stat in grown),
+            "traced_allocated_mb": round(sum(max(stat.size_diff, 0) for stat in grown) / (1024 * 1024), 2),
+            "traced_blocks_freed": -sum(stat.count_diff for stat in released),
+            "traced_freed_mb": round(-sum(min(stat.size_diff, 0) for stat in released) / (1024 * 1024), 2),
+            "traced_top_sites": [
+                {
+                    "site": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    "blocks": stat.count_diff,
+                    "size_kb": round(stat.size_diff / 1024, 1),
+                }
+                for stat in top
+            ],
+        }
+
+    def run(self) -> None:
+        while self.running:
+            time.sleep(self.interval)
+            self.peak_rss = max(self.peak_rss, self._rss())
+            self._children_seen.update(self._children_cpu())
+
+    def stop(self) -> Dict[str, Any]:
+        """
+        Stop monitoring and return the client's usage during the operation.
+
+        Returns:
+            Dictionary with user/sys CPU seconds of this process and of its child
+            processes (finished and still running), CPU % of one core, the active
+            workers and the CPU % of the cores they could use, peak/end RSS,
+            allocation and GC deltas and a `saturated` flag; with tracing, the
+            peak traced memory and the blocks and bytes allocated and freed per
+            source line
+        """
+        wall = time.perf_counter() - self._wall_start
+        times = os.times()
+        threads_end = self._thread_cpu()
+        children_end = self._children_cpu()
+        self.running = False
+        self.join()
+        self._children_seen.update(children_end)
+
+        user = times.user - self._times_start.user
+        system = times.system - self._times_start.system
+        # Reaped children are in os.times(); running ones only in their own counters
+        children = (times.children_user - self._times_start.children_user
+                    + times.children_system - self._times_start.children_system
+                    + sum(children_end.values()) - sum(self._children_start.values()))
+        children = max(children, 0)
+        cpu_fraction = (user + system) / wall if wall > 0 else 0
+
+        busy = ACTIVE_WORKER_THRESHOLD * wall
+        if threads_end is not None and self._threads_start is not None:
+            active_threads = sum(
+                cpu - self._threads_start.get(thread_id, 0) >= busy for thread_id, cpu in threads_end.items()
+            )
+        else:
+            active_threads = 1
+        active_children = sum(
+            cpu - self._children_start.get(pid, 0) >= busy for pid, cpu in self._children_seen.items()
+        )
+        active_workers = max(active_threads + active_children, 1)
+        usable_cores = min(active_workers, os.cpu_count() or 1)
+        capacity_fraction = (user + system + children) / (wall * usable_cores) if wall > 0 else 0
+        end_rss = self._rss()
+
+        result = {
+            "cpu_user_seconds": round(user, 4),
+            "cpu_system_seconds": round(system, 4),
+            "cpu_percent": round(cpu_fraction * 100, 2),
+            "children_cpu_seconds": round(children, 4),
+            "active_workers": active_workers,
+            "cpu_capacity_percent": round(capacity_fraction * 100, 2),
+            "rss_peak_mb": round(max(self.peak_rss, end_rss) / (1024 * 1024), 2) if self.process else None,
+            "rss_end_mb": round(end_rss / (1024 * 1024), 2) if self.process else None,
+            "allocated_blocks_delta": sys.getallocatedblocks() - self._blocks_start,
+            "gc_collections": [
+                stats['collections'] - start for stats, start in zip(gc.get_stats(), self._gc_start)
+            ],
+            "saturated": capacity_fraction >= SATURATION_THRESHOLD,
+        }
+        if self.trace_allocations:
+            result["traced_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+            result.update(self._allocation_diff())
+            if self._started_tracing:
+                tracemalloc.stop()
+        return result
@@ -0,0 +1,127 @@
+"""
+JSON Codec Layer - One pluggable encoder/decoder for import, export and results.
+
+orjson or ujson are used when installed, with the standard library as the
+fallback. Every codec encodes to UTF-8 bytes so export files can be written
+in binary mode without an extra encode step.
+"""
+import json
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # orjson not installed
+
+try:
+    import ujson
+except ImportError:
+    ujson = None  # ujson not installed
+
+CODECS = ('auto', 'orjson', 'ujson', 'stdlib')
+
+
+class JsonCodec:
+    """A named pair of JSON encode/decode functions."""
+
+    def __init__(
+        self,
+        name: str,
+        loads: Callable[[Any], Any],
+        dumps: Callable[[Any], bytes],
+        dumps_pretty: Callable[[Any], bytes]
+    ):
+        """
+        Initialize the codec.
+
+        Args:
+            name: Codec name recorded in the metrics
+            loads: Decode bytes/str into Python objects
+            dumps: Encode one object as compact UTF-8 JSON (unknown types via str())
+            dumps_pretty: Encode one object as indented UTF-8 JSON
+        """
+        self.name = name
+        self.loads = loads
+        self.dumps = dumps
+        self.dumps_pretty = dumps_pretty
+
+    def dumps_line(self, obj: Any) -> bytes:
+        """Encode one object as a JSON lines record."""
+        return self.dumps(obj) + b"\n"
+
+
+def _with_stdlib_fallback(loads: Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """
+    Wrap a fast decoder so input it rejects but the standard library accepts
+    (NaN, Infinity) still decodes, keeping imports identical across codecs.
+    """
+    def fallback_loads(data: Any) -> Any:
+        try:
+            return loads(data)
+        except ValueError:
+            return json.loads(data)
+    return fallback_loads
+
+
+def _stdlib_codec() -> JsonCodec:
+    return JsonCodec(
+        'stdlib',
+        json.loads,
+        lambda obj: json.dumps(obj, default=str).encode('utf-8'),
+        lambda obj: json.dumps(obj, indent=2, default=str).encode('utf-8'),
+    )
+
+
+def _orjson_codec() -> JsonCodec:
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+    return JsonCodec(
+        'orjson',
+        _with_stdlib_fallback(orjson.loads),
+        lambda obj: orjson.dumps(obj, default=str, option=options),
+        lambda obj: orjson.dumps(obj, default=str, option=options | orjson.OPT_INDENT_2),
+    )
+
+
+def _ujson_codec() -> JsonCodec:
+    return JsonCodec(
+        'ujson',
+        _with_stdlib_fallback(ujson.loads),
+        lambda obj: ujson.dumps(obj, default=str, ensure_ascii=False).encode('utf-8'),
+        lambda obj: ujson.dumps(obj, default=str, ensure_ascii=False, indent=2).encode('utf-8'),
+    )
+
+
+@lru_cache(maxsize=None)
+def get_codec(name: Optional[str] = 'auto') -> JsonCodec:
+    """
+    Return the JSON codec with the given name.
+
+    Args:
+        name: 'auto' (fastest installed), 'orjson', 'ujson' or 'stdlib'
+
+    Returns:
+        The matching JsonCodec
+
+    Raises:
+        ValueError: If the name is unknown
+        ImportError: If the requested library is not installed
+    """
+    name = name or 'auto'
+    if name not in CODECS:
+        raise ValueError(f"Unknown JSON codec: {name} (expected one of {CODECS})")
+    if name == 'auto':
+        if orjson is not None:
+            return _orjson_codec()
+        if ujson is not None:
+            return _ujson_codec()
+        return _stdlib_codec()
+    if name == 'orjson':
+        if orjson is None:
+            raise ImportError("JSON codec 'orjson' requires orjson (pip install orjson)")
+        return _orjson_codec()
+    if name == 'ujson':
+        if ujson is None:
+            raise ImportError("JSON codec 'ujson' requires ujson (pip install ujson)")
+        return _ujson_codec()
+    return _stdlib_codec()
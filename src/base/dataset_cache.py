@@ -0,0 +1,137 @@
+"""
+Dataset Cache - Pre-parsed binary copies of the benchmark datasets.
+
+The first run decodes each JSONL/CSV dataset once and stores the resulting
+documents as a stream of pickled record batches. Later runs (and the other
+databases in the same run) read the batches straight back, so the measured
+import reflects database ingest cost rather than JSON/CSV decoding.
+
+Cache files are keyed by the source file's size, modification time and a
+hash of sampled blocks, so editing or replacing a dataset invalidates them.
+Each file starts with a metadata record (format version, key and the number
+of lines that could not be decoded), so cached imports report the same
+skipped-line count as uncached ones.
+"""
+import glob
+import hashlib
+import os
+import pickle
+from typing import Any, Dict, Iterator, Tuple
+
+from .ingestion import Batch, IngestionPipeline
+
+
+class DatasetCache:
+    """Build and serve pickled record batches for dataset files."""
+
+    FORMAT_VERSION = 3
+    SAMPLE_BYTES = 1024 * 1024
+    RECORDS_PER_BATCH = 10000
+
+    def __init__(self, cache_dir: str):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding the cache files
+        """
+        self.cache_dir = cache_dir
+        self._keys = {}
+
+    def key(self, file_path: str) -> str:
+        """Return the cache key of a dataset file (size, mtime and sampled content hash)."""
+        stat = os.stat(file_path)
+        memo_key: Tuple = (os.path.abspath(file_path), stat.st_size, stat.st_mtime_ns)
+        if memo_key not in self._keys:
+            digest = hashlib.sha1(f"{self.FORMAT_VERSION}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+            with open(file_path, 'rb') as f:
+                # Head, middle and tail blocks; hashing the whole multi-GB file would cost a full read
+                for offset in (0, stat.st_size // 2, max(0, stat.st_size - self.SAMPLE_BYTES)):
+                    f.seek(offset)
+                    digest.update(f.read(self.SAMPLE_BYTES))
+            self._keys[memo_key] = digest.hexdigest()[:16]
+        return self._keys[memo_key]
+
+    def path_for(self, file_path: str) -> str:
+        """Return the cache file path for a dataset file."""
+        name = os.path.basename(file_path)
+        return os.path.join(self.cache_dir, f"{name}.{self.key(file_path)}.pkl")
+
+    def is_fresh(self, file_path: str) -> bool:
+        """Return True if an up-to-date cache exists for the dataset file."""
+        return os.path.exists(self.path_for(file_path))
+
+    def build(self, file_path: str, parse_workers: int = 1) -> str:
+        """
+        Parse a dataset file and write its documents to the cache.
+
+        Args:
+            file_path: Path to the data file (JSON lines or CSV)
+            parse_workers: Worker processes used to parse JSONL files
+
+        Returns:
+            Path to the cache file
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        cache_path = self.path_for(file_path)
+        tmp_path = cache_path + ".tmp"
+
+        pipeline = IngestionPipeline(
+            file_path, batch_size=self.RECORDS_PER_BATCH, parse_workers=parse_workers
+        )
+        total_count = 0
+        with open(tmp_path, 'wb') as f:
+            # Placeholder header, rewritten once the skipped-line count is known
+            header_size = self._write_metadata(f, file_path, skipped_lines=0)
+            for batch in pipeline.batches():
+                pickle.dump(batch, f, protocol=pickle.HIGHEST_PROTOCOL)
+                total_count += len(batch)
+            f.seek(0)
+            if self._write_metadata(f, file_path, pipeline.skipped_lines) != header_size:
+                raise RuntimeError(f"Cache metadata of {file_path} changed size while it was built")
+        os.replace(tmp_path, cache_path)
+
+        # Drop caches of older versions of the same dataset
+        stale_pattern = os.path.join(self.cache_dir, f"{glob.escape(os.path.basename(file_path))}.*.pkl")
+        for stale in glob.glob(stale_pattern):
+            if stale != cache_path:
+                os.remove(stale)
+
+        print(f"  Cached {total_count} documents from {os.path.basename(file_path)} to {cache_path}")
+        if pipeline.skipped_lines:
+            print(f"  WARNING: {pipeline.skipped_lines} lines could not be decoded and are not cached")
+        return cache_path
+
+    def ensure(self, file_path: str, parse_workers: int = 1) -> str:
+        """Build the cache for a dataset file if it is missing or stale, and return its path."""
+        if self.is_fresh(file_path):
+            return self.path_for(file_path)
+        return self.build(file_path, parse_workers=parse_workers)
+
+    def _write_metadata(self, f, file_path: str, skipped_lines: int) -> int:
+        """Write the metadata record at the current position and return its size in bytes."""
+        # Fixed-width count so the real value can overwrite the placeholder in place
+        metadata = {
+            'format_version': self.FORMAT_VERSION,
+            'key': self.key(file_path),
+            'skipped_lines': f"{skipped_lines:020d}",
+        }
+        data = pickle.dumps(metadata, protocol=pickle.HIGHEST_PROTOCOL)
+        f.write(data)
+        return len(data)
+
+    def metadata(self, file_path: str) -> Dict[str, Any]:
+        """Return the metadata record of a dataset's cache (format version, key, skipped lines)."""
+        with open(self.path_for(file_path), 'rb') as f:
+            metadata = pickle.load(f)
+        return {**metadata, 'skipped_lines': int(metadata['skipped_lines'])}
+
+    def iter_batches(self, file_path: str) -> Iterator[Batch]:
+        """Yield the cached record batches of a dataset file."""
+        with open(self.path_for(file_path), 'rb') as f:
+            pickle.load(f)  # Metadata record
+            while True:
+                try:
+                    yield pickle.load(f)
+                except EOFError:
+                    return
@@ -0,0 +1,542 @@
+"""
+Ingestion Pipeline - Reusable staged loader shared by all database implementations.
+
+The pipeline is split into four stages connected by bounded queues:
+
+    reader -> parse/clean -> batch -> sink
+
+The reader, parse and batch stages each run on a background thread, so ready
+batches are queued while the caller's thread (the sink) is busy writing to
+the database. CPU-bound decoding therefore overlaps with I/O-bound inserts
+instead of being serialized with them.
+
+For JSON lines files the reader and parse stages can instead be replaced by a
+pool of worker processes, each decoding a newline-aligned byte range of the
+file, so parsing scales past a single core. When a DatasetCache holds a fresh
+copy of the file, decoding is skipped altogether and pre-parsed batches are
+read back from the cache.
+
+CSV files are read with pandas by default, or with PyArrow's multithreaded
+streaming CSV reader when `csv_engine='arrow'` (requires pyarrow).
+"""
+import itertools
+import mmap
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, ContextManager, Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .codec import get_codec
+from .timing import PhaseTimer
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+except ImportError:
+    pa = None  # pyarrow not installed, only the pandas CSV engine is available
+
+CSV_ENGINES = ('pandas', 'arrow')
+
+
+Document = Dict[str, Any]
+Batch = List[Document]
+
+_END = object()
+
+
+class _StageFailure:
+    """Wraps an exception raised in a background stage so the consumer can re-raise it."""
+
+    def __init__(self, error: BaseException):
+        self.error = error
+
+
+def is_jsonl(file_path: str) -> bool:
+    """Return True if the file should be read as JSON lines rather than CSV."""
+    return file_path.endswith('.json') or 'goodreads' in file_path
+
+
+def strip_id(doc: Document) -> Document:
+    """Remove a source `_id` field so the database assigns its own key."""
+    doc.pop('_id', None)
+    return doc
+
+
+def frame_to_records(frame: pd.DataFrame) -> Batch:
+    """
+    Clean a CSV chunk column-wise and materialize it as records in a single pass.
+
+    NaN and +/-inf become None and any `_id` column is dropped, using vectorized
+    operations on the whole frame instead of a per-document Python loop.
+
+    Args:
+        frame: Chunk returned by pandas.read_csv
+
+    Returns:
+        List of JSON-safe documents
+    """
+    frame = frame.drop(columns=['_id'], errors='ignore')
+    columns = list(frame.columns)
+    values = frame.to_numpy(dtype=object)
+    missing = frame.isna().to_numpy()
+
+    float_columns = frame.select_dtypes(include='floating').columns
+    if len(float_columns):
+        positions = [frame.columns.get_loc(c) for c in float_columns]
+        missing[:, positions] |= np.isinf(frame[float_columns].to_numpy())
+
+    values[missing] = None
+    return [dict(zip(columns, row)) for row in values]
+
+
+def record_batch_to_records(batch: Any) -> Batch:
+    """
+    Clean an Arrow record batch column-wise and convert it to records.
+
+    Mirrors `frame_to_records`: `_id` is dropped, non-finite floats become None and
+    integer columns with missing values become floats, as pandas reads them.
+
+    Args:
+        batch: pyarrow.RecordBatch read from a CSV file
+
+    Returns:
+        List of JSON-safe documents
+    """
+    if '_id' in batch.schema.names:
+        batch = batch.drop_columns(['_id'])
+    columns = []
+    for column in batch.columns:
+        if pa.types.is_integer(column.type) and column.null_count:
+            column = column.cast(pa.float64())
+        if pa.types.is_floating(column.type):
+            column = pc.if_else(pc.is_finite(column), column, pa.scalar(None, column.type))
+        columns.append(column)
+    return pa.RecordBatch.from_arrays(columns, names=batch.schema.names).to_pylist()
+
+
+def shard_file(file_path: str, shard_bytes: int) -> List[Tuple[int, int]]:
+    """
+    Split a file into newline-aligned byte ranges of roughly `shard_bytes` each.
+
+    Args:
+        file_path: Path to a JSON lines file
+        shard_bytes: Target size of each range in bytes
+
+    Returns:
+        List of (start, end) offsets covering the whole file
+    """
+    size = os.path.getsize(file_path)
+    bounds = [0]
+    with open(file_path, 'rb') as f:
+        position = shard_bytes
+        while position < size:
+            f.seek(position)
+            f.readline()  # Move to the start of the next full line
+            position = f.tell()
+            if position >= size:
+                break
+            bounds.append(position)
+            position += shard_bytes
+    bounds.append(size)
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def parse_shard(
+    file_path: str,
+    start: int,
+    end: int,
+    clean: Optional[Callable[[Document], Document]] = None,
+    codec: str = 'auto'
+) -> Tuple[Batch, int]:
+    """
+    Decode the JSON lines in bytes [start, end) of a file. Runs in a worker process.
+
+    Returns:
+        The decoded documents and the number of non-blank lines that failed to decode
+    """
+    loads = get_codec(codec).loads
+    docs: Batch = []
+    skipped = 0
+    with open(file_path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in mm[start:end].split(b'\n'):
+                if not line.strip():
+                    continue
+                try:
+                    doc = loads(line)
+                except ValueError:  # json.JSONDecodeError and the orjson/ujson errors
+                    skipped += 1
+                    continue
+                docs.append(clean(doc) if clean is not None else doc)
+    return docs, skipped
+
+
+class IngestionPipeline:
+    """
+    Stream batches of documents from a JSONL or CSV file using background stages.
+
+    Example:
+        pipeline = IngestionPipeline(file_path, batch_size=10000)
+        total = pipeline.run(collection.insert_many)
+    """
+
+    def __init__(
+        self,
+        file_path: str,
+        batch_size: int = 10000,
+        clean: Optional[Callable[[Document], Document]] = None,
+        queue_size: int = 4,
+        read_chunk_lines: int = 2000,
+        parse_workers: int = 1,
+        shard_bytes: int = 16 * 1024 * 1024,
+        cache: Optional[Any] = None,
+        batcher: Optional[Any] = None,
+        csv_engine: str = 'pandas',
+        csv_block_bytes: int = 8 * 1024 * 1024,
+        codec: str = 'auto',
+        timer: Optional[Any] = None,
+        latency: Optional[Any] = None
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            file_path: Path to the data file (JSON lines or CSV)
+            batch_size: Number of documents handed to the sink per call
+            clean: Optional per-document transform applied to JSONL documents in the parse
+                stage; CSV chunks are cleaned column-wise by `frame_to_records` instead
+            queue_size: Maximum number of items buffered between two stages
+            read_chunk_lines: Raw JSONL lines handed from the reader to the parser at once
+            parse_workers: Worker processes used to parse JSONL shards (1 = in-thread parsing).
+                `clean` must be picklable (a module-level function or staticmethod) when > 1
+            shard_bytes: Size of the byte ranges handed to each parse worker
+            cache: Optional DatasetCache; pre-parsed batches are used when it is fresh
+            batcher: Optional AdaptiveBatcher; overrides `batch_size` from measured sink latency
+            csv_engine: CSV reader, 'pandas' or 'arrow' (multithreaded PyArrow streaming reader)
+            csv_block_bytes: Bytes decoded per Arrow record batch when csv_engine='arrow'
+            codec: Name of the JSON codec used to decode JSONL lines (see get_codec)
+            timer: Optional PhaseTimer; reader time is recorded as `read` and decoding as `parse`
+            latency: Optional LatencyHistogram receiving the duration of every sink call
+
+        Raises:
+            ValueError: If csv_engine is unknown
+            ImportError: If csv_engine='arrow' and pyarrow is not installed
+        """
+        if csv_engine not in CSV_ENGINES:
+            raise ValueError(f"Unknown CSV engine: {csv_engine} (expected one of {CSV_ENGINES})")
+        if csv_engine == 'arrow' and pa is None:
+            raise ImportError("csv_engine='arrow' requires pyarrow (pip install pyarrow)")
+        self.file_path = file_path
+        self.batch_size = batch_size
+        self.clean = clean
+        self.queue_size = queue_size
+        self.read_chunk_lines = read_chunk_lines
+        self.parse_workers = parse_workers
+        self.shard_bytes = shard_bytes
+        self.cache = cache
+        self.batcher = batcher
+        self.csv_engine = csv_engine
+        self.csv_block_bytes = csv_block_bytes
+        self.codec = codec
+        self.timer = timer if timer is not None else PhaseTimer()
+        self.latency = latency
+        self._stop = threading.Event()
+        self.skipped_lines = 0  # JSON lines that failed to decode (reported, not inserted)
+
+    # ==================== STAGES ====================
+
+    def _read_stage(self) -> Iterator[Any]:
+        """Read raw input: lists of JSONL lines, or pandas chunks / Arrow record batches for CSV."""
+        if is_jsonl(self.file_path):
+            yield from self.timer.iterate(self._read_lines(), 'read')
+        elif self.csv_engine == 'arrow':
+            # The CSV readers decode while they read, so their time counts as parsing
+            reader = pa_csv.open_csv(
+                self.file_path,
+                read_options=pa_csv.ReadOptions(use_threads=True, block_size=self.csv_block_bytes),
+                parse_options=pa_csv.ParseOptions(
+                    newlines_in_values=True,
+                    invalid_row_handler=lambda row: 'skip'
+                ),
+                # Empty (and NA-like) string fields become None, as pandas reads them
+                convert_options=pa_csv.ConvertOptions(strings_can_be_null=True)
+            )
+            yield from self.timer.iterate(reader, 'parse')
+        else:
+            chunks = pd.read_csv(self.file_path, chunksize=self.batch_size, on_bad_lines='skip')
+            yield from self.timer.iterate(chunks, 'parse')
+
+    def _read_lines(self) -> Iterator[List[bytes]]:
+        """Read the JSONL file in lists of `read_chunk_lines` raw lines."""
+        with open(self.file_path, 'rb') as f:
+            while True:
+                lines = list(itertools.islice(f, self.read_chunk_lines))
+                if not lines:
+                    break
+                yield lines
+
+    def _parse_stage(self, raw_chunks: Iterator[Any]) -> Iterator[Batch]:
+        """Decode raw chunks into documents."""
+        loads = get_codec(self.codec).loads
+        for chunk in raw_chunks:
+            with self.timer.phase('parse'):
+                if isinstance(chunk, pd.DataFrame):
+                    docs = frame_to_records(chunk)
+                elif pa is not None and isinstance(chunk, pa.RecordBatch):
+                    docs = record_batch_to_records(chunk)
+                else:
+                    docs = []
+                    for line in chunk:
+                        if not line.strip():
+                            continue
+                        try:
+                            docs.append(loads(line))
+                        except ValueError:
+                            self.skipped_lines += 1
+            yield docs
+
+    def _clean_stage(self, parsed: Iterator[Batch]) -> Iterator[Batch]:
+        """Apply the per-document `clean` transform to JSON documents (CSV records are cleaned per frame)."""
+        clean = self.clean if is_jsonl(self.file_path) else None
+        for docs in parsed:
+            if clean is not None:
+                with self.timer.phase('parse'):
+                    docs = [clean(doc) for doc in docs]
+            yield docs
+
+    def _sharded_parse_stage(self) -> Iterator[Batch]:
+        """Read and decode JSONL byte ranges in worker processes, preserving file order."""
+        shards = shard_file(self.file_path, self.shard_bytes)
+        max_in_flight = self.parse_workers * 2
+        with ProcessPoolExecutor(max_workers=self.parse_workers) as executor:
+            pending: deque = deque()
+            try:
+                for start, end in shards:
+                    pending.append(executor.submit(
+                        parse_shard, self.file_path, start, end, self.clean, self.codec
+                    ))
+                    if len(pending) >= max_in_flight:
+                        yield self._shard_result(pending.popleft())
+                while pending:
+                    yield self._shard_result(pending.popleft())
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    def _shard_result(self, future: Any) -> Batch:
+        """Wait for a parse worker; the wait is the parsing time not overlapped by other workers."""
+        with self.timer.phase('parse'):
+            docs, skipped = future.result()
+        self.skipped_lines += skipped
+        return docs
+
+    def _current_batch_size(self) -> int:
+        """Batch size chosen by the adaptive batcher, or the fixed `batch_size`."""
+        return self.batcher.batch_size if self.batcher is not None else self.batch_size
+
+    def _batch_stage(self, parsed: Iterator[Batch]) -> Iterator[Batch]:
+        """Regroup parsed documents into batches of the current batch size (last one may be smaller)."""
+        batch: Batch = []
+        for docs in parsed:
+            batch.extend(docs)
+            size = self._current_batch_size()
+            while len(batch) >= size:
+                yield batch[:size]
+                batch = batch[size:]
+                size = self._current_batch_size()
+        if batch:
+            yield batch
+
+    def _write(self, sink: Callable[[Batch], Any], batch: Batch) -> None:
+        """Hand one batch to the sink, feeding its latency to the histogram and adaptive batcher."""
+        if self.batcher is None and self.latency is None:
+            sink(batch)
+            return
+        payload_bytes = self.batcher.estimate_bytes(batch) if self.batcher is not None else 0
+        start = time.perf_counter_ns()
+        sink(batch)
+        elapsed = time.perf_counter_ns() - start
+        if self.latency is not None:
+            self.latency.record(elapsed)
+        if self.batcher is not None:
+            self.batcher.observe(len(batch), payload_bytes, elapsed / 1e9)
+
+    # ==================== THREADING ====================
+
+    def _put(self, out: queue.Queue, item: Any) -> bool:
+        """Put an item on a bounded queue, giving up if the pipeline was stopped."""
+        while not self._stop.is_set():
+            try:
+                out.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _pump(self, source: Callable[[], Iterator[Any]], out: queue.Queue) -> None:
+        """Thread target: drain a stage into its output queue, forwarding errors."""
+        try:
+            for item in source():
+                if not self._put(out, item):
+                    return
+        except BaseException as e:
+            self._put(out, _StageFailure(e))
+        else:
+            self._put(out, _END)
+
+    def _drain(self, source: queue.Queue) -> Iterator[Any]:
+        """Yield items from a queue until the upstream stage finishes."""
+        while True:
+            try:
+                item = source.get(timeout=0.1)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return
+                continue
+            if item is _END:
+                return
+            if isinstance(item, _StageFailure):
+                raise item.error
+            yield item
+
+    def batches(self) -> Iterator[Batch]:
+        """
+        Yield ready-to-insert batches produced by the background stages.
+
+        Closing the generator early stops the background threads.
+        """
+        self._stop.clear()
+        parsed_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        batch_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+
+        threads = []
+        if self.cache is not None and self.cache.is_fresh(self.file_path):
+            # Reader and parser are replaced by the pre-parsed cache
+            self.skipped_lines = self.cache.metadata(self.file_path)['skipped_lines']
+            parse_source = lambda: self._clean_stage(
+                self.timer.iterate(self.cache.iter_batches(self.file_path), 'read')
+            )
+        elif self.parse_workers > 1 and is_jsonl(self.file_path):
+            # Reader and parser are fused: worker processes read and decode their own shards
+            parse_source = self._sharded_parse_stage
+        else:
+            raw_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+            threads.append(threading.Thread(
+                target=self._pump, args=(self._read_stage, raw_queue),
+                name="ingest-reader", daemon=True
+            ))
+            parse_source = lambda: self._clean_stage(self._parse_stage(self._drain(raw_queue)))
+
+        threads.append(threading.Thread(
+            target=self._pump, args=(parse_source, parsed_queue),
+            name="ingest-parser", daemon=True
+        ))
+        threads.append(threading.Thread(
+            target=self._pump,
+            args=(lambda: self._batch_stage(self._drain(parsed_queue)), batch_queue),
+            name="ingest-batcher", daemon=True
+        ))
+        for thread in threads:
+            thread.start()
+
+        try:
+            yield from self._drain(batch_queue)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+    def run(self, sink: Callable[[Batch], Any], progress_every: int = 50000) -> int:
+        """
+        Feed every batch to `sink` on the calling thread.
+
+        Args:
+            sink: Callable that writes one batch to the database
+            progress_every: Print progress each time this many documents are written
+
+        Returns:
+            Number of documents written
+        """
+        total_count = 0
+        for batch in self.batches():
+            self._write(sink, batch)
+            previous = total_count
+            total_count += len(batch)
+            if progress_every and total_count // progress_every > previous // progress_every:
+                print(f"  Progress: {total_count} documents inserted...")
+        return total_count
+
+    def run_concurrent(
+        self,
+        open_sink: Callable[[], ContextManager[Callable[[Batch], Any]]],
+        writers: int = 1,
+        progress_every: int = 50000
+    ) -> int:
+        """
+        Feed batches to `writers` concurrent writer threads.
+        
+        Each writer opens its own sink (e.g. its own connection or bulk insert
+        stream) and pulls the next ready batch whenever it is free.
+
+        Args:
+            open_sink: Callable returning a context manager that yields a batch sink
+            writers: Number of concurrent writer threads
+            progress_every: Print progress each time this many documents are written
+
+        Returns:
+            Number of documents written
+        """
+        if writers <= 1:
+            with open_sink() as sink:
+                return self.run(sink, progress_every=progress_every)
+
+        batches = self.batches()
+        lock = threading.Lock()
+        state = {"total": 0}
+        errors: List[BaseException] = []
+
+        def next_batch() -> Optional[Batch]:
+            with lock:
+                if errors:
+                    return None
+                return next(batches, None)
+
+        def write() -> None:
+            try:
+                with open_sink() as sink:
+                    batch = next_batch()
+                    while batch is not None:
+                        self._write(sink, batch)
+                        with lock:
+                            previous = state["total"]
+                            state["total"] += len(batch)
+                            total_count = state["total"]
+                        if progress_every and total_count // progress_every > previous // progress_every:
+                            print(f"  Progress: {total_count} documents inserted...")
+                        batch = next_batch()
+            except BaseException as e:
+                with lock:
+                    errors.append(e)
+
+        threads = [
+            threading.Thread(target=write, name=f"ingest-writer-{i}", daemon=True)
+            for i in range(writers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for thread in threads:
+                thread.join()
+        finally:
+            batches.close()
+
+        if errors:
+            raise errors[0]
+        return state["total"]
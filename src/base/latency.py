@@ -0,0 +1,121 @@
+"""
+Latency Histogram - HDR-style recorder for per-request latencies.
+
+Values are recorded in nanoseconds (from `time.perf_counter_ns`) into
+log-linear buckets: each power-of-two range is split into a fixed number of
+linear sub-buckets, so every recorded value keeps the same relative
+precision (under 1% with the default 8 sub-bucket bits) in constant memory,
+whatever the spread between the fastest and slowest requests.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Tuple
+
+PERCENTILES = (('p50', 50.0), ('p95', 95.0), ('p99', 99.0), ('p999', 99.9))
+
+
+class LatencyHistogram:
+    """Thread-safe log-linear latency histogram with percentile queries."""
+
+    def __init__(self, sub_bucket_bits: int = 8):
+        """
+        Initialize the histogram.
+
+        Args:
+            sub_bucket_bits: log2 of the linear sub-buckets per power of two (precision)
+        """
+        self.sub_bucket_bits = sub_bucket_bits
+        self._counts: Dict[Tuple[int, int], int] = {}
+        self._count = 0
+        self._total = 0
+        self._min = None
+        self._max = 0
+        self._lock = threading.Lock()
+
+    @property
+    def count(self) -> int:
+        """Number of recorded values."""
+        return self._count
+
+    def _bucket(self, value: int) -> Tuple[int, int]:
+        shift = max(0, value.bit_length() - self.sub_bucket_bits)
+        return shift, value >> shift
+
+    def record(self, value_ns: int, count: int = 1) -> None:
+        """Record a latency in nanoseconds (`count` times)."""
+        value_ns = max(0, int(value_ns))
+        key = self._bucket(value_ns)
+        with self._lock:
+            self._counts[key] = self._counts.get(key, 0) + count
+            self._count += count
+            self._total += value_ns * count
+            if self._min is None or value_ns < self._min:
+                self._min = value_ns
+            if value_ns > self._max:
+                self._max = value_ns
+
+    def record_since(self, start_ns: int) -> int:
+        """Record the time elapsed since `start_ns` (a perf_counter_ns value) and return it."""
+        elapsed = time.perf_counter_ns() - start_ns
+        self.record(elapsed)
+        return elapsed
+
+    @contextmanager
+    def time(self) -> Iterator[None]:
+        """Record the duration of the enclosed block."""
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.record_since(start)
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """Add all values recorded by another histogram with the same precision."""
+        with other._lock:
+            counts = dict(other._counts)
+            other_min, other_max, other_total = other._min, other._max, other._total
+        with self._lock:
+            for key, count in counts.items():
+                self._counts[key] = self._counts.get(key, 0) + count
+                self._count += count
+            self._total += other_total
+            if other_min is not None and (self._min is None or other_min < self._min):
+                self._min = other_min
+            self._max = max(self._max, other_max)
+
+    def percentile(self, percentile: float) -> int:
+        """
+        Return the value (ns) at or below which `percentile` percent of recordings fall.
+
+        Args:
+            percentile: Percentile between 0 and 100
+
+        Returns:
+            Latency in nanoseconds (midpoint of the matching bucket, clamped to min/max)
+        """
+        with self._lock:
+            if not self._count:
+                return 0
+            target = max(1, int(round(percentile / 100.0 * self._count + 0.4999999)))
+            seen = 0
+            for shift, sub_bucket in sorted(self._counts, key=lambda k: k[1] << k[0]):
+                seen += self._counts[(shift, sub_bucket)]
+                if seen >= target:
+                    low = sub_bucket << shift
+                    midpoint = low + ((1 << shift) - 1) // 2
+                    return min(max(midpoint, self._min), self._max)
+            return self._max
+
+    def summary(self) -> Dict[str, Any]:
+        """Return count, mean, min, max and the standard percentiles in milliseconds."""
+        to_ms = lambda ns: round(ns / 1e6, 4)
+        result = {
+            "count": self._count,
+            "min_ms": to_ms(self._min or 0),
+            "mean_ms": to_ms(self._total / self._count) if self._count else 0,
+        }
+        for label, percentile in PERCENTILES:
+            result[f"{label}_ms"] = to_ms(self.percentile(percentile))
+        result["max_ms"] = to_ms(self._max)
+        return result
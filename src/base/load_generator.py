@@ -0,0 +1,148 @@
+"""
+Load Generator - Replays a query from concurrent workers for a fixed duration.
+
+Two modes are supported:
+
+    closed  - every worker issues its next request as soon as the previous one
+              completes, measuring the maximum throughput at N workers
+    open    - requests arrive on a fixed schedule (the target rate) whatever
+              the response times; a free worker takes the next arrival
+
+In open-loop mode latency is measured from each request's *intended* start
+time rather than from when a worker got round to sending it, so queueing
+delay caused by slow responses is included instead of silently omitted
+(coordinated-omission correction). The pure service time is recorded
+separately.
+"""
+import threading
+import time
+from typing import Any, Callable, ContextManager, Dict, List, Optional
+
+LOAD_MODES = ('closed', 'open')
+
+
+class LoadGenerator:
+    """Drive a query from N workers, each with its own connection."""
+
+    def __init__(
+        self,
+        open_worker: Callable[[], ContextManager[Callable[[], Any]]],
+        workers: int = 4,
+        duration: float = 10.0
+    ):
+        """
+        Initialize the generator.
+
+        Args:
+            open_worker: Returns a context manager yielding a function that runs one request;
+                called once per worker thread
+            workers: Number of concurrent workers
+            duration: Seconds of load per run
+        """
+        self.open_worker = open_worker
+        self.workers = workers
+        self.duration = duration
+
+    def run(
+        self,
+        target_rate: Optional[float] = None,
+        latency: Optional[Any] = None,
+        service_time: Optional[Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Run the load for `duration` seconds.
+
+        Args:
+            target_rate: Requests per second for open-loop mode; None runs closed-loop
+            latency: Optional LatencyHistogram for response times (from the intended
+                start in open-loop mode)
+            service_time: Optional LatencyHistogram for the time spent in each request alone
+
+        Returns:
+            Dictionary with mode, target and achieved ops/sec, operation and error counts
+            and the open-loop arrivals not sent before the deadline (the system fell behind)
+        """
+        if target_rate is not None and target_rate <= 0:
+            raise ValueError(f"target_rate must be positive, got {target_rate}")
+        interval_ns = int(1e9 / target_rate) if target_rate else 0
+        lock = threading.Lock()
+        counters = {"next_arrival": 0, "operations": 0, "errors": 0}
+        failures: List[BaseException] = []
+        clock = {}
+
+        def start_clock() -> None:
+            # Runs once every worker has its connection open
+            clock["start"] = time.perf_counter_ns()
+            clock["deadline"] = clock["start"] + int(self.duration * 1e9)
+
+        ready = threading.Barrier(self.workers + 1, action=start_clock)
+
+        def take_arrival() -> int:
+            with lock:
+                arrival = counters["next_arrival"]
+                counters["next_arrival"] += 1
+            return arrival
+
+        def worker() -> None:
+            try:
+                with self.open_worker() as request:
+                    ready.wait()
+                    start_ns, deadline_ns = clock["start"], clock["deadline"]
+                    operations = errors = 0
+                    while True:
+                        if interval_ns:
+                            intended = start_ns + take_arrival() * interval_ns
+                            if intended >= deadline_ns or time.perf_counter_ns() >= deadline_ns:
+                                break  # Arrivals still queued at the deadline are reported as missed
+                            delay = intended - time.perf_counter_ns()
+                            if delay > 0:
+                                time.sleep(delay / 1e9)
+                        else:
+                            intended = time.perf_counter_ns()
+                            if intended >= deadline_ns:
+                                break
+                        sent = time.perf_counter_ns()
+                        try:
+                            request()
+                        except Exception:
+                            errors += 1
+                            continue
+                        done = time.perf_counter_ns()
+                        operations += 1
+                        if latency is not None:
+                            latency.record(done - intended)
+                        if service_time is not None:
+                            service_time.record(done - sent)
+                    with lock:
+                        counters["operations"] += operations
+                        counters["errors"] += errors
+            except threading.BrokenBarrierError:
+                pass
+            except BaseException as e:
+                failures.append(e)
+                ready.abort()
+
+        threads = [threading.Thread(target=worker, daemon=True) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        try:
+            ready.wait()
+        except threading.BrokenBarrierError:
+            pass
+        for thread in threads:
+            thread.join()
+        if failures:
+            raise failures[0]
+        elapsed = (time.perf_counter_ns() - clock["start"]) / 1e9
+        scheduled = int(self.duration * target_rate) if target_rate else None
+
+        return {
+            "mode": "open" if target_rate else "closed",
+            "workers": self.workers,
+            "duration_seconds": self.duration,
+            "target_ops_per_second": target_rate,
+            "operations": counters["operations"],
+            "errors": counters["errors"],
+            "missed_arrivals": max(0, scheduled - counters["operations"] - counters["errors"]) if scheduled else 0,
+            "ops_per_second": round(counters["operations"] / elapsed, 2) if elapsed else 0,
+        }
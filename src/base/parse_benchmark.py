@@ -0,0 +1,86 @@
+"""
+Parse Benchmark - Compares CSV reader engines without touching any database.
+
+Each engine runs in a fresh worker process so its peak RSS is measured in
+isolation rather than inherited from an earlier run.
+"""
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from .ingestion import CSV_ENGINES, IngestionPipeline
+
+try:
+    import resource
+except ImportError:
+    resource = None  # Not available on Windows: peak RSS is reported as None
+
+
+def _peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MB."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes on Linux
+    return round(peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024, 2)
+
+
+def measure_csv_engine(file_path: str, engine: str, batch_size: int = 10000) -> Dict[str, float]:
+    """
+    Parse a CSV file with one engine, discarding the records. Runs in a worker process.
+
+    Args:
+        file_path: Path to the CSV file
+        engine: CSV engine name ('pandas' or 'arrow')
+        batch_size: Documents per batch
+
+    Returns:
+        Dictionary with documents, duration, docs/sec and peak RSS
+    """
+    baseline_rss = _peak_rss_mb()
+    pipeline = IngestionPipeline(file_path, batch_size=batch_size, csv_engine=engine)
+
+    start = time.perf_counter()
+    documents = pipeline.run(lambda batch: None, progress_every=0)
+    duration = time.perf_counter() - start
+
+    return {
+        "engine": engine,
+        "documents": documents,
+        "duration_seconds": round(duration, 4),
+        "docs_per_second": round(documents / duration, 2) if duration else 0,
+        "peak_rss_mb": _peak_rss_mb(),
+        "baseline_rss_mb": baseline_rss,
+    }
+
+
+def compare_csv_engines(
+    file_path: str,
+    engines: Iterable[str] = CSV_ENGINES,
+    batch_size: int = 10000
+) -> List[Dict[str, float]]:
+    """
+    Measure parse throughput and peak RSS of each CSV engine on the same file.
+
+    Args:
+        file_path: Path to the CSV file
+        engines: Engine names to compare
+        batch_size: Documents per batch
+
+    Returns:
+        One result dictionary per engine
+    """
+    results = []
+    for engine in engines:
+        print(f"--- Parsing {file_path} with the {engine} CSV engine ---")
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            try:
+                result = executor.submit(measure_csv_engine, file_path, engine, batch_size).result()
+            except ImportError as e:
+                print(f"  Skipped: {e}")
+                continue
+        print(f"  {result['documents']} documents in {result['duration_seconds']:.4f}s "
+              f"({result['docs_per_second']} docs/s), peak RSS {result['peak_rss_mb']}MB")
+        results.append(result)
+    return results
@@ -0,0 +1,273 @@
+"""
+Query Model - Database-neutral query definitions compiled by each backend.
+
+Datasets declare their queries once (see DATASET_QUERIES in main.py) and each
+backend compiles them to its own language, so every database runs an
+equivalent query:
+
+    MongoDB   - filter documents and aggregation pipelines (MQL)
+    ArangoDB  - AQL with bind parameters
+    RavenDB   - RQL with query parameters
+
+A query combines a predicate tree (comparisons, case-insensitive substring
+matches, and/or), a projection, a sort, a limit and optional grouped
+aggregations:
+
+    Query(
+        where=Or(Comparison('rating', '>=', 3), Contains('review_text', ['fantastic', 'story'])),
+        select=['book_id', 'rating'],
+        sort=[('rating', False)],
+        limit=100
+    )
+
+Names queried by the shared phases:
+
+    match  - the dataset's realistic filter (reads, updates, load generator)
+
+Datasets also declare the secondary indexes built by the index phase
+(see DATASET_INDEXES in main.py); INDEX_MODES selects whether the query
+phases run without them, with them, or both.
+
+Full-text searches are declared separately (see DATASET_TEXT_SEARCHES in
+main.py) because they run against each database's native text index: a
+Mongo text index, an ArangoSearch view and a RavenDB full-text static index,
+all ranked by relevance.
+
+Analytical aggregations are declared the same way (see DATASET_AGGREGATIONS in
+main.py) as grouped queries. A grouped query may be followed by another one
+(`then`) grouping its rows again, e.g. reviews per user, then users per review
+count. Mongo appends the stages to one pipeline, Arango nests the AQL COLLECT
+in a subquery and RavenDB chains map-reduce indexes, the first writing its
+results to a collection mapped by the next.
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+COMPARISON_OPERATORS = ('==', '!=', '>', '>=', '<', '<=')
+SHARED_QUERIES = ('match',)
+AGGREGATE_FUNCTIONS = ('count', 'sum', 'avg', 'min', 'max')
+INDEX_MODES = ('none', 'indexed', 'both')
+
+
+class Predicate(ABC):
+    """Abstract base class of filter conditions."""
+
+    @abstractmethod
+    def fields(self) -> List[str]:
+        """Document fields referenced by the predicate, in first-use order."""
+        pass
+
+
+class Comparison(Predicate):
+    """Compare a field with a constant."""
+
+    def __init__(self, field: str, operator: str, value: Any):
+        """
+        Initialize the comparison.
+
+        Args:
+            field: Document field
+            operator: One of COMPARISON_OPERATORS
+            value: Constant compared with the field
+
+        Raises:
+            ValueError: If the operator is unknown
+        """
+        if operator not in COMPARISON_OPERATORS:
+            raise ValueError(f"Unknown comparison operator: {operator} (expected one of {COMPARISON_OPERATORS})")
+        self.field = field
+        self.operator = operator
+        self.value = value
+
+    def fields(self) -> List[str]:
+        return [self.field]
+
+
+class Contains(Predicate):
+    """Case-insensitive substring match of any of the terms in a text field."""
+
+    def __init__(self, field: str, terms: Sequence[str]):
+        """
+        Initialize the match.
+
+        Args:
+            field: Text field
+            terms: Substrings, any of which satisfies the predicate
+
+        Raises:
+            ValueError: If no terms are given
+        """
+        if not terms:
+            raise ValueError("Contains needs at least one term")
+        self.field = field
+        self.terms = [term.lower() for term in terms]
+
+    def fields(self) -> List[str]:
+        return [self.field]
+
+
+class _Compound(Predicate):
+    """Predicate combining child predicates."""
+
+    def __init__(self, *predicates: Predicate):
+        if not predicates:
+            raise ValueError(f"{type(self).__name__} needs at least one predicate")
+        self.predicates = list(predicates)
+
+    def fields(self) -> List[str]:
+        fields: List[str] = []
+        for predicate in self.predicates:
+            fields.extend(field for field in predicate.fields() if field not in fields)
+        return fields
+
+
+class And(_Compound):
+    """All child predicates hold."""
+
+
+class Or(_Compound):
+    """At least one child predicate holds."""
+
+
+class Aggregate:
+    """One aggregated value of a grouped query."""
+
+    def __init__(self, function: str, field: Optional[str] = None):
+        """
+        Initialize the aggregate.
+
+        Args:
+            function: One of AGGREGATE_FUNCTIONS
+            field: Aggregated field (not used by count)
+
+        Raises:
+            ValueError: If the function is unknown or a field is missing
+        """
+        if function not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unknown aggregate function: {function} (expected one of {AGGREGATE_FUNCTIONS})")
+        if function != 'count' and field is None:
+            raise ValueError(f"Aggregate {function} needs a field")
+        self.function = function
+        self.field = field
+
+
+class Query:
+    """Filter, projection, sort, limit and grouped aggregations over one collection."""
+
+    def __init__(
+        self,
+        where: Optional[Predicate] = None,
+        select: Optional[Sequence[str]] = None,
+        sort: Optional[Sequence[Tuple[str, bool]]] = None,
+        limit: Optional[int] = None,
+        group_by: Optional[str] = None,
+        aggregates: Optional[Dict[str, Aggregate]] = None,
+        then: Optional['Query'] = None
+    ):
+        """
+        Initialize the query.
+
+        Args:
+            where: Filter; None matches every document
+            select: Fields returned for each document; None returns whole documents
+            sort: (field, ascending) pairs; grouped queries sort on the group field or aggregate names
+            limit: Maximum number of results
+            group_by: Field grouping the matched documents
+            aggregates: Output name and aggregate per group (requires group_by)
+            then: Grouped query run over this query's rows (requires group_by on both)
+
+        Raises:
+            ValueError: If aggregates are given without group_by or combined with select,
+                or `then` does not chain two grouped queries
+        """
+        if aggregates and group_by is None:
+            raise ValueError("Aggregates need a group_by field")
+        if group_by is not None and select:
+            raise ValueError("Grouped queries return the group field and aggregates; select is not allowed")
+        if then is not None and (group_by is None or not then.is_grouped):
+            raise ValueError("Only a grouped query can be followed by another grouped query")
+        self.where = where
+        self.select = list(select) if select else None
+        self.sort = list(sort or [])
+        self.limit = limit
+        self.group_by = group_by
+        self.aggregates = dict(aggregates or {})
+        self.then = then
+
+    @property
+    def is_grouped(self) -> bool:
+        """True if the query returns one row per group."""
+        return self.group_by is not None
+
+    def stages(self) -> List['Query']:
+        """This query followed by its chained `then` queries, in execution order."""
+        stages = [self]
+        while stages[-1].then is not None:
+            stages.append(stages[-1].then)
+        return stages
+
+    def fields(self) -> List[str]:
+        """Document fields the query filters, groups or aggregates on (what an index would cover)."""
+        fields = self.where.fields() if self.where is not None else []
+        extra = [self.group_by] + [aggregate.field for aggregate in self.aggregates.values()]
+        if not self.is_grouped:
+            extra += [field for field, _ in self.sort]
+        fields.extend(field for field in extra if field is not None and field not in fields)
+        return fields
+
+
+class Index:
+    """Secondary index over one or more document fields."""
+
+    def __init__(self, name: str, fields: Sequence[str]):
+        """
+        Initialize the index.
+
+        Args:
+            name: Index name (unique per collection)
+            fields: Indexed fields, in key order for compound indexes
+
+        Raises:
+            ValueError: If no fields are given
+        """
+        if not fields:
+            raise ValueError(f"Index {name} needs at least one field")
+        self.name = name
+        self.fields = list(fields)
+
+
+class TextQuery:
+    """Full-text search ranked by relevance (best match first)."""
+
+    def __init__(self, text: str, phrase: bool = False, limit: int = 100):
+        """
+        Initialize the search.
+
+        Args:
+            text: A term, several terms (documents matching any of them) or a phrase
+            phrase: Match the words of `text` as an exact phrase
+            limit: Number of top-ranked documents returned
+        """
+        self.text = text
+        self.phrase = phrase
+        self.limit = limit
+
+
+class TextSearch:
+    """Text fields of a collection and the named searches run against them."""
+
+    def __init__(self, fields: Sequence[str], queries: Dict[str, TextQuery]):
+        """
+        Initialize the text search workload.
+
+        Args:
+            fields: Text fields covered by the full-text index
+            queries: Search name -> TextQuery
+
+        Raises:
+            ValueError: If no fields are given
+        """
+        if not fields:
+            raise ValueError("Text search needs at least one field")
+        self.fields = list(fields)
+        self.queries = dict(queries)
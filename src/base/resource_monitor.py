@@ -1,11 +1,39 @@
 """
 Docker Resource Monitor - Reusable component for monitoring container resources.
+
+When the host uses cgroup v2 and the container's cgroup directory is readable,
+samples are read straight from its cpu.stat, memory.current/memory.stat and
+io.stat files, and network counters from /proc/<pid>/net/dev of its init
+process, every 50 ms. Otherwise the monitor falls back to spawning
+`docker stats --no-stream` every 0.5 s (which reports no I/O operation counts).
 """
+import os
 import subprocess
 import threading
 import time
 import re
-from typing import Dict, List
+from typing import Any, Dict, List, Optional, Tuple
+
+CGROUP_ROOT = '/sys/fs/cgroup'
+
+# Cumulative network and block I/O counters stored with every sample
+IO_COUNTERS = ('net_rx_bytes', 'net_tx_bytes', 'io_read_bytes', 'io_write_bytes', 'io_reads', 'io_writes')
+
+_SIZE_UNITS = {
+    'B': 1, 'kB': 1e3, 'KB': 1e3, 'MB': 1e6, 'GB': 1e9, 'TB': 1e12,
+    'KiB': 1024, 'MiB': 1024 ** 2, 'GiB': 1024 ** 3, 'TiB': 1024 ** 4,
+}
+
+# Cgroup directories and init PIDs of running containers, resolved once per container name
+_container_cgroups: Dict[str, Tuple[str, int]] = {}
+
+
+def parse_size(text: str) -> float:
+    """Convert a docker size string such as '1.5MB' or '3.2GiB' into bytes."""
+    match = re.match(r'\s*([\d.]+)\s*([A-Za-z]*)', text)
+    if not match:
+        return 0
+    return float(match.group(1)) * _SIZE_UNITS.get(match.group(2), 1)
 
 
 def get_docker_stats(container_name: str) -> Dict[str, float]:
@@ -13,7 +41,7 @@ def get_docker_stats(container_name: str) -> Dict[str, float]:
     try:
         result = subprocess.run(
             ["docker", "stats", container_name, "--no-stream", "--format",
-             "{{.CPUPerc}},{{.MemUsage}},{{.MemPerc}}"],
+             "{{.CPUPerc}},{{.MemUsage}},{{.MemPerc}},{{.NetIO}},{{.BlockIO}}"],
             capture_output=True, text=True, timeout=5
         )
         if result.returncode == 0:
@@ -26,47 +54,325 @@ def get_docker_stats(container_name: str) -> Dict[str, float]:
             if 'GiB' in mem_usage:
                 mem_value *= 1024
 
-            return {"cpu": cpu_percent, "mem_mb": mem_value, "mem_percent": mem_percent}
+            # NetIO and BlockIO are cumulative "<in> / <out>" totals
+            net_rx, net_tx = (parse_size(part) for part in parts[3].split('/'))
+            io_read, io_write = (parse_size(part) for part in parts[4].split('/'))
+
+            return {"cpu": cpu_percent, "mem_mb": mem_value, "mem_percent": mem_percent,
+                    "net_rx_bytes": net_rx, "net_tx_bytes": net_tx,
+                    "io_read_bytes": io_read, "io_write_bytes": io_write,
+                    "io_reads": None, "io_writes": None}
     except Exception:
         pass
-    return {"cpu": 0, "mem_mb": 0, "mem_percent": 0}
+    return {"cpu": 0, "mem_mb": 0, "mem_percent": 0, **{counter: None for counter in IO_COUNTERS}}
+
+
+def find_container_cgroup(container_name: str) -> Optional[Tuple[str, int]]:
+    """
+    Return the cgroup v2 directory and init PID of a running container, or None if they cannot be read.
+
+    The full container id and PID are resolved once with `docker inspect`; both
+    the systemd (`system.slice/docker-<id>.scope`) and cgroupfs (`docker/<id>`)
+    layouts are recognised.
+    """
+    if container_name in _container_cgroups:
+        return _container_cgroups[container_name]
+    if not os.path.exists(os.path.join(CGROUP_ROOT, 'cgroup.controllers')):
+        return None  # Not a cgroup v2 (unified) hierarchy
+    try:
+        result = subprocess.run(
+            ["docker", "inspect", "--format", "{{.Id}} {{.State.Pid}}", container_name],
+            capture_output=True, text=True, timeout=5
+        )
+    except Exception:
+        return None
+    fields = result.stdout.split()
+    if result.returncode != 0 or len(fields) != 2:
+        return None
+    container_id, pid = fields[0], int(fields[1])
+
+    for candidate in (
+        os.path.join(CGROUP_ROOT, 'system.slice', f'docker-{container_id}.scope'),
+        os.path.join(CGROUP_ROOT, 'docker', container_id),
+    ):
+        if os.access(os.path.join(candidate, 'cpu.stat'), os.R_OK):
+            _container_cgroups[container_name] = (candidate, pid)
+            return candidate, pid
+    return None
+
+
+class CgroupReader:
+    """Reads cumulative CPU, memory, block I/O and network counters of a container."""
+
+    def __init__(self, path: str, pid: Optional[int] = None):
+        """
+        Initialize the reader.
+
+        Args:
+            path: Container cgroup directory (see find_container_cgroup)
+            pid: Host PID of a process in the container, used to read its network namespace counters
+        """
+        self.path = path
+        self.net_dev_path = f"/proc/{pid}/net/dev" if pid else None
+        self.mem_limit_bytes = self._memory_limit()
+
+    def _read(self, name: str) -> str:
+        with open(os.path.join(self.path, name)) as f:
+            return f.read()
+
+    def _memory_limit(self) -> int:
+        """Container memory limit, or the host's physical memory when unlimited (as docker stats)."""
+        try:
+            limit = self._read('memory.max').strip()
+            if limit != 'max':
+                return int(limit)
+        except OSError:
+            pass
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+
+    def read(self) -> Dict[str, int]:
+        """
+        Read the current counters.
+
+        Returns:
+            Dictionary with cumulative `cpu_usec`, current `mem_bytes` (excluding
+            inactive page cache, as docker stats reports it) and cumulative
+            `io_read_bytes`, `io_write_bytes`, `io_reads`, `io_writes`,
+            `net_rx_bytes` and `net_tx_bytes` (None when net/dev is unreadable)
+        """
+        sample = {"cpu_usec": 0, "mem_bytes": 0, **{counter: 0 for counter in IO_COUNTERS}}
+
+        for line in self._read('cpu.stat').splitlines():
+            key, _, value = line.partition(' ')
+            if key == 'usage_usec':
+                sample["cpu_usec"] = int(value)
+                break
+
+        inactive_file = 0
+        for line in self._read('memory.stat').splitlines():
+            key, _, value = line.partition(' ')
+            if key == 'inactive_file':
+                inactive_file = int(value)
+                break
+        sample["mem_bytes"] = max(0, int(self._read('memory.current')) - inactive_file)
+
+        io_keys = {'rbytes': 'io_read_bytes', 'wbytes': 'io_write_bytes', 'rios': 'io_reads', 'wios': 'io_writes'}
+        try:
+            io_stat = self._read('io.stat')
+        except OSError:
+            io_stat = ''  # io controller not enabled for the container
+        for line in io_stat.splitlines():
+            for field in line.split()[1:]:
+                key, _, value = field.partition('=')
+                if key in io_keys:
+                    sample[io_keys[key]] += int(value)
+
+        try:
+            with open(self.net_dev_path) as f:
+                net_dev = f.read().splitlines()[2:]  # Two header lines
+        except (OSError, TypeError):
+            sample["net_rx_bytes"] = sample["net_tx_bytes"] = None
+            net_dev = []
+        for line in net_dev:
+            interface, _, counters = line.partition(':')
+            if interface.strip() == 'lo':
+                continue
+            fields = counters.split()
+            sample["net_rx_bytes"] += int(fields[0])
+            sample["net_tx_bytes"] += int(fields[8])
+        return sample
 
 
 class DockerResourceMonitor(threading.Thread):
-    """Monitor Docker container resources during benchmark operations."""
+    """
+    Monitor Docker container resources as a timestamped time series.
+
+    The monitor can cover a single operation (start, then stop) or run for the
+    whole benchmark: each operation then registers its start/end offsets with
+    `add_phase` and is summarized from its slice of the series with
+    `summarize`, and `timeline` returns the complete series for the run.
+    """
 
-    def __init__(self, container_name: str, interval: float = 0.5):
-        super().__init__()
+    def __init__(self, container_name: str, interval: Optional[float] = None):
+        """
+        Initialize the monitor.
+
+        Args:
+            container_name: Docker container to sample
+            interval: Seconds between samples (default 0.05 from cgroups, 0.5 from docker stats)
+        """
+        super().__init__(daemon=True)
         self.container_name = container_name
+        cgroup = find_container_cgroup(container_name)
+        self.reader = CgroupReader(*cgroup) if cgroup else None
+        self.sampler = "cgroup" if self.reader else "docker_stats"
+        if interval is None:
+            interval = 0.05 if self.reader else 0.5
         self.interval = interval
         self.running = True
-        self.cpu_usages: List[float] = []
-        self.memory_usages_mb: List[float] = []
-        self.memory_usages_percent: List[float] = []
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self.samples: List[Dict[str, float]] = []
+        self.phases: List[Dict[str, Any]] = []
+        self._baseline: Dict[str, Any] = {}  # I/O counters when the current sampler started
+
+    def elapsed(self) -> float:
+        """Seconds since the monitor was created (the time base of samples and phases)."""
+        return time.perf_counter() - self._origin
+
+    def _append(self, cpu: float, mem_mb: float, mem_percent: float, counters: Dict[str, Any]) -> None:
+        self.samples.append({
+            "t": round(self.elapsed(), 4),
+            "cpu": round(cpu, 2),
+            "mem_mb": round(mem_mb, 2),
+            "mem_percent": round(mem_percent, 2),
+            "sampler": self.sampler,
+            **{counter: counters.get(counter) for counter in IO_COUNTERS}
+        })
+
+    def _set_baseline(self, counters: Dict[str, Any]) -> None:
+        self._baseline = {"sampler": self.sampler, **{counter: counters.get(counter) for counter in IO_COUNTERS}}
 
     def run(self) -> None:
+        if self.reader is not None:
+            try:
+                self._sample_cgroup()
+                return
+            except (OSError, ValueError):
+                # Container stopped or cgroup no longer readable: keep sampling through docker stats,
+                # whose counters have another origin (and no disk ops), so they get their own baseline
+                self.sampler = "docker_stats"
+                self._baseline = {}
         while self.running:
             stats = get_docker_stats(self.container_name)
-            self.cpu_usages.append(stats["cpu"])
-            self.memory_usages_mb.append(stats["mem_mb"])
-            self.memory_usages_percent.append(stats["mem_percent"])
+            if not self._baseline:
+                self._set_baseline(stats)
+            self._append(stats["cpu"], stats["mem_mb"], stats["mem_percent"], stats)
             time.sleep(self.interval)
 
-    def stop(self) -> Dict[str, float]:
-        """Stop monitoring and return aggregated statistics."""
-        self.running = False
-        self.join()
+    def _sample_cgroup(self) -> None:
+        """Sample the cgroup counters; CPU % is the usage delta over wall time (100% = one core)."""
+        previous = self.reader.read()
+        previous_time = time.perf_counter()
+        self._set_baseline(previous)
+        while self.running:
+            time.sleep(self.interval)
+            sample = self.reader.read()
+            now = time.perf_counter()
+            elapsed_usec = (now - previous_time) * 1e6
+            cpu = (sample["cpu_usec"] - previous["cpu_usec"]) / elapsed_usec * 100 if elapsed_usec > 0 else 0
+            self._append(
+                cpu,
+                sample["mem_bytes"] / (1024 * 1024),
+                sample["mem_bytes"] / self.reader.mem_limit_bytes * 100,
+                sample
+            )
+            previous, previous_time = sample, now
+
+    def add_phase(self, name: str, start: float, end: float) -> None:
+        """Register an operation's start/end offsets (from `elapsed`) in the timeline."""
+        self.phases.append({"name": name, "start": round(start, 4), "end": round(end, 4)})
+
+    def summarize(self, start: Optional[float] = None, end: Optional[float] = None) -> Dict[str, Any]:
+        """
+        Aggregate the samples taken between two offsets (the whole series by default).
+
+        A sample covers the interval before its timestamp, so the first sample
+        after `end` is included as well. Callers summarize right at `end`, before
+        that sample exists, so while sampling is running this waits up to two
+        intervals for it (a slow `docker stats` call may still miss it, and the
+        window then ends at the last sample). Network and block I/O are reported
+        as deltas of the cumulative counters across the window and as rates; a
+        window spanning the fallback from cgroup files to `docker stats` reports
+        them as unavailable, since the two samplers' counters are not comparable.
 
-        avg_cpu = sum(self.cpu_usages) / len(self.cpu_usages) if self.cpu_usages else 0
-        max_cpu = max(self.cpu_usages) if self.cpu_usages else 0
-        avg_mem_mb = sum(self.memory_usages_mb) / len(self.memory_usages_mb) if self.memory_usages_mb else 0
-        max_mem_mb = max(self.memory_usages_mb) if self.memory_usages_mb else 0
-        avg_mem_pct = sum(self.memory_usages_percent) / len(self.memory_usages_percent) if self.memory_usages_percent else 0
+        Args:
+            start: Window start, from `elapsed`
+            end: Window end, from `elapsed`
+
+        Returns:
+            Dictionary of average/max CPU and memory, network/disk bytes, rates
+            and IOPS, sampler name(s) and sample count
+        """
+        if end is not None and self.is_alive():
+            deadline = time.perf_counter() + 2 * self.interval
+            while time.perf_counter() < deadline and not (self.samples and self.samples[-1]["t"] > end):
+                time.sleep(self.interval / 10)
+        all_samples = list(self.samples)
+        low = start if start is not None else float('-inf')
+        high = end + self.interval if end is not None else float('inf')
+        samples = [s for s in all_samples if low < s["t"] <= high]
+        # Counters at the window start: the sampler's last sample before it, or its values when it started
+        window_sampler = samples[0]["sampler"] if samples else self.sampler
+        before = [s for s in all_samples if s["t"] <= low and s["sampler"] == window_sampler]
+        baseline = before[-1] if before else self._baseline
+        samplers = sorted({s["sampler"] for s in (baseline, *samples) if s})
+        last = samples[-1] if samples and len(samplers) <= 1 else None
+        if start is not None and end is not None:
+            window = end - start
+        else:
+            window = samples[-1]["t"] - (before[-1]["t"] if before else 0) if samples else 0
+
+        cpu_usages = [s["cpu"] for s in samples]
+        memory_usages_mb = [s["mem_mb"] for s in samples]
+        memory_usages_percent = [s["mem_percent"] for s in samples]
+
+        avg_cpu = sum(cpu_usages) / len(cpu_usages) if cpu_usages else 0
+        max_cpu = max(cpu_usages) if cpu_usages else 0
+        avg_mem_mb = sum(memory_usages_mb) / len(memory_usages_mb) if memory_usages_mb else 0
+        max_mem_mb = max(memory_usages_mb) if memory_usages_mb else 0
+        avg_mem_pct = sum(memory_usages_percent) / len(memory_usages_percent) if memory_usages_percent else 0
 
         return {
             "container_cpu_avg": round(avg_cpu, 2),
             "container_cpu_max": round(max_cpu, 2),
             "container_mem_avg_mb": round(avg_mem_mb, 2),
             "container_mem_max_mb": round(max_mem_mb, 2),
-            "container_mem_avg_percent": round(avg_mem_pct, 2)
+            "container_mem_avg_percent": round(avg_mem_pct, 2),
+            **self._io_deltas(baseline, last, window),
+            "sampler": "+".join(samplers) if samplers else self.sampler,
+            "samples": len(samples)
+        }
+
+    @staticmethod
+    def _io_deltas(first: Dict[str, Any], last: Optional[Dict[str, Any]], window: float) -> Dict[str, Any]:
+        """Network/disk byte deltas, byte rates and IOPS between two samples (None when not collected)."""
+        def delta(counter):
+            if last is None or first.get(counter) is None or last.get(counter) is None:
+                return None
+            return max(0, last[counter] - first[counter])
+
+        def rate(value):
+            if value is None:
+                return None
+            return round(value / window, 2) if window > 0 else 0
+
+        names = {
+            'net_rx_bytes': 'net_rx', 'net_tx_bytes': 'net_tx',
+            'io_read_bytes': 'disk_read', 'io_write_bytes': 'disk_write',
         }
+        result = {}
+        for counter, name in names.items():
+            value = delta(counter)
+            result[f"{name}_bytes"] = int(value) if value is not None else None
+            result[f"{name}_bytes_per_sec"] = rate(value)
+        result["disk_read_iops"] = rate(delta('io_reads'))
+        result["disk_write_iops"] = rate(delta('io_writes'))
+        return result
+
+    def timeline(self) -> Dict[str, Any]:
+        """Return the full sample series with the registered phases."""
+        return {
+            "container": self.container_name,
+            "sampler": self.sampler,
+            "interval_seconds": self.interval,
+            "started_at": self.started_at,
+            "phases": list(self.phases),
+            "samples": list(self.samples)
+        }
+
+    def stop(self) -> Dict[str, Any]:
+        """Stop monitoring and return aggregated statistics."""
+        self.running = False
+        self.join()
+        return self.summarize()
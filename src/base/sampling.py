@@ -0,0 +1,66 @@
+"""
+Key Sampling - Uniform reservoir samples of the keys written during an import.
+
+Backends report the keys of each inserted batch and the sampler keeps a
+uniform random sample of fixed size without knowing the document count in
+advance. It uses Li's Algorithm L, which computes how many items to skip
+between replacements, so the cost per batch grows with the number of keys
+kept rather than with the batch size: only the selected positions of a batch
+are ever read.
+"""
+import math
+import random
+import threading
+from typing import Any, Callable, List, Optional, Sequence
+
+
+class ReservoirSampler:
+    """Thread-safe fixed-size uniform sample of a stream of keys (Algorithm L)."""
+
+    def __init__(self, size: int, seed: Optional[int] = None):
+        """
+        Initialize the sampler.
+
+        Args:
+            size: Number of keys to keep
+            seed: Random seed, so samples are reproducible
+
+        Raises:
+            ValueError: If size is not positive
+        """
+        if size <= 0:
+            raise ValueError(f"Sample size must be positive, got {size}")
+        self.size = size
+        self.keys: List[Any] = []
+        self.seen = 0
+        self._rng = random.Random(seed)
+        self._weight = 1.0
+        self._next = size - 1  # Stream position of the last key taken (next one drawn once full)
+        self._lock = threading.Lock()
+
+    def _advance(self) -> None:
+        """Draw the position of the next key replacing a random reservoir slot."""
+        # 1 - random() lies in (0, 1], so the logarithms are always defined
+        self._weight *= math.exp(math.log(1.0 - self._rng.random()) / self.size)
+        self._next += int(math.log(1.0 - self._rng.random()) / math.log1p(-self._weight)) + 1
+
+    def add_many(self, items: Sequence[Any], key: Optional[Callable[[Any], Any]] = None) -> None:
+        """
+        Offer one inserted batch to the sample.
+
+        Args:
+            items: Inserted documents or keys, in insertion order
+            key: Optional function extracting the key from an item (applied to selected items only)
+        """
+        with self._lock:
+            start = self.seen
+            self.seen += len(items)
+            if len(self.keys) < self.size:
+                fill = items[:self.size - len(self.keys)]
+                self.keys.extend(map(key, fill) if key else fill)
+                if len(self.keys) == self.size:
+                    self._advance()
+            while self._next < self.seen:
+                item = items[self._next - start]
+                self.keys[self._rng.randrange(self.size)] = key(item) if key else item
+                self._advance()
@@ -0,0 +1,102 @@
+"""
+Statistics - Summaries and significance checks for repeated measurements.
+
+Confidence intervals are percentile bootstrap intervals of the mean, which
+make no normality assumption and stay usable for the handful of repetitions
+a database benchmark can afford.
+"""
+import statistics
+from typing import Any, Dict, Sequence, Tuple
+
+import numpy as np
+
+BOOTSTRAP_RESAMPLES = 10000
+
+
+def bootstrap_ci(
+    values: Sequence[float],
+    confidence: float = 0.95,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    seed: int = 0
+) -> Tuple[float, float]:
+    """
+    Percentile bootstrap confidence interval of the mean.
+
+    Args:
+        values: Measurements
+        confidence: Confidence level of the interval
+        resamples: Number of bootstrap resamples
+        seed: Random seed, so reports are reproducible
+
+    Returns:
+        (low, high) bounds of the interval
+    """
+    data = np.asarray(values, dtype=float)
+    if len(data) < 2:
+        return float(data.mean()), float(data.mean())
+    rng = np.random.default_rng(seed)
+    means = rng.choice(data, size=(resamples, len(data)), replace=True).mean(axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(means, [alpha, 1 - alpha])
+    return float(low), float(high)
+
+
+def summarize(values: Sequence[float], confidence: float = 0.95) -> Dict[str, Any]:
+    """
+    Summarize repeated measurements.
+
+    Args:
+        values: Measurements (e.g. durations in seconds)
+        confidence: Confidence level of the bootstrap interval
+
+    Returns:
+        Dictionary with n, mean, stddev, min, median, max and the CI bounds
+    """
+    values = list(values)
+    ci_low, ci_high = bootstrap_ci(values, confidence)
+    return {
+        "n": len(values),
+        "mean": round(statistics.fmean(values), 4),
+        "stddev": round(statistics.stdev(values), 4) if len(values) > 1 else 0.0,
+        "min": round(min(values), 4),
+        "median": round(statistics.median(values), 4),
+        "max": round(max(values), 4),
+        "confidence": confidence,
+        "ci_low": round(ci_low, 4),
+        "ci_high": round(ci_high, 4),
+    }
+
+
+def differs_significantly(
+    a: Sequence[float],
+    b: Sequence[float],
+    confidence: float = 0.95,
+    resamples: int = BOOTSTRAP_RESAMPLES,
+    seed: int = 0
+) -> bool:
+    """
+    Return True if the means of two samples differ at the given confidence level.
+
+    The bootstrap interval of the difference of means (each sample resampled
+    independently) must exclude zero.
+
+    Args:
+        a: Measurements of the first system
+        b: Measurements of the second system
+        confidence: Confidence level
+        resamples: Number of bootstrap resamples
+        seed: Random seed
+
+    Returns:
+        True if the difference is significant, False otherwise (or with fewer than 2 values each)
+    """
+    if len(a) < 2 or len(b) < 2:
+        return False
+    rng = np.random.default_rng(seed)
+    a_data = np.asarray(a, dtype=float)
+    b_data = np.asarray(b, dtype=float)
+    a_means = rng.choice(a_data, size=(resamples, len(a_data)), replace=True).mean(axis=1)
+    b_means = rng.choice(b_data, size=(resamples, len(b_data)), replace=True).mean(axis=1)
+    alpha = (1 - confidence) / 2
+    low, high = np.quantile(a_means - b_means, [alpha, 1 - alpha])
+    return bool(low > 0 or high < 0)
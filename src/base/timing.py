@@ -0,0 +1,104 @@
+"""
+Phase Timer - Splits an operation's time into client-side and server-side phases.
+
+Implementations wrap their hot paths in the standard phases:
+
+    read    - reading input files
+    parse   - decoding input (JSON/CSV) and driver responses
+    encode  - encoding requests (BSON, VelocyPack/JSON, RavenDB JSON, export lines)
+    server  - waiting on the database (request round trips, cursor fetches)
+    write   - writing output files
+
+Nested phases are exclusive: time spent in an inner phase (e.g. a driver's
+serializer called during a `server` round trip) is subtracted from the outer
+one. Phases running on background ingestion threads overlap the caller's
+phases, so their sum can exceed the wall-clock duration.
+"""
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterable, Iterator, List
+
+PHASES = ('read', 'parse', 'encode', 'server', 'write')
+
+
+class PhaseTimer:
+    """Thread-safe accumulator of exclusive time per phase."""
+
+    def __init__(self):
+        self._totals: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _stack(self) -> List[List[float]]:
+        stack = getattr(self._local, 'stack', None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _enter(self) -> float:
+        self._stack().append([0.0])
+        return time.perf_counter()
+
+    def _exit(self, name: str, start: float) -> None:
+        elapsed = time.perf_counter() - start
+        stack = self._stack()
+        nested = stack.pop()[0]
+        if stack:
+            stack[-1][0] += elapsed
+        self.add(name, elapsed - nested)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add externally measured seconds to a phase."""
+        with self._lock:
+            self._totals[name] = self._totals.get(name, 0.0) + seconds
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as `name`."""
+        start = self._enter()
+        try:
+            yield
+        finally:
+            self._exit(name, start)
+
+    def timed(self, name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Return `func` wrapped so that every call is timed as `name`."""
+        def wrapper(*args, **kwargs):
+            start = self._enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._exit(name, start)
+        return wrapper
+
+    def iterate(self, iterable: Iterable[Any], name: str) -> Iterator[Any]:
+        """Yield from `iterable`, timing each fetch of the next item as `name`."""
+        iterator = iter(iterable)
+        while True:
+            start = self._enter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                self._exit(name, start)
+            yield item
+
+    def snapshot(self, duration: float = None) -> Dict[str, float]:
+        """
+        Return the accumulated seconds per phase.
+
+        Args:
+            duration: Wall-clock duration of the operation; adds the time not
+                attributed to any phase when given
+
+        Returns:
+            Dictionary of `<phase>_seconds` values
+        """
+        with self._lock:
+            totals = dict(self._totals)
+        breakdown = {f"{name}_seconds": round(seconds, 4) for name, seconds in totals.items()}
+        if duration is not None:
+            breakdown["unattributed_seconds"] = round(max(0.0, duration - sum(totals.values())), 4)
+        return breakdown
@@ -0,0 +1,253 @@
+"""
+Workloads - YCSB-style mixed operation suites over the loaded review collections.
+
+The classic YCSB core workloads are replayed against a sample of existing
+document keys:
+
+    a  Update heavy          50% read, 50% update            zipfian
+    b  Read mostly           95% read,  5% update            zipfian
+    c  Read only            100% read                         zipfian
+    d  Read latest           95% read,  5% insert            latest
+    e  Short ranges          95% scan,  5% insert            zipfian
+    f  Read-modify-write     50% read, 50% read-modify-write zipfian
+
+Keys are chosen with a uniform, (scrambled) zipfian or latest distribution;
+keys inserted during the run join the key space, so `latest` favours them.
+Backends provide the record operations (read_record, update_record,
+insert_record, scan_records) and the generator drives them from concurrent
+workers.
+"""
+import random
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import numpy as np
+
+DISTRIBUTIONS = ('uniform', 'zipfian', 'latest')
+OPERATIONS = ('read', 'update', 'insert', 'scan', 'read_modify_write')
+
+ZIPFIAN_CONSTANT = 0.99
+_FNV_OFFSET_BASIS = 0xCBF29CE484222325
+_FNV_PRIME = 0x100000001B3
+
+
+def fnv_hash(value: int) -> int:
+    """64-bit FNV-1a hash of an integer (used by YCSB to scatter zipfian hot keys)."""
+    hashed = _FNV_OFFSET_BASIS
+    for _ in range(8):
+        hashed ^= value & 0xFF
+        hashed = (hashed * _FNV_PRIME) & 0xFFFFFFFFFFFFFFFF
+        value >>= 8
+    return hashed
+
+
+class Workload:
+    """One YCSB operation mix."""
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        proportions: Dict[str, float],
+        distribution: str = 'zipfian',
+        max_scan_length: int = 100
+    ):
+        """
+        Initialize the workload.
+
+        Args:
+            name: Workload letter
+            description: Human-readable description
+            proportions: Fraction of requests per operation (see OPERATIONS)
+            distribution: Default key distribution ('uniform', 'zipfian' or 'latest')
+            max_scan_length: Scans read between 1 and this many records
+        """
+        self.name = name
+        self.description = description
+        self.proportions = proportions
+        self.distribution = distribution
+        self.max_scan_length = max_scan_length
+
+
+WORKLOADS = {
+    'a': Workload('a', 'Update heavy', {'read': 0.5, 'update': 0.5}),
+    'b': Workload('b', 'Read mostly', {'read': 0.95, 'update': 0.05}),
+    'c': Workload('c', 'Read only', {'read': 1.0}),
+    'd': Workload('d', 'Read latest', {'read': 0.95, 'insert': 0.05}, distribution='latest'),
+    'e': Workload('e', 'Short ranges', {'scan': 0.95, 'insert': 0.05}),
+    'f': Workload('f', 'Read-modify-write', {'read': 0.5, 'read_modify_write': 0.5}),
+}
+
+
+class ZipfianGenerator:
+    """
+    Zipfian item indexes over a growing item count (Gray et al., as in YCSB).
+
+    Index 0 is the most popular item. zeta(n) is extended incrementally when
+    the item count grows, so inserts do not force a full recomputation.
+    """
+
+    def __init__(self, items: int, theta: float = ZIPFIAN_CONSTANT):
+        self.theta = theta
+        self.alpha = 1.0 / (1.0 - theta)
+        self.zeta2 = 1.0 + 0.5 ** theta
+        self.items = 0
+        self.zetan = 0.0
+        self._lock = threading.Lock()
+        self._grow(items)
+
+    def _grow(self, items: int) -> None:
+        if items > self.items:
+            ranks = np.arange(self.items + 1, items + 1, dtype=float)
+            self.zetan += float(np.sum(ranks ** -self.theta))
+            self.items = items
+            self.eta = (1 - (2.0 / items) ** (1 - self.theta)) / (1 - self.zeta2 / self.zetan)
+
+    def next(self, items: int, rng: random.Random) -> int:
+        """Return an index in [0, items) following the zipfian distribution."""
+        if items > self.items:
+            with self._lock:
+                self._grow(items)
+        u = rng.random()
+        uz = u * self.zetan
+        if uz < 1.0:
+            return 0
+        if uz < self.zeta2:
+            return 1 if items > 1 else 0
+        return min(items - 1, int(items * (self.eta * u - self.eta + 1) ** self.alpha))
+
+
+class KeyChooser:
+    """Thread-safe key space with a key selection distribution."""
+
+    def __init__(self, keys: List[Any], distribution: str = 'zipfian'):
+        """
+        Initialize the chooser.
+
+        Args:
+            keys: Existing document keys, oldest first
+            distribution: 'uniform', 'zipfian' (scrambled, hot keys spread over the key space)
+                or 'latest' (zipfian over recency, most recently inserted first)
+
+        Raises:
+            ValueError: If the distribution is unknown or there are no keys
+        """
+        if distribution not in DISTRIBUTIONS:
+            raise ValueError(f"Unknown key distribution: {distribution} (expected one of {DISTRIBUTIONS})")
+        if not keys:
+            raise ValueError("Workloads need at least one existing key")
+        self.keys = list(keys)
+        self.distribution = distribution
+        self._zipfian = ZipfianGenerator(len(self.keys)) if distribution != 'uniform' else None
+        self._lock = threading.Lock()
+
+    def add(self, key: Any) -> None:
+        """Add a key inserted during the run."""
+        with self._lock:
+            self.keys.append(key)
+
+    def index(self, rng: random.Random) -> int:
+        """Choose the index of a key."""
+        items = len(self.keys)
+        if self.distribution == 'uniform':
+            return rng.randrange(items)
+        rank = self._zipfian.next(items, rng)
+        if self.distribution == 'latest':
+            return items - 1 - rank
+        return fnv_hash(rank) % items
+
+    def choose(self, rng: random.Random) -> Any:
+        """Choose a key."""
+        return self.keys[self.index(rng)]
+
+
+class WorkloadRunner:
+    """Builds per-worker request functions that replay a workload's operation mix."""
+
+    def __init__(
+        self,
+        workload: Workload,
+        operations: Any,
+        collection_name: str,
+        keys: KeyChooser,
+        template: Dict[str, Any],
+        latency: Optional[Callable[[str], Any]] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Initialize the runner.
+
+        Args:
+            workload: Operation mix to replay
+            operations: Object providing read_record, update_record, insert_record and
+                scan_records (a DatabaseBenchmark)
+            collection_name: Collection the records live in
+            keys: Key space and distribution
+            template: Document copied (with a marker field) for inserts
+            latency: Optional function returning the LatencyHistogram of an operation name
+            seed: Base random seed; each worker gets its own generator
+        """
+        self.workload = workload
+        self.operations = operations
+        self.collection_name = collection_name
+        self.keys = keys
+        self.template = template
+        self.latency = latency
+        self.seed = seed
+        self._workers = 0
+        self._lock = threading.Lock()
+        self._names = list(workload.proportions)
+        self._cumulative = list(np.cumsum([workload.proportions[name] for name in self._names]))
+        self.counts = {name: 0 for name in self._names}
+
+    def _choose_operation(self, rng: random.Random) -> str:
+        u = rng.random() * self._cumulative[-1]
+        for name, bound in zip(self._names, self._cumulative):
+            if u < bound:
+                return name
+        return self._names[-1]
+
+    def _run(self, name: str, rng: random.Random, sequence: int) -> None:
+        ops = self.operations
+        collection = self.collection_name
+        if name == 'read':
+            ops.read_record(collection, self.keys.choose(rng))
+        elif name == 'update':
+            ops.update_record(collection, self.keys.choose(rng), {"ycsb_updated": sequence})
+        elif name == 'insert':
+            key = ops.insert_record(collection, {**self.template, "ycsb_inserted": True})
+            self.keys.add(key)
+        elif name == 'scan':
+            ops.scan_records(collection, self.keys.choose(rng), rng.randint(1, self.workload.max_scan_length))
+        else:
+            key = self.keys.choose(rng)
+            ops.read_record(collection, key)
+            ops.update_record(collection, key, {"ycsb_updated": sequence})
+
+    @contextmanager
+    def open_worker(self) -> Iterator[Callable[[], None]]:
+        """Yield a function running one randomly chosen operation (for LoadGenerator)."""
+        with self._lock:
+            worker = self._workers
+            self._workers += 1
+        rng = random.Random(None if self.seed is None else self.seed + worker)
+        counts = {name: 0 for name in self._names}
+        sequence = [0]
+
+        def request() -> None:
+            name = self._choose_operation(rng)
+            sequence[0] += 1
+            if self.latency is None:
+                self._run(name, rng, sequence[0])
+            else:
+                with self.latency(f"ycsb_{name}").time():
+                    self._run(name, rng, sequence[0])
+            counts[name] += 1
+
+        try:
+            yield request
+        finally:
+            with self._lock:
+                for name, count in counts.items():
+                    self.counts[name] += count
@@ -1,11 +1,16 @@
-import json
 import os
-import pandas as pd
 import math
+import time
+from contextlib import contextmanager, nullcontext
 from arango import ArangoClient
-from typing import Optional, Any
+from arango.client import default_deserializer, default_serializer
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ..base import DatabaseBenchmark
+from ..base.query_model import And, Comparison, Contains, Index, Or, Predicate, Query, TextQuery
+
+_AQL_FUNCTIONS = {'sum': 'SUM', 'avg': 'AVERAGE', 'min': 'MIN', 'max': 'MAX'}
+TEXT_ANALYZER = "text_en"  # Built-in English analyzer (tokenization, lowercasing, stemming)
 
 
 class ArangoBenchmark(DatabaseBenchmark):
@@ -28,9 +33,17 @@ class ArangoBenchmark(DatabaseBenchmark):
         self.client: Optional[ArangoClient] = None
         self.db = None
 
+    def _new_client(self) -> ArangoClient:
+        """Create a client whose JSON (de)serialization is timed as encode/parse phases."""
+        return ArangoClient(
+            hosts=self.host,
+            serializer=lambda x: self.timer.timed('encode', default_serializer)(x),
+            deserializer=lambda x: self.timer.timed('parse', default_deserializer)(x)
+        )
+
     def connect(self) -> None:
         """Establish connection to ArangoDB and drop existing database for clean benchmark."""
-        self.client = ArangoClient(hosts=self.host)
+        self.client = self._new_client()
         sys_db = self.client.db('_system', username=self.username, password=self.password)
         
         # Drop existing database for clean benchmark
@@ -45,7 +58,9 @@ class ArangoBenchmark(DatabaseBenchmark):
         self.db = self.client.db(self.database_name, username=self.username, password=self.password)
         print(f"Connected to ArangoDB database: {self.database_name}")
 
-    def _clean_document(self, doc: dict) -> dict:
+    @staticmethod
+    def _clean_document(doc: dict) -> dict:
+        """Replace NaN/inf floats (accepted by json.loads) with None and drop `_id` from JSON documents."""
         cleaned = {}
         for k, v in doc.items():
             if k == '_id':
@@ -56,138 +71,336 @@ class ArangoBenchmark(DatabaseBenchmark):
                 cleaned[k] = v
         return cleaned
 
-    def insert_data(self, file_path: str, collection_name: str, batch_size: int = 10000) -> int:
+    @staticmethod
+    def _result_key(result: Any) -> Optional[str]:
+        """_key of an insert_many result (failed documents come back as exception objects)."""
+        return result.get('_key') if isinstance(result, dict) else None
+
+    def _insert_sink(self, collection) -> Callable[[List[dict]], None]:
+        """Sink inserting a batch and offering the new _keys to the point-read key sample."""
+        insert_many = self.timer.timed('server', collection.insert_many)
+        
+        def insert_batch(batch: List[dict]) -> None:
+            self.sample_inserted(insert_many(batch), key=self._result_key)
+        
+        return insert_batch
+
+    @contextmanager
+    def _open_insert_sink(self, collection_name: str):
+        """Open a writer with its own ArangoClient (HTTP session) for concurrent imports."""
+        client = self._new_client()
+        try:
+            db = client.db(self.database_name, username=self.username, password=self.password)
+            yield self._insert_sink(db.collection(collection_name))
+        finally:
+            client.close()
+
+    def reset_collection(self, collection_name: str) -> None:
+        """Delete the collection with its indexes (insert_data creates it again)."""
         if self.db.has_collection(collection_name):
             self.db.delete_collection(collection_name)
+
+    def insert_data(
+        self,
+        file_path: str,
+        collection_name: str,
+        batch_size: int = 10000,
+        writers: int = 1
+    ) -> int:
         collection = self.db.create_collection(collection_name)
         
-        total_count = 0
-        
-        if file_path.endswith('.json') or 'goodreads' in file_path:
-            batch = []
-            with open(file_path, 'r') as f:
-                for line in f:
-                    try:
-                        doc = json.loads(line)
-                        batch.append(self._clean_document(doc))
-                        if len(batch) >= batch_size:
-                            collection.insert_many(batch)
-                            total_count += len(batch)
-                            if total_count % 50000 == 0:
-                                print(f"  Progress: {total_count} documents inserted...")
-                            batch = []
-                    except json.JSONDecodeError:
-                        continue
-                if batch:
-                    collection.insert_many(batch)
-                    total_count += len(batch)
+        pipeline = self.create_pipeline(file_path, batch_size, clean=self._clean_document)
+        if writers > 1:
+            open_sink = lambda: self._open_insert_sink(collection_name)
         else:
-            for chunk in pd.read_csv(file_path, chunksize=batch_size, on_bad_lines='skip'):
-                chunk = chunk.where(pd.notnull(chunk), None)
-                records = chunk.to_dict(orient='records')
-                cleaned_records = [self._clean_document(r) for r in records]
-                collection.insert_many(cleaned_records)
-                total_count += len(records)
-                if total_count % 50000 == 0:
-                    print(f"  Progress: {total_count} documents inserted...")
+            open_sink = lambda: nullcontext(self._insert_sink(collection))
+        total_count = pipeline.run_concurrent(open_sink, writers=writers)
         
         print(f"Inserted {total_count} documents into {collection_name}")
         return total_count
 
+    # ==================== QUERY COMPILATION (AQL) ====================
+
+    @classmethod
+    def _compile_filter(cls, predicate: Optional[Predicate], bind_vars: Dict[str, Any]) -> str:
+        """Compile a predicate to a FILTER condition on `doc`, adding its constants to `bind_vars`."""
+        if predicate is None:
+            return "true"
+        
+        def bind(value: Any) -> str:
+            name = f"v{len(bind_vars)}"
+            bind_vars[name] = value
+            return f"@{name}"
+        
+        if isinstance(predicate, Comparison):
+            return f"doc.`{predicate.field}` {predicate.operator} {bind(predicate.value)}"
+        if isinstance(predicate, Contains):
+            return "(" + " OR ".join(
+                f"CONTAINS(LOWER(doc.`{predicate.field}`), {bind(term)})" for term in predicate.terms
+            ) + ")"
+        if isinstance(predicate, And):
+            return "(" + " AND ".join(cls._compile_filter(p, bind_vars) for p in predicate.predicates) + ")"
+        if isinstance(predicate, Or):
+            return "(" + " OR ".join(cls._compile_filter(p, bind_vars) for p in predicate.predicates) + ")"
+        raise TypeError(f"Unsupported predicate: {type(predicate).__name__}")
+
+    @classmethod
+    def _compile_query(cls, collection_name: str, query: Query) -> Tuple[str, Dict[str, Any]]:
+        """Compile a query to AQL and its bind variables (chained grouped queries iterate a subquery)."""
+        bind_vars: Dict[str, Any] = {"@collection": collection_name}
+        stages = query.stages()
+        aql = cls._compile_stage(stages[0], "@@collection", bind_vars)
+        for stage in stages[1:]:
+            aql = cls._compile_stage(stage, f"(\n{aql}\n)", bind_vars)
+        return aql, bind_vars
+
+    @classmethod
+    def _compile_stage(cls, query: Query, source: str, bind_vars: Dict[str, Any]) -> str:
+        """Compile one query stage iterating `source` (a collection or subquery) to AQL."""
+        lines = [f"FOR doc IN {source}"]
+        if query.where is not None:
+            lines.append(f"FILTER {cls._compile_filter(query.where, bind_vars)}")
+        if query.is_grouped:
+            # Aggregates get generated variable names: output names may be AQL keywords (e.g. count)
+            variables = {name: f"agg{i}" for i, name in enumerate(query.aggregates)}
+            aggregates = ", ".join(
+                f"{variables[name]} = " + (
+                    "LENGTH(1)" if aggregate.function == 'count'
+                    else f"{_AQL_FUNCTIONS[aggregate.function]}(doc.`{aggregate.field}`)"
+                )
+                for name, aggregate in query.aggregates.items()
+            )
+            lines.append(f"COLLECT groupKey = doc.`{query.group_by}`" + (f" AGGREGATE {aggregates}" if aggregates else ""))
+            variables = {query.group_by: "groupKey", **variables}
+            sort_terms = [f"{variables[field]} {'ASC' if ascending else 'DESC'}" for field, ascending in query.sort]
+            result = "{" + ", ".join(f"`{name}`: {variable}" for name, variable in variables.items()) + "}"
+        else:
+            sort_terms = [f"doc.`{field}` {'ASC' if ascending else 'DESC'}" for field, ascending in query.sort]
+            if query.select:
+                result = "{" + ", ".join(f"`{field}`: doc.`{field}`" for field in query.select) + "}"
+            else:
+                result = "doc"
+        if sort_terms:
+            lines.append("SORT " + ", ".join(sort_terms))
+        if query.limit is not None:
+            lines.append(f"LIMIT {int(query.limit)}")
+        lines.append(f"RETURN {result}")
+        return "\n".join(lines)
+
+    def _count_aql(self, collection_name: str, query: Query) -> Tuple[str, Dict[str, Any]]:
+        """AQL counting the documents matching a query's filter, and its bind variables."""
+        bind_vars: Dict[str, Any] = {"@collection": collection_name}
+        aql = f"""
+        RETURN LENGTH(
+            FOR doc IN @@collection
+            FILTER {self._compile_filter(query.where, bind_vars)}
+            RETURN 1
+        )
+        """
+        return aql, bind_vars
+
+    def create_indexes(self, collection_name: str, indexes: List[Index]) -> Dict[str, Dict[str, Any]]:
+        """Build persistent indexes (created in the foreground, so each call returns once built)."""
+        collection = self.db.collection(collection_name)
+        built = {}
+        for index in indexes:
+            start = time.perf_counter()
+            with self.timer.phase('server'):
+                collection.add_persistent_index(index.fields, name=index.name)
+            built[index.name] = {"fields": index.fields, "build_seconds": round(time.perf_counter() - start, 4)}
+        
+        with self.timer.phase('server'):
+            stats = {entry.get('name'): entry for entry in collection.indexes(with_stats=True)}
+        for name, entry in built.items():
+            entry["size_bytes"] = stats.get(name, {}).get('figures', {}).get('memory')
+        return built
+
+    def create_text_index(self, collection_name: str, fields: List[str]) -> Dict[str, Any]:
+        """Create an ArangoSearch view linking the text fields, then wait until every document is searchable."""
+        view = f"{collection_name}_text"
+        links = {collection_name: {"fields": {field: {"analyzers": [TEXT_ANALYZER]} for field in fields}}}
+        with self.timer.phase('server'):
+            self.db.delete_view(view, ignore_missing=True)
+            self.db.create_arangosearch_view(view, properties={"links": links})
+            # Views are filled asynchronously; a waitForSync query returns once the link has caught up
+            cursor = self.db.aql.execute(
+                "FOR doc IN @@view SEARCH true OPTIONS { waitForSync: true } COLLECT WITH COUNT INTO n RETURN n",
+                bind_vars={"@view": view}
+            )
+            documents = next(cursor, 0)
+            stats = self.db.collection(collection_name).indexes(with_stats=True, with_hidden=True)
+        size = next((entry.get('figures', {}).get('indexSize') for entry in stats if entry.get('type') == 'arangosearch'), None)
+        return {"name": view, "documents": documents, "size_bytes": size}
+
+    def text_search(self, collection_name: str, fields: List[str], query: TextQuery) -> List[dict]:
+        """SEARCH the view for any token (or the phrase) of the text, sorted by BM25."""
+        if query.phrase:
+            condition = " OR ".join(f"PHRASE(doc.`{field}`, @text)" for field in fields)
+        else:
+            condition = " OR ".join(f"doc.`{field}` IN TOKENS(@text, @analyzer)" for field in fields)
+        aql = f"""
+        FOR doc IN @@view
+        SEARCH ANALYZER({condition}, @analyzer)
+        LET score = BM25(doc)
+        SORT score DESC
+        LIMIT @limit
+        RETURN MERGE(doc, {{ score }})
+        """
+        bind_vars = {"@view": f"{collection_name}_text", "text": query.text, "analyzer": TEXT_ANALYZER, "limit": query.limit}
+        with self.timer.phase('server'):
+            return list(self.db.aql.execute(aql, bind_vars=bind_vars))
+
+    def count_query(self, collection_name: str, query: Query) -> int:
+        """Count the documents matching a query's filter."""
+        aql, bind_vars = self._count_aql(collection_name, query)
+        with self.timer.phase('server'):
+            return next(self.db.aql.execute(aql, bind_vars=bind_vars, ttl=600), 0)
+
+    def fetch_matches(self, collection_name: str, query: Query) -> int:
+        """Fetch every document matching a query's filter through a streaming cursor."""
+        aql, bind_vars = self._compile_query(collection_name, Query(where=query.where))
+        fetched = 0
+        with self.timer.phase('server'):
+            cursor = self.db.aql.execute(aql, bind_vars=bind_vars, batch_size=10000, stream=True, ttl=600)
+        for _ in self.timer.iterate(cursor, 'server'):
+            fetched += 1
+        return fetched
+
+    def run_query(self, collection_name: str, query: Query) -> List[dict]:
+        """Run a query compiled to AQL."""
+        aql, bind_vars = self._compile_query(collection_name, query)
+        with self.timer.phase('server'):
+            return list(self.db.aql.execute(aql, bind_vars=bind_vars, batch_size=10000, ttl=600))
+
     def read_data(self, collection_name: str) -> None:
         """Perform read operations on ArangoDB collection with realistic queries."""
         # Read one document
+        query_latency = self.latency("query")
         aql = f"FOR doc IN {collection_name} LIMIT 1 RETURN doc"
-        cursor = self.db.aql.execute(aql)
-        doc = next(cursor, None)
-        
-        # Dataset-specific realistic queries - use COUNT for fair comparison with MongoDB
-        if collection_name == 'amazon':
-            # Amazon: Score > 4 OR Summary contains 'good'
-            aql_count = f"""
-            RETURN LENGTH(
-                FOR doc IN {collection_name}
-                FILTER doc.Score > 4 OR CONTAINS(LOWER(doc.Summary), 'good')
-                RETURN 1
-            )
-            """
-        else:
-            # Goodreads: rating >= 3 OR review_text contains keywords
-            aql_count = f"""
-            RETURN LENGTH(
-                FOR doc IN {collection_name}
-                FILTER doc.rating >= 3 OR 
-                       CONTAINS(LOWER(doc.review_text), 'fantastic') OR
-                       CONTAINS(LOWER(doc.review_text), 'suspense') OR
-                       CONTAINS(LOWER(doc.review_text), 'story')
-                RETURN 1
-            )
-            """
+        with self.timer.phase('server'), query_latency.time():
+            cursor = self.db.aql.execute(aql)
+            doc = next(cursor, None)
         
-        # Execute count query
-        cursor = self.db.aql.execute(aql_count, ttl=600)
-        count = next(cursor, 0)
+        # Dataset-specific realistic query - use COUNT for fair comparison with MongoDB
+        with query_latency.time():
+            count = self.count_query(collection_name, self.dataset_query(collection_name))
         print(f"  Found {count} documents matching query")
 
-    def update_data(self, collection_name: str, limit: int = 10000) -> int:
+    @contextmanager
+    def open_query_worker(self, collection_name: str):
+        """Open a load-generator worker with its own ArangoClient, yielding a function running the count query."""
+        client = self._new_client()
+        try:
+            db = client.db(self.database_name, username=self.username, password=self.password)
+            aql_count, bind_vars = self._count_aql(collection_name, self.dataset_query(collection_name))
+            yield self.timer.timed('server', lambda: next(db.aql.execute(aql_count, bind_vars=bind_vars, ttl=600), 0))
+        finally:
+            client.close()
+
+    # ==================== SINGLE-RECORD OPERATIONS (YCSB) ====================
+
+    def sample_keys(self, collection_name: str, limit: int) -> List[Any]:
+        """Return up to `limit` document _keys, numeric keys by value (generation order)."""
+        # Generated _keys are numeric strings, which SORT doc._key would order "10" < "9";
+        # non-numeric keys (TO_NUMBER = 0) come first, in string order
+        aql = f"FOR doc IN {collection_name} SORT TO_NUMBER(doc._key), doc._key LIMIT @limit RETURN doc._key"
+        with self.timer.phase('server'):
+            return list(self.db.aql.execute(aql, bind_vars={"limit": limit}))
+
+    def read_record(self, collection_name: str, key: Any) -> Optional[dict]:
+        """Fetch one document by _key."""
+        with self.timer.phase('server'):
+            return self.db.collection(collection_name).get(key)
+
+    def read_records(self, collection_name: str, keys: List[Any]) -> int:
+        """Fetch many documents by _key with one DOCUMENT() lookup."""
+        aql = "FOR doc IN DOCUMENT(@@collection, @keys) RETURN doc"
+        with self.timer.phase('server'):
+            cursor = self.db.aql.execute(
+                aql, bind_vars={"@collection": collection_name, "keys": keys}, batch_size=max(1, len(keys))
+            )
+            return len(list(cursor))
+
+    def update_record(self, collection_name: str, key: Any, fields: Dict[str, Any]) -> None:
+        """Set fields on one document by _key."""
+        with self.timer.phase('server'):
+            self.db.collection(collection_name).update({"_key": key, **fields}, silent=True)
+
+    def insert_record(self, collection_name: str, document: Dict[str, Any]) -> Any:
+        """Insert one document and return its _key."""
+        with self.timer.phase('server'):
+            return self.db.collection(collection_name).insert(document)["_key"]
+
+    def scan_records(self, collection_name: str, start_key: Any, count: int) -> int:
+        """Read up to `count` documents in _key order from `start_key` (primary index range)."""
+        aql = f"FOR doc IN {collection_name} FILTER doc._key >= @start SORT doc._key LIMIT @count RETURN doc"
+        with self.timer.phase('server'):
+            return len(list(self.db.aql.execute(aql, bind_vars={"start": start_key, "count": count})))
+
+    def update_data(self, collection_name: str, limit: int = 10000, server_side: bool = False) -> int:
         """Update documents in ArangoDB collection using realistic queries."""
         # Dataset-specific query for selecting documents to update
-        if collection_name == 'amazon':
-            # Amazon: Score > 4 OR Summary contains 'good'
-            aql = f"""
-            FOR doc IN {collection_name}
-            FILTER doc.Score > 4 OR CONTAINS(LOWER(doc.Summary), 'good')
-            LIMIT {limit}
-            UPDATE doc WITH {{ benchmark_updated: true }} IN {collection_name}
-            RETURN NEW
-            """
-        else:
-            # Goodreads: rating >= 3 OR review_text contains keywords
-            aql = f"""
-            FOR doc IN {collection_name}
-            FILTER doc.rating >= 3 OR 
-                   CONTAINS(LOWER(doc.review_text), 'fantastic') OR
-                   CONTAINS(LOWER(doc.review_text), 'suspense') OR
-                   CONTAINS(LOWER(doc.review_text), 'story')
-            LIMIT {limit}
-            UPDATE doc WITH {{ benchmark_updated: true }} IN {collection_name}
-            RETURN NEW
-            """
-        
-        cursor = self.db.aql.execute(aql)
-        updated = list(cursor)
-        print(f"  Updated {len(updated)} documents")
-        return len(updated)
-
-    def delete_data(self, collection_name: str) -> int:
+        bind_vars: Dict[str, Any] = {"@collection": collection_name}
+        aql = f"""
+        FOR doc IN @@collection
+        FILTER {self._compile_filter(self.dataset_query(collection_name).where, bind_vars)}
+        """
+        if not server_side:
+            aql += f"LIMIT {limit}\n"
+        # Server side flags every match, like Mongo's update_many and RavenDB's patch by query
+        aql += "UPDATE doc WITH { benchmark_updated: true } IN @@collection\n"
+        if not server_side:
+            aql += "RETURN NEW\n"
+        
+        with self.timer.phase('server'), self.latency("update").time():
+            cursor = self.db.aql.execute(aql, bind_vars=bind_vars)
+            updated = self._writes_executed(cursor) if server_side else len(list(cursor))
+        print(f"  Updated {updated} documents")
+        return updated
+
+    def delete_data(self, collection_name: str, server_side: bool = False) -> int:
         """Delete updated documents from ArangoDB collection."""
         aql = f"""
         FOR doc IN {collection_name}
         FILTER doc.benchmark_updated == true
         REMOVE doc IN {collection_name}
-        RETURN OLD
         """
-        cursor = self.db.aql.execute(aql)
-        deleted = list(cursor)
-        return len(deleted)
+        if not server_side:
+            aql += "RETURN OLD\n"
+        with self.timer.phase('server'), self.latency("delete").time():
+            cursor = self.db.aql.execute(aql)
+            deleted = self._writes_executed(cursor) if server_side else len(list(cursor))
+        return deleted
+
+    @staticmethod
+    def _writes_executed(cursor) -> int:
+        """Documents written by a modification query without RETURN (extra.stats.writesExecuted)."""
+        # python-arango renames writesExecuted to "modified" in the cursor statistics
+        return (cursor.statistics() or {}).get('modified', 0)
 
     def export_data(self, collection_name: str) -> str:
         """Export ArangoDB collection using keyset pagination."""
         export_path = os.path.join(self.results_dir, f"export_{collection_name}_arango.json")
         
+        dumps_line = self.timer.timed('encode', self.codec.dumps_line)
+        self.record_metric("codec", self.codec.name)
+        page_latency = self.latency("export_page")
+        
         total_exported = 0
         last_key = None
         page_size = 10000
         
-        with open(export_path, "w") as f:
+        with open(export_path, "wb") as f:
+            write = self.timer.timed('write', f.write)
             while True:
                 if last_key is None:
                     aql = f"FOR doc IN {collection_name} SORT doc._key LIMIT {page_size} RETURN doc"
                 else:
                     aql = f"FOR doc IN {collection_name} FILTER doc._key > '{last_key}' SORT doc._key LIMIT {page_size} RETURN doc"
                 
-                cursor = self.db.aql.execute(aql)
-                docs = list(cursor)
+                with self.timer.phase('server'), page_latency.time():
+                    cursor = self.db.aql.execute(aql)
+                    docs = list(cursor)
                 
                 if not docs:
                     break
@@ -202,7 +415,7 @@ class ArangoBenchmark(DatabaseBenchmark):
                         del doc['_id']
                     if '_rev' in doc:
                         del doc['_rev']
-                    f.write(json.dumps(doc) + "\n")
+                    write(dumps_line(doc))
                     total_exported += 1
                 
                 if total_exported % 100000 == 0:
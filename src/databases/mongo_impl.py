@@ -3,13 +3,22 @@ MongoDB Benchmark Implementation.
 
 Concrete implementation of DatabaseBenchmark for MongoDB using PyMongo.
 """
-import json
 import os
-import pandas as pd
-from pymongo import MongoClient
-from typing import Optional
+import re
+import time
+from contextlib import contextmanager, nullcontext
+from operator import itemgetter
+import bson
+from bson import ObjectId
+from bson.raw_bson import RawBSONDocument
+from pymongo import TEXT, MongoClient
+from typing import Any, Dict, List, Optional
 
 from ..base import DatabaseBenchmark
+from ..base.query_model import And, Comparison, Contains, Index, Or, Predicate, Query, TextQuery
+
+_MQL_OPERATORS = {'==': '$eq', '!=': '$ne', '>': '$gt', '>=': '$gte', '<': '$lt', '<=': '$lte'}
+_MQL_ACCUMULATORS = {'sum': '$sum', 'avg': '$avg', 'min': '$min', 'max': '$max'}
 
 
 class MongoBenchmark(DatabaseBenchmark):
@@ -44,110 +53,229 @@ class MongoBenchmark(DatabaseBenchmark):
         self.db = self.client[self.database_name]
         print(f"Connected to MongoDB database: {self.database_name}")
 
-    def insert_data(self, file_path: str, collection_name: str, batch_size: int = 10000) -> int:
+    def reset_collection(self, collection_name: str) -> None:
+        """Drop the collection with its indexes (insert_many recreates it)."""
+        self.db[collection_name].drop()
+
+    def _insert_batch(self, collection, batch: List[dict]) -> None:
+        """Encode a batch to BSON client-side, then send it, so encode and server time are split."""
+        with self.timer.phase('encode'):
+            raw_docs = []
+            for doc in batch:
+                doc.setdefault('_id', ObjectId())  # Same client-side _id PyMongo would add
+                raw_docs.append(RawBSONDocument(bson.encode(doc)))
+        with self.timer.phase('server'):
+            collection.insert_many(raw_docs)
+        self.sample_inserted(batch, key=itemgetter('_id'))
+
+    def insert_data(
+        self,
+        file_path: str,
+        collection_name: str,
+        batch_size: int = 10000,
+        writers: int = 1
+    ) -> int:
         """Insert data from file into MongoDB collection."""
         collection = self.db[collection_name]
-        collection.drop()  # Clear existing data
-        
-        total_count = 0
-        
-        if file_path.endswith('.json') or 'goodreads' in file_path:
-            batch = []
-            with open(file_path, 'r') as f:
-                for line in f:
-                    try:
-                        batch.append(json.loads(line))
-                        if len(batch) >= batch_size:
-                            collection.insert_many(batch)
-                            total_count += len(batch)
-                            if total_count % 50000 == 0:
-                                print(f"  Progress: {total_count} documents inserted...")
-                            batch = []
-                    except json.JSONDecodeError:
-                        continue
-                if batch:
-                    collection.insert_many(batch)
-                    total_count += len(batch)
-        else:
-            # CSV file handling
-            for chunk in pd.read_csv(file_path, chunksize=batch_size, on_bad_lines='skip'):
-                chunk = chunk.where(pd.notnull(chunk), None)
-                records = chunk.to_dict(orient='records')
-                collection.insert_many(records)
-                total_count += len(records)
-                if total_count % 50000 == 0:
-                    print(f"  Progress: {total_count} documents inserted...")
+        
+        pipeline = self.create_pipeline(file_path, batch_size)
+        # MongoClient is thread-safe: concurrent writers draw connections from its pool
+        total_count = pipeline.run_concurrent(
+            lambda: nullcontext(lambda batch: self._insert_batch(collection, batch)), writers=writers
+        )
         
         print(f"Inserted {total_count} documents into {collection_name}")
         return total_count
 
+    # ==================== QUERY COMPILATION (MQL) ====================
+
+    @classmethod
+    def _compile_filter(cls, predicate: Optional[Predicate]) -> dict:
+        """Compile a predicate to a MongoDB filter document."""
+        if predicate is None:
+            return {}
+        if isinstance(predicate, Comparison):
+            return {predicate.field: {_MQL_OPERATORS[predicate.operator]: predicate.value}}
+        if isinstance(predicate, Contains):
+            pattern = "|".join(re.escape(term) for term in predicate.terms)
+            return {predicate.field: {"$regex": pattern, "$options": "i"}}
+        if isinstance(predicate, And):
+            return {"$and": [cls._compile_filter(p) for p in predicate.predicates]}
+        if isinstance(predicate, Or):
+            return {"$or": [cls._compile_filter(p) for p in predicate.predicates]}
+        raise TypeError(f"Unsupported predicate: {type(predicate).__name__}")
+
+    @classmethod
+    def _compile_pipeline(cls, query: Query) -> List[dict]:
+        """Compile a query to an aggregation pipeline (chained grouped queries append their stages)."""
+        pipeline: List[dict] = []
+        if query.where is not None:
+            pipeline.append({"$match": cls._compile_filter(query.where)})
+        if query.is_grouped:
+            group = {"_id": f"${query.group_by}"}
+            for name, aggregate in query.aggregates.items():
+                if aggregate.function == 'count':
+                    group[name] = {"$sum": 1}
+                else:
+                    group[name] = {_MQL_ACCUMULATORS[aggregate.function]: f"${aggregate.field}"}
+            pipeline.append({"$group": group})
+            pipeline.append({"$project": {"_id": 0, query.group_by: "$_id", **{name: 1 for name in query.aggregates}}})
+        if query.sort:
+            pipeline.append({"$sort": {field: 1 if ascending else -1 for field, ascending in query.sort}})
+        if query.limit is not None:
+            pipeline.append({"$limit": query.limit})
+        if query.select:
+            pipeline.append({"$project": {"_id": 0, **{field: 1 for field in query.select}}})
+        if query.then is not None:
+            pipeline.extend(cls._compile_pipeline(query.then))
+        return pipeline
+
+    def create_indexes(self, collection_name: str, indexes: List[Index]) -> Dict[str, Dict[str, Any]]:
+        """Build ascending (compound) indexes; create_index returns once the build has finished."""
+        collection = self.db[collection_name]
+        built = {}
+        for index in indexes:
+            start = time.perf_counter()
+            with self.timer.phase('server'):
+                collection.create_index([(field, 1) for field in index.fields], name=index.name)
+            built[index.name] = {"fields": index.fields, "build_seconds": round(time.perf_counter() - start, 4)}
+        
+        with self.timer.phase('server'):
+            stats = next(collection.aggregate([{"$collStats": {"storageStats": {}}}]), {})
+        sizes = stats.get("storageStats", {}).get("indexSizes", {})
+        for name, entry in built.items():
+            entry["size_bytes"] = sizes.get(name)
+        return built
+
+    def create_text_index(self, collection_name: str, fields: List[str]) -> Dict[str, Any]:
+        """Build the collection's text index (English stemming and stop words) over the fields."""
+        collection = self.db[collection_name]
+        with self.timer.phase('server'):
+            collection.create_index([(field, TEXT) for field in fields], name="text_search", default_language="english")
+            stats = next(collection.aggregate([{"$collStats": {"storageStats": {}}}]), {})
+        return {"name": "text_search", "size_bytes": stats.get("storageStats", {}).get("indexSizes", {}).get("text_search")}
+
+    def text_search(self, collection_name: str, fields: List[str], query: TextQuery) -> List[dict]:
+        """$text search (any term, or a quoted phrase) on the text index, sorted by textScore."""
+        search = f'"{query.text}"' if query.phrase else query.text
+        score = {"$meta": "textScore"}
+        with self.timer.phase('server'):
+            cursor = (self.db[collection_name]
+                      .find({"$text": {"$search": search}}, {"score": score})
+                      .sort([("score", score)])
+                      .limit(query.limit))
+            return list(cursor)
+
+    def count_query(self, collection_name: str, query: Query) -> int:
+        """Count the documents matching a query's filter."""
+        with self.timer.phase('server'):
+            return self.db[collection_name].count_documents(self._compile_filter(query.where))
+
+    def fetch_matches(self, collection_name: str, query: Query) -> int:
+        """Fetch every document matching a query's filter, one raw batch per server reply."""
+        fetched = 0
+        pages = self.db[collection_name].find_raw_batches(self._compile_filter(query.where))
+        for page in self.timer.iterate(pages, 'server'):
+            with self.timer.phase('parse'):
+                fetched += len(bson.decode_all(page))
+        return fetched
+
+    def run_query(self, collection_name: str, query: Query) -> List[dict]:
+        """Run a query as an aggregation pipeline."""
+        pipeline = self._compile_pipeline(query)
+        with self.timer.phase('server'):
+            return list(self.db[collection_name].aggregate(pipeline, allowDiskUse=True))
+
     def read_data(self, collection_name: str) -> None:
         """Perform read operations on MongoDB collection with realistic queries."""
         collection = self.db[collection_name]
         
+        query_latency = self.latency("query")
+        
         # Read one document
-        doc = collection.find_one()
-        
-        # Dataset-specific realistic queries
-        if collection_name == 'amazon':
-            # Amazon: Score > 4 OR Summary contains 'good'
-            query = {
-                "$or": [
-                    {"Score": {"$gt": 4}},
-                    {"Summary": {"$regex": "good", "$options": "i"}}
-                ]
-            }
-        else:
-            # Goodreads: rating >= 3 OR review_text contains keywords
-            query = {
-                "$or": [
-                    {"rating": {"$gte": 3}},
-                    {"review_text": {"$regex": "Fantastic|suspense|story", "$options": "i"}}
-                ]
-            }
-        
-        count = collection.count_documents(query)
+        with self.timer.phase('server'), query_latency.time():
+            doc = collection.find_one()
+        
+        # Dataset-specific realistic query
+        with query_latency.time():
+            count = self.count_query(collection_name, self.dataset_query(collection_name))
         print(f"  Found {count} documents matching query")
 
-    def update_data(self, collection_name: str, limit: int = 10000) -> int:
+    @contextmanager
+    def open_query_worker(self, collection_name: str):
+        """Yield a function running the dataset's count query (MongoClient's pool is shared by workers)."""
+        query = self.dataset_query(collection_name)
+        yield lambda: self.count_query(collection_name, query)
+
+    # ==================== SINGLE-RECORD OPERATIONS (YCSB) ====================
+
+    def sample_keys(self, collection_name: str, limit: int) -> List[Any]:
+        """Return up to `limit` document _ids in _id order."""
+        collection = self.db[collection_name]
+        with self.timer.phase('server'):
+            return [d['_id'] for d in collection.find({}, {"_id": 1}).sort("_id", 1).limit(limit)]
+
+    def read_record(self, collection_name: str, key: Any) -> Optional[dict]:
+        """Fetch one document by _id."""
+        with self.timer.phase('server'):
+            return self.db[collection_name].find_one({"_id": key})
+
+    def read_records(self, collection_name: str, keys: List[Any]) -> int:
+        """Fetch many documents by _id with one `$in` query."""
+        with self.timer.phase('server'):
+            return len(list(self.db[collection_name].find({"_id": {"$in": keys}})))
+
+    def update_record(self, collection_name: str, key: Any, fields: Dict[str, Any]) -> None:
+        """Set fields on one document by _id."""
+        with self.timer.phase('server'):
+            self.db[collection_name].update_one({"_id": key}, {"$set": fields})
+
+    def insert_record(self, collection_name: str, document: Dict[str, Any]) -> Any:
+        """Insert one document and return its _id."""
+        with self.timer.phase('server'):
+            return self.db[collection_name].insert_one(dict(document)).inserted_id
+
+    def scan_records(self, collection_name: str, start_key: Any, count: int) -> int:
+        """Read up to `count` documents in _id order from `start_key`."""
+        with self.timer.phase('server'):
+            cursor = self.db[collection_name].find({"_id": {"$gte": start_key}}).sort("_id", 1).limit(count)
+            return len(list(cursor))
+
+    def update_data(self, collection_name: str, limit: int = 10000, server_side: bool = False) -> int:
         """Update documents in MongoDB collection using realistic queries."""
         collection = self.db[collection_name]
         
         # Dataset-specific query for selecting documents to update
-        if collection_name == 'amazon':
-            # Amazon: Score > 4 OR Summary contains 'good'
-            query = {
-                "$or": [
-                    {"Score": {"$gt": 4}},
-                    {"Summary": {"$regex": "good", "$options": "i"}}
-                ]
-            }
-        else:
-            # Goodreads: rating >= 3 OR review_text contains keywords
-            query = {
-                "$or": [
-                    {"rating": {"$gte": 3}},
-                    {"review_text": {"$regex": "Fantastic|suspense|story", "$options": "i"}}
-                ]
-            }
+        query = self._compile_filter(self.dataset_query(collection_name).where)
+        
+        if server_side:
+            # One statement flagging every match: update_many takes no limit, so `limit` only
+            # applies to the client path (the other backends flag the same unbounded set)
+            with self.timer.phase('server'), self.latency("update").time():
+                result = collection.update_many(query, {"$set": {"benchmark_updated": True}})
+            print(f"  Updated {result.modified_count} documents (server-side)")
+            return result.modified_count
         
         # Get IDs matching query (limited)
-        ids = [d['_id'] for d in collection.find(query, {"_id": 1}).limit(limit)]
+        with self.timer.phase('server'), self.latency("query").time():
+            ids = [d['_id'] for d in collection.find(query, {"_id": 1}).limit(limit)]
         
         # Update documents
-        result = collection.update_many(
-            {"_id": {"$in": ids}},
-            {"$set": {"benchmark_updated": True}}
-        )
+        with self.timer.phase('server'), self.latency("update").time():
+            result = collection.update_many(
+                {"_id": {"$in": ids}},
+                {"$set": {"benchmark_updated": True}}
+            )
         
         print(f"  Updated {result.modified_count} documents")
         return result.modified_count
 
-    def delete_data(self, collection_name: str) -> int:
-        """Delete updated documents from MongoDB collection."""
+    def delete_data(self, collection_name: str, server_side: bool = False) -> int:
+        """Delete updated documents from MongoDB collection (delete_many is set-based in both modes)."""
         collection = self.db[collection_name]
         
-        result = collection.delete_many({"benchmark_updated": True})
+        with self.timer.phase('server'), self.latency("delete").time():
+            result = collection.delete_many({"benchmark_updated": True})
         return result.deleted_count
 
     def export_data(self, collection_name: str) -> str:
@@ -155,14 +283,31 @@ class MongoBenchmark(DatabaseBenchmark):
         collection = self.db[collection_name]
         export_path = os.path.join(self.results_dir, f"export_{collection_name}_mongo.json")
         
+        # Raw batches expose each server reply (one page per getMore) so page fetches can be
+        # timed on their own; BSON decoding of the page counts as parse time
+        dumps_line = self.timer.timed('encode', self.codec.dumps_line)
+        self.record_metric("codec", self.codec.name)
+        page_latency = self.latency("export_page")
+        
         total_exported = 0
-        with open(export_path, "w") as f:
-            for doc in collection.find():
-                doc['_id'] = str(doc['_id'])  # Convert ObjectId to string
-                f.write(json.dumps(doc) + "\n")
-                total_exported += 1
-                if total_exported % 100000 == 0:
-                    print(f"  Export progress: {total_exported} documents written...")
+        with open(export_path, "wb") as f:
+            write = self.timer.timed('write', f.write)
+            pages = collection.find_raw_batches()
+            while True:
+                start = time.perf_counter_ns()
+                with self.timer.phase('server'):
+                    page = next(pages, None)
+                if page is None:
+                    break
+                page_latency.record_since(start)
+                with self.timer.phase('parse'):
+                    docs = bson.decode_all(page)
+                for doc in docs:
+                    doc['_id'] = str(doc['_id'])  # Convert ObjectId to string
+                    write(dumps_line(doc))
+                    total_exported += 1
+                    if total_exported % 100000 == 0:
+                        print(f"  Export progress: {total_exported} documents written...")
         
         print(f"Exported {total_exported} documents to {export_path}")
         return export_path
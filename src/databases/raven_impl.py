@@ -5,13 +5,33 @@ Concrete implementation of DatabaseBenchmark for RavenDB using the official Pyth
 """
 import json
 import os
-import pandas as pd
+import re
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import timedelta
+import requests
 from ravendb import DocumentStore
+from ravendb.documents.commands.crud import PutDocumentCommand
+from ravendb.documents.indexes.definitions import FieldIndexing, IndexDefinition, IndexFieldOptions, IndexState
+from ravendb.documents.operations.indexes import GetIndexStatisticsOperation, PutIndexesOperation
+from ravendb.documents.operations.misc import DeleteByQueryOperation, GetOperationStateOperation, QueryOperationOptions
+from ravendb.documents.operations.patch import PatchByQueryOperation
+from ravendb.documents.queries.index_query import IndexQuery, Parameters
 from ravendb.serverwide.operations.common import CreateDatabaseOperation
 from ravendb.serverwide.database_record import DatabaseRecord
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..base import DatabaseBenchmark
+from ..base.ingestion import strip_id
+from ..base.query_model import And, Comparison, Contains, Index, Or, Predicate, Query, TextQuery
+
+_RQL_OPERATORS = {'==': '=', '!=': '!=', '>': '>', '>=': '>=', '<': '<', '<=': '<='}
+INDEX_POLL_INTERVAL = 0.1  # Seconds between index staleness checks
+INDEX_BUILD_TIMEOUT = 3600
+OPERATION_POLL_INTERVAL = 0.05  # Seconds between set-based operation status checks
+OPERATION_PROGRESS_INTERVAL = 5.0  # Seconds between progress lines of a running operation
+OPERATION_STALE_TIMEOUT = 600  # Seconds a set-based operation waits for its index to catch up
 
 
 class RavenBenchmark(DatabaseBenchmark):
@@ -28,6 +48,9 @@ class RavenBenchmark(DatabaseBenchmark):
         self.url = url
         self.database_name = db_name
         self.store: Optional[DocumentStore] = None
+        self._id_prefixes: Dict[str, str] = {}  # Document ID prefix per collection (e.g. "dicts/")
+        self._static_indexes: Dict[str, Tuple[str, List[str]]] = {}  # Built static index and its fields per collection
+        self._map_reduce_indexes: Dict[Query, str] = {}  # Map-reduce index holding each aggregation's final rows
 
     def connect(self) -> None:
         """Establish connection to RavenDB and drop existing database for clean benchmark."""
@@ -55,127 +78,529 @@ class RavenBenchmark(DatabaseBenchmark):
         
         print(f"Connected to RavenDB database: {self.database_name}")
 
-    def insert_data(self, file_path: str, collection_name: str, batch_size: int = 5000) -> int:
-        """Insert data using RavenDB Bulk Insert."""
-        total_count = 0
-        
-        if file_path.endswith('.json') or 'goodreads' in file_path:
-            with open(file_path, 'r') as f:
-                with self.store.bulk_insert() as bulk_insert:
-                    for line in f:
-                        try:
-                            doc = json.loads(line)
-                            if '_id' in doc:
-                                del doc['_id']
-                            bulk_insert.store(doc, metadata={"@collection": collection_name})
-                            total_count += 1
-                            if total_count % 50000 == 0:
-                                print(f"  Progress: {total_count} documents inserted...")
-                        except json.JSONDecodeError:
-                            continue
-        else:
-            # CSV file handling
-            with self.store.bulk_insert() as bulk_insert:
-                for chunk in pd.read_csv(file_path, chunksize=batch_size, on_bad_lines='skip'):
-                    chunk = chunk.where(pd.notnull(chunk), None)
-                    records = chunk.to_dict(orient='records')
-                    for r in records:
-                        if '_id' in r:
-                            del r['_id']
-                        bulk_insert.store(r, metadata={"@collection": collection_name})
-                        total_count += 1
-                    if total_count % 50000 == 0:
-                        print(f"  Progress: {total_count} documents inserted...")
+    def reset_collection(self, collection_name: str) -> None:
+        """Delete the documents left by a previous import (e.g. an earlier writer-count run)."""
+        # A collection cannot be dropped on its own; this is a server-side delete of every document
+        self.store.operations.send_async(DeleteByQueryOperation(f"from {collection_name}")).wait_for_completion()
+
+    @contextmanager
+    def _open_insert_sink(self, collection_name: str):
+        """Open a writer with its own Bulk Insert stream."""
+        with self.store.bulk_insert() as bulk_insert:
+            # store() serializes into the client buffer (blocking only when the server falls behind);
+            # the final flush on exit is the wait for the server
+            store = self.timer.timed('encode', bulk_insert.store)
+            
+            def store_batch(batch):
+                keys = [store(doc, metadata={"@collection": collection_name}) for doc in batch]
+                self.sample_inserted(keys)
+            
+            yield store_batch
+            flush_start = time.perf_counter()
+        self.timer.add('server', time.perf_counter() - flush_start)
+
+    def insert_data(
+        self,
+        file_path: str,
+        collection_name: str,
+        batch_size: int = 5000,
+        writers: int = 1
+    ) -> int:
+        """Insert data using RavenDB Bulk Insert (one bulk insert stream per writer)."""
+        # store_batch only fills the bulk insert buffer (no per-batch round trip), so its
+        # latency gives the adaptive batcher nothing to tune against
+        pipeline = self.create_pipeline(file_path, batch_size, clean=strip_id, adaptive=False)
+        total_count = pipeline.run_concurrent(
+            lambda: self._open_insert_sink(collection_name), writers=writers
+        )
         
         print(f"Inserted {total_count} documents into {collection_name}")
+        return total_count
+
+    def _wait_for_index(self, index_name: str):
+        """Poll the index statistics until the index is no longer stale, returning the final statistics."""
+        deadline = time.perf_counter() + INDEX_BUILD_TIMEOUT
+        while True:
+            stats = self.store.maintenance.send(GetIndexStatisticsOperation(index_name))
+            if stats.state == IndexState.ERROR:
+                raise RuntimeError(f"Index {index_name} failed ({stats.errors_count} errors)")
+            if not stats.stale:
+                return stats
+            if time.perf_counter() >= deadline:
+                raise TimeoutError(f"Index {index_name} still stale after {INDEX_BUILD_TIMEOUT}s")
+            time.sleep(INDEX_POLL_INTERVAL)
+
+    def _index_size(self, index_name: str) -> Optional[int]:
+        """Used bytes of the index's storage environment, from the server's storage report (None if unavailable)."""
+        try:
+            response = requests.get(f"{self.url}/databases/{self.database_name}/debug/storage/report", timeout=30)
+            response.raise_for_status()
+            for environment in response.json().get("Results", []):
+                if environment.get("Type") == "Index" and environment.get("Name") == index_name:
+                    return environment.get("Report", {}).get("DataFile", {}).get("UsedSpaceInBytes")
+        except (requests.RequestException, ValueError) as e:
+            print(f"  Note reading index size: {e}")
+        return None
+
+    def create_indexes(self, collection_name: str, indexes: List[Index]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build one static index mapping every declared field and wait until it is non-stale.
         
-        # Create index for efficient querying after import
-        self._create_index_for_collection(collection_name)
+        Fields of a RavenDB index are indexed independently (like separate single-field
+        indexes) and a query runs against a single index, so the declared indexes are
+        combined; queries whose fields it covers are then sent to it (see _raw_query).
+        """
+        fields: List[str] = []
+        for index in indexes:
+            fields.extend(field for field in index.fields if field not in fields)
+        index_name = f"{collection_name}/Benchmark"
+        definition = IndexDefinition(
+            name=index_name,
+            maps={f"from doc in docs.{collection_name} select new {{ {', '.join(f'doc.{field}' for field in fields)} }}"}
+        )
         
-        return total_count
+        start = time.perf_counter()
+        with self.timer.phase('server'):
+            self.store.maintenance.send(PutIndexesOperation(definition))
+            stats = self._wait_for_index(index_name)
+        build_seconds = round(time.perf_counter() - start, 4)
+        self._static_indexes[collection_name] = (index_name, fields)
+        
+        return {
+            index_name: {
+                "fields": fields,
+                "build_seconds": build_seconds,
+                "size_bytes": self._index_size(index_name),
+                "entries": stats.entries_count,
+            }
+        }
+
+    def create_text_index(self, collection_name: str, fields: List[str]) -> Dict[str, Any]:
+        """Build a static index with full-text (analyzed) fields and wait until it is non-stale."""
+        index_name = f"{collection_name}/TextSearch"
+        definition = IndexDefinition(
+            name=index_name,
+            maps={f"from doc in docs.{collection_name} select new {{ {', '.join(f'doc.{field}' for field in fields)} }}"},
+            fields={field: IndexFieldOptions(indexing=FieldIndexing.SEARCH) for field in fields}
+        )
+        with self.timer.phase('server'):
+            self.store.maintenance.send(PutIndexesOperation(definition))
+            stats = self._wait_for_index(index_name)
+        return {"name": index_name, "documents": stats.entries_count, "size_bytes": self._index_size(index_name)}
 
-    def _create_index_for_collection(self, collection_name: str) -> None:
-        """Create an index for the collection to enable efficient queries."""
-        from ravendb.documents.indexes.definitions import IndexDefinition, IndexFieldOptions
-        from ravendb.documents.operations.indexes import PutIndexesOperation
+    def text_search(self, collection_name: str, fields: List[str], query: TextQuery) -> List[dict]:
+        """search() the full-text index for any term (or a quoted phrase), ordered by score()."""
+        text = f'"{query.text}"' if query.phrase else query.text
+        condition = " or ".join(f"search({field}, $text)" for field in fields)
+        rql = f"from index '{collection_name}/TextSearch' where {condition} order by score() limit {int(query.limit)}"
+        with self.store.open_session() as session:
+            raw = session.advanced.raw_query(rql).add_parameter("text", text)
+            return [self._as_dict(doc) for doc in self.timer.iterate(raw, 'server')]
+
+    # ==================== QUERY COMPILATION (RQL) ====================
+
+    @classmethod
+    def _compile_where(cls, predicate: Predicate, parameters: Dict[str, Any]) -> str:
+        """Compile a predicate to an RQL where condition, adding its constants to `parameters`."""
+        def bind(value: Any) -> str:
+            name = f"p{len(parameters)}"
+            parameters[name] = value
+            return f"${name}"
         
-        # Define index based on collection
-        if collection_name == 'amazon':
-            index_name = f"Amazon/ByScore"
-            index_def = IndexDefinition(
-                name=index_name,
-                maps={f"from doc in docs.{collection_name}s select new {{ doc.Score, doc.Summary }}"}
-            )
-        else:
-            index_name = f"Goodreads/ByRating"
-            index_def = IndexDefinition(
-                name=index_name,
-                maps={f"from doc in docs.{collection_name}s select new {{ doc.rating, doc.review_text }}"}
+        if isinstance(predicate, Comparison):
+            return f"{predicate.field} {_RQL_OPERATORS[predicate.operator]} {bind(predicate.value)}"
+        if isinstance(predicate, Contains):
+            # Case-insensitive substring match, like Mongo's $regex and Arango's CONTAINS(LOWER(...))
+            pattern = "(?i)" + "|".join(re.escape(term) for term in predicate.terms)
+            return f"regex({predicate.field}, {bind(pattern)})"
+        if isinstance(predicate, And):
+            return "(" + " and ".join(cls._compile_where(p, parameters) for p in predicate.predicates) + ")"
+        if isinstance(predicate, Or):
+            return "(" + " or ".join(cls._compile_where(p, parameters) for p in predicate.predicates) + ")"
+        raise TypeError(f"Unsupported predicate: {type(predicate).__name__}")
+
+    @classmethod
+    def _compile_query(
+        cls,
+        collection_name: str,
+        query: Query,
+        index_name: Optional[str] = None
+    ) -> Tuple[str, Dict[str, Any]]:
+        """
+        Compile a query to RQL and its parameters.
+        
+        Grouped queries become dynamic map-reduce queries, which group every document of
+        the collection: they cannot filter documents before grouping and aggregate with
+        count() and sum() only, so averages are selected as sum and count (see run_query).
+        Other queries run against `index_name` when given, else as dynamic collection queries.
+        """
+        parameters: Dict[str, Any] = {}
+        rql = f"from {collection_name}"
+        if query.is_grouped:
+            if query.where is not None:
+                raise ValueError("RavenDB dynamic group-by queries cannot filter documents before grouping")
+            selects = [f"key() as {query.group_by}"]
+            orders = {query.group_by: query.group_by}
+            for name, aggregate in query.aggregates.items():
+                if aggregate.function == 'count':
+                    selects.append(f"count() as {name}")
+                    orders[name] = "count() as long"
+                elif aggregate.function == 'sum':
+                    selects.append(f"sum({aggregate.field}) as {name}")
+                    orders[name] = f"sum({aggregate.field}) as double"
+                elif aggregate.function == 'avg':
+                    selects.append(f"sum({aggregate.field}) as {name}__sum")
+                    selects.append(f"count() as {name}__count")
+                else:
+                    raise ValueError(f"RavenDB dynamic group-by queries do not support {aggregate.function}()")
+            rql += f" group by {query.group_by}"
+            # Sorting on an average (computed client-side) also moves the limit client-side
+            server_side = all(field in orders for field, _ in query.sort)
+            if query.sort and server_side:
+                rql += " order by " + ", ".join(
+                    f"{orders[field]}{'' if ascending else ' desc'}" for field, ascending in query.sort
+                )
+            rql += " select " + ", ".join(selects)
+            if query.limit is not None and server_side:
+                rql += f" limit {int(query.limit)}"
+            return rql, parameters
+        
+        if index_name is not None:
+            rql = f"from index '{index_name}'"
+        if query.where is not None:
+            rql += f" where {cls._compile_where(query.where, parameters)}"
+        if query.sort:
+            # Alphanumeric ordering sorts numbers by value (RQL orders lexically by default), like Mongo and Arango
+            rql += " order by " + ", ".join(
+                f"{field} as alphaNumeric{'' if ascending else ' desc'}" for field, ascending in query.sort
             )
+        if query.select:
+            rql += " select " + ", ".join(query.select)
+        if query.limit is not None:
+            rql += f" limit {int(query.limit)}"
+        return rql, parameters
+
+    def _routed_rql(self, collection_name: str, query: Query) -> Tuple[str, Dict[str, Any]]:
+        """Compile a query to RQL, on the static index when it covers the query's fields."""
+        index_name = None
+        static_index = self._static_indexes.get(collection_name)
+        if static_index is not None and not query.is_grouped and set(query.fields()) <= set(static_index[1]):
+            index_name = static_index[0]
+        return self._compile_query(collection_name, query, index_name)
+
+    def _raw_query(self, session, collection_name: str, query: Query):
+        """Session query running the compiled RQL (see _routed_rql)."""
+        rql, parameters = self._routed_rql(collection_name, query)
+        raw = session.advanced.raw_query(rql)
+        for name, value in parameters.items():
+            raw = raw.add_parameter(name, value)
+        return raw
+
+    def _count_matching(self, session, collection_name: str, query: Query) -> int:
+        """Count the documents matching a query's filter from the index's total, without fetching any."""
+        raw = self._raw_query(session, collection_name, Query(where=query.where, limit=0))
+        with self.timer.phase('server'):
+            return raw.get_query_result().total_results
+
+    def count_query(self, collection_name: str, query: Query) -> int:
+        """Count the documents matching a query's filter."""
+        with self.store.open_session() as session:
+            return self._count_matching(session, collection_name, query)
+
+    def fetch_matches(self, collection_name: str, query: Query) -> int:
+        """Stream every document matching a query's filter in one response."""
+        fetched = 0
+        with self.store.open_session() as session:
+            raw = self._raw_query(session, collection_name, Query(where=query.where))
+            for _ in self.timer.iterate(session.advanced.stream(raw), 'server'):
+                fetched += 1
+        return fetched
+
+    def run_query(self, collection_name: str, query: Query) -> List[dict]:
+        """Run a query compiled to RQL, or read a prepared aggregation from its map-reduce index."""
+        index_name = self._map_reduce_indexes.get(query)
+        if index_name is not None:
+            return self._read_map_reduce(index_name, query.stages()[-1])
+        if query.then is not None:
+            raise ValueError("RavenDB runs chained grouped queries from map-reduce indexes (see create_aggregation_indexes)")
+        with self.store.open_session() as session:
+            raw = self._raw_query(session, collection_name, query)
+            rows = [self._as_dict(doc) for doc in self.timer.iterate(raw, 'server')]
+        if not query.is_grouped:
+            return rows
         
-        try:
-            self.store.maintenance.send(PutIndexesOperation(index_def))
-            print(f"  Created index: {index_name}")
-            
-            # Wait for index to be non-stale
-            import time
-            print(f"  Waiting for index to complete...")
-            time.sleep(5)  # Give RavenDB time to index
-        except Exception as e:
-            print(f"  Note creating index: {e}")
+        for row in rows:
+            for name, aggregate in query.aggregates.items():
+                if aggregate.function == 'avg':
+                    total, count = row.pop(f"{name}__sum"), row.pop(f"{name}__count")
+                    row[name] = total / count if count else None
+        # Sorts on averages could not run on the server (see _compile_query)
+        if any(field in query.aggregates and query.aggregates[field].function == 'avg' for field, _ in query.sort):
+            for field, ascending in reversed(query.sort):
+                rows.sort(key=lambda row: row[field] if row[field] is not None else float('-inf'), reverse=not ascending)
+            if query.limit is not None:
+                rows = rows[:query.limit]
+        return rows
+
+    # ==================== AGGREGATIONS (MAP-REDUCE) ====================
+
+    @classmethod
+    def _compile_linq_filter(cls, predicate: Predicate) -> str:
+        """Compile a predicate to a C# condition on `doc` for an index map."""
+        if isinstance(predicate, Comparison):
+            return f"doc.{predicate.field} {predicate.operator} {json.dumps(predicate.value)}"
+        if isinstance(predicate, Contains):
+            field = f"doc.{predicate.field}"
+            return f"({field} != null && (" + " || ".join(
+                f"{field}.ToString().ToLower().Contains({json.dumps(term)})" for term in predicate.terms
+            ) + "))"
+        if isinstance(predicate, And):
+            return "(" + " && ".join(cls._compile_linq_filter(p) for p in predicate.predicates) + ")"
+        if isinstance(predicate, Or):
+            return "(" + " || ".join(cls._compile_linq_filter(p) for p in predicate.predicates) + ")"
+        raise TypeError(f"Unsupported predicate: {type(predicate).__name__}")
+
+    @classmethod
+    def _map_reduce_definition(
+        cls,
+        index_name: str,
+        source: str,
+        query: Query,
+        output_collection: Optional[str] = None
+    ) -> IndexDefinition:
+        """
+        Compile one grouped query to a map-reduce index over the `source` collection.
+        
+        The reduce output must have the shape of the map output, so each document maps
+        to a one-document group (count 1, its own value as sum, min, max and average);
+        averages carry their sum and count so partial groups can be reduced again.
+        """
+        group = query.group_by
+        mapped = {group: f"doc.{group}"}
+        reduced = {group: "grouping.Key"}
+        for name, aggregate in query.aggregates.items():
+            value = f"doc.{aggregate.field}"
+            if aggregate.function == 'count':
+                mapped[name] = "1"
+                reduced[name] = f"grouping.Sum(x => x.{name})"
+            elif aggregate.function == 'avg':
+                mapped.update({f"{name}__sum": value, f"{name}__count": "1", name: value})
+                total, count = f"grouping.Sum(x => (double)x.{name}__sum)", f"grouping.Sum(x => x.{name}__count)"
+                reduced.update({f"{name}__sum": total, f"{name}__count": count, name: f"{total} / {count}"})
+            else:
+                mapped[name] = value
+                reduced[name] = f"grouping.{aggregate.function.capitalize()}(x => (double)x.{name})"
+        
+        def select(fields: Dict[str, str]) -> str:
+            return "select new { " + ", ".join(f"{name} = {expr}" for name, expr in fields.items()) + " }"
+        
+        where = f" where {cls._compile_linq_filter(query.where)}" if query.where is not None else ""
+        return IndexDefinition(
+            name=index_name,
+            maps={f"from doc in docs.{source}{where} {select(mapped)}"},
+            reduce=f"from result in results group result by result.{group} into grouping {select(reduced)}",
+            output_reduce_to_collection=output_collection
+        )
+
+    def create_aggregation_indexes(self, collection_name: str, aggregations: Dict[str, Query]) -> Dict[str, Dict[str, Any]]:
+        """
+        Build one map-reduce index per aggregation stage and wait until each is non-stale.
+        
+        Chained stages are cascaded: a stage writes its reduce results to a collection
+        (OutputReduceToCollection) that the next stage's index maps. Only the final
+        stage's index is queried, so earlier stages cannot sort or limit their rows.
+        """
+        built = {}
+        for name, query in aggregations.items():
+            stages = query.stages()
+            if any(stage.sort or stage.limit is not None for stage in stages[:-1]):
+                raise ValueError(f"Aggregation {name}: RavenDB cannot sort or limit a stage followed by another")
+            source = collection_name
+            for i, stage in enumerate(stages):
+                index_name = f"{collection_name}/Aggregation/{name}" + (f"/{i}" if i else "")
+                output = f"{collection_name}_{name}_{i + 1}" if i + 1 < len(stages) else None
+                definition = self._map_reduce_definition(index_name, source, stage, output)
+                
+                start = time.perf_counter()
+                with self.timer.phase('server'):
+                    self.store.maintenance.send(PutIndexesOperation(definition))
+                    stats = self._wait_for_index(index_name)
+                built[index_name] = {
+                    "stage": i,
+                    "build_seconds": round(time.perf_counter() - start, 4),
+                    "size_bytes": self._index_size(index_name),
+                    "entries": stats.entries_count,
+                }
+                source = output
+            self._map_reduce_indexes[query] = index_name
+        return built
+
+    def _read_map_reduce(self, index_name: str, stage: Query) -> List[dict]:
+        """Query the reduce results of a map-reduce index, sorted and limited like the stage."""
+        rql = f"from index '{index_name}'"
+        if stage.sort:
+            # Aggregates are compared as numbers; group keys alphanumerically (numbers by value)
+            rql += " order by " + ", ".join(
+                f"{field} as {'double' if field in stage.aggregates else 'alphaNumeric'}{'' if ascending else ' desc'}"
+                for field, ascending in stage.sort
+            )
+        if stage.limit is not None:
+            rql += f" limit {int(stage.limit)}"
+        fields = [stage.group_by, *stage.aggregates]
+        with self.store.open_session() as session:
+            raw = session.advanced.raw_query(rql)
+            rows = [self._as_dict(doc) for doc in self.timer.iterate(raw, 'server')]
+        return [{field: row.get(field) for field in fields} for row in rows]
 
     def read_data(self, collection_name: str) -> None:
         """Perform read operations on RavenDB collection with realistic queries."""
+        query_latency = self.latency("query")
+        
         with self.store.open_session() as session:
             # Read one document
-            results = list(session.advanced.document_query(collection_name=collection_name).take(1))
+            with self.timer.phase('server'), query_latency.time():
+                results = list(session.advanced.document_query(collection_name=collection_name).take(1))
             if results:
                 print(f"  Read 1 document from {collection_name}")
             
             # Count matching documents (same as MongoDB/ArangoDB)
-            # RavenDB needs to iterate to count since count_lazily requires index
-            if collection_name == 'amazon':
-                # Amazon: Score > 4 - use statistics from query
-                query = (
-                    session.advanced.document_query(collection_name=collection_name)
-                    .where_greater_than("Score", 4)
-                )
-            else:
-                # Goodreads: rating >= 3
-                query = (
-                    session.advanced.document_query(collection_name=collection_name)
-                    .where_greater_than_or_equal("rating", 3)
-                )
-            
-            # Execute query and get count from statistics
-            # This scans all matching docs but only returns count
-            count = 0
-            for _ in query:
-                count += 1
+            with query_latency.time():
+                count = self._count_matching(session, collection_name, self.dataset_query(collection_name))
             
             print(f"  Found {count} documents matching query")
 
-    def update_data(self, collection_name: str, limit: int = 10000) -> int:
+    @contextmanager
+    def open_query_worker(self, collection_name: str):
+        """Yield a function running the count query in a fresh session (the store is shared; sessions are not)."""
+        query = self.dataset_query(collection_name)
+        yield lambda: self.count_query(collection_name, query)
+
+    # ==================== SINGLE-RECORD OPERATIONS (YCSB) ====================
+
+    @staticmethod
+    def _as_dict(doc: Any) -> Optional[dict]:
+        """Loaded documents come back as dicts or as objects, depending on their type metadata."""
+        if doc is None or isinstance(doc, dict):
+            return doc
+        return {k: v for k, v in doc.__dict__.items() if not k.startswith('_')}
+
+    def sample_keys(self, collection_name: str, limit: int) -> List[Any]:
+        """
+        Return up to `limit` document IDs of the collection, in id() order.
+        
+        RavenDB orders IDs as strings, so HiLo IDs ("reviews/10-A" before "reviews/9-A")
+        are not in generation order as Mongo's ObjectIds and Arango's numeric keys are;
+        the `latest` YCSB distribution therefore favours different keys on RavenDB.
+        """
+        rql = f"from {collection_name} order by id() limit {int(limit)}"
+        with self.store.open_session() as session:
+            with self.timer.phase('server'):
+                keys = [item.key for item in session.advanced.stream(session.advanced.raw_query(rql))]
+        if keys:
+            self._id_prefixes[collection_name] = keys[0].rsplit('/', 1)[0] + '/'
+        return keys
+
+    def read_record(self, collection_name: str, key: Any) -> Optional[dict]:
+        """Fetch one document by ID."""
+        with self.store.open_session() as session:
+            with self.timer.phase('server'):
+                return self._as_dict(session.load(key))
+
+    def read_records(self, collection_name: str, keys: List[Any]) -> int:
+        """Fetch many documents by ID with one session.load call."""
+        with self.store.open_session() as session:
+            with self.timer.phase('server'):
+                docs = session.load(list(keys))
+        return sum(doc is not None for doc in docs.values())
+
+    def update_record(self, collection_name: str, key: Any, fields: Dict[str, Any]) -> None:
+        """Set fields on one document by ID with a patch (no load round trip)."""
+        with self.store.open_session() as session:
+            for field, value in fields.items():
+                session.advanced.patch(key, field, value)
+            with self.timer.phase('server'):
+                session.save_changes()
+
+    def insert_record(self, collection_name: str, document: Dict[str, Any]) -> Any:
+        """Insert one document under the collection's ID prefix and return its ID."""
+        key = f"{self._id_prefixes.get(collection_name, collection_name + '/')}ycsb-{uuid.uuid4().hex}"
+        command = PutDocumentCommand(key, None, {**document, "@metadata": {"@collection": collection_name}})
+        with self.timer.phase('server'):
+            self.store.get_request_executor().execute_command(command)
+        return key
+
+    def scan_records(self, collection_name: str, start_key: Any, count: int) -> int:
+        """Read up to `count` documents following `start_key` in ID order."""
+        prefix = self._id_prefixes.get(collection_name, start_key.rsplit('/', 1)[0] + '/')
+        with self.store.open_session() as session:
+            with self.timer.phase('server'):
+                return len(session.load_starting_with(prefix, start_after=start_key, page_size=count))
+
+    def _run_set_operation(self, operation_class, rql: str, parameters: Dict[str, Any]) -> int:
+        """
+        Start a set-based operation (patch or delete by query) and track it by its operation ID.
+        
+        The operation state is polled more often than Operation.wait_for_completion
+        (every 0.5 s), so the measured time stays close to the server's, and the
+        processed/total progress is printed while it runs.
+        
+        Stale indexes are not allowed: the query usually runs on an auto-index created by
+        this very query or made stale by the preceding mutation, and a stale index would
+        silently skip documents it has not indexed yet.
+        
+        Returns:
+            Number of documents the operation processed
+            
+        Raises:
+            TimeoutError: If the index is still stale after OPERATION_STALE_TIMEOUT
+            RuntimeError: If the operation fails or is canceled
+        """
+        index_query = IndexQuery(rql)
+        index_query.query_parameters = Parameters(parameters)
+        options = QueryOperationOptions(allow_stale=False, stale_timeout=timedelta(seconds=OPERATION_STALE_TIMEOUT))
+        request_executor = self.store.get_request_executor()
+        command = operation_class(index_query, options).get_command(self.store, request_executor.conventions)
+        request_executor.execute_command(command)
+        operation_id = command.result.operation_id
+        state_operation = GetOperationStateOperation(operation_id, command.result.operation_node_tag)
+        
+        last_report = time.perf_counter()
+        while True:
+            state = self.store.maintenance.send(state_operation) or {}
+            status = state.get("Status")
+            if status == "Completed":
+                return (state.get("Result") or {}).get("Total", 0)
+            if status == "Faulted" and "Timeout" in str((state.get("Result") or {}).get("Type", "")):
+                raise TimeoutError(f"Operation {operation_id} ({operation_class.__name__}): index still stale "
+                                   f"after {OPERATION_STALE_TIMEOUT}s")
+            if status in ("Faulted", "Canceled"):
+                raise RuntimeError(f"Operation {operation_id} ({operation_class.__name__}) {status.lower()}: {state.get('Result')}")
+            if time.perf_counter() - last_report >= OPERATION_PROGRESS_INTERVAL:
+                progress = state.get("Progress") or {}
+                print(f"  Operation {operation_id}: {progress.get('Processed', 0)}/{progress.get('Total', '?')} documents processed")
+                last_report = time.perf_counter()
+            time.sleep(OPERATION_POLL_INTERVAL)
+
+    def update_data(self, collection_name: str, limit: int = 10000, server_side: bool = False) -> int:
         """Update documents in RavenDB collection using realistic queries."""
         updated_count = 0
+        # Dataset-specific query for selecting documents to update
+        query = Query(where=self.dataset_query(collection_name).where, limit=limit)
         
-        with self.store.open_session() as session:
-            # Dataset-specific query for selecting documents to update
-            # Note: RavenDB search() requires full-text indexes, so we use simpler filters
-            if collection_name == 'amazon':
-                # Amazon: Score > 4
-                docs = list(
-                    session.advanced.document_query(collection_name=collection_name)
-                    .where_greater_than("Score", 4)
-                    .take(limit)
-                )
-            else:
-                # Goodreads: rating >= 3
-                docs = list(
-                    session.advanced.document_query(collection_name=collection_name)
-                    .where_greater_than_or_equal("rating", 3)
-                    .take(limit)
+        if server_side:
+            # Patch by query: the server selects and patches every match, none is loaded
+            # (no limit, like Mongo's update_many and the server-side AQL UPDATE)
+            rql, parameters = self._routed_rql(collection_name, Query(where=query.where))
+            with self.timer.phase('server'), self.latency("update").time():
+                updated_count = self._run_set_operation(
+                    PatchByQueryOperation, rql + " update { this.benchmark_updated = true; }", parameters
                 )
+            print(f"  Updated {updated_count} documents")
+            return updated_count
+        
+        with self.store.open_session() as session:
+            with self.timer.phase('server'), self.latency("query").time():
+                docs = list(self._raw_query(session, collection_name, query))
             
             for doc in docs:
                 if hasattr(doc, 'benchmark_updated'):
@@ -183,32 +608,33 @@ class RavenBenchmark(DatabaseBenchmark):
                 else:
                     doc['benchmark_updated'] = True
                 updated_count += 1
-            session.save_changes()
+            with self.timer.phase('server'), self.latency("update").time():
+                session.save_changes()
         
         print(f"  Updated {updated_count} documents")
         return updated_count
 
-    def delete_data(self, collection_name: str) -> int:
-        """Delete updated documents from RavenDB collection."""
-        deleted_count = 0
+    def delete_data(self, collection_name: str, server_side: bool = False) -> int:
+        """
+        Delete every updated document with one delete-by-query operation.
         
-        with self.store.open_session() as session:
-            docs = list(
-                session.advanced.document_query(collection_name=collection_name)
-                .where_equals("benchmark_updated", True)
-                .take(1000)
+        Set-based in both modes, like Mongo's delete_many: loading the flagged documents
+        into a session to delete them one by one is bounded by the session's request limit.
+        """
+        with self.timer.phase('server'), self.latency("delete").time():
+            return self._run_set_operation(
+                DeleteByQueryOperation, f"from {collection_name} where benchmark_updated = $flag", {"flag": True}
             )
-            for doc in docs:
-                session.delete(doc)
-                deleted_count += 1
-            session.save_changes()
-        
-        return deleted_count
 
     def export_data(self, collection_name: str) -> str:
         """Export RavenDB collection using streaming with fallback to pagination."""
         export_path = os.path.join(self.results_dir, f"export_{collection_name}_raven.json")
         
+        dumps_line = self.timer.timed('encode', self.codec.dumps_line)
+        self.record_metric("codec", self.codec.name)
+        page_latency = self.latency("export_page")
+        page_size = 1000
+        
         total_exported = 0
         
         try:
@@ -217,19 +643,36 @@ class RavenBenchmark(DatabaseBenchmark):
                 query = session.advanced.document_query(collection_name=collection_name)
                 stream_results = session.advanced.stream(query)
                 
-                with open(export_path, "w") as f:
-                    for item in stream_results:
+                with open(export_path, "wb") as f:
+                    write = self.timer.timed('write', f.write)
+                    # A stream is one response; its fetch time is recorded per `page_size` documents
+                    items = iter(stream_results)
+                    fetch_ns = 0
+                    fetched = 0
+                    while True:
+                        start = time.perf_counter_ns()
+                        with self.timer.phase('server'):
+                            item = next(items, None)
+                        fetch_ns += time.perf_counter_ns() - start
+                        if item is None:
+                            break
+                        fetched += 1
+                        if fetched == page_size:
+                            page_latency.record(fetch_ns)
+                            fetch_ns = fetched = 0
                         try:
                             doc = item.document
                             if '@metadata' in doc:
                                 del doc['@metadata']
-                            f.write(json.dumps(doc, default=str) + "\n")
+                            write(dumps_line(doc))
                             total_exported += 1
                             if total_exported % 100000 == 0:
                                 print(f"  Export progress: {total_exported} documents written...")
                         except Exception as e:
                             # Skip problematic documents
                             continue
+                    if fetched:
+                        page_latency.record(fetch_ns)
             
             print(f"Exported {total_exported} documents to {export_path}")
             
@@ -237,17 +680,18 @@ class RavenBenchmark(DatabaseBenchmark):
             print(f"  Stream failed at {total_exported} docs, falling back to pagination...")
             
             # Fallback to pagination-based export
-            page_size = 1000
             skip = total_exported  # Resume from where streaming failed
             
-            with open(export_path, "a") as f:  # Append to what we already wrote
+            with open(export_path, "ab") as f:  # Append to what we already wrote
+                write = self.timer.timed('write', f.write)
                 while True:
                     with self.store.open_session() as session:
-                        docs = list(
-                            session.advanced.document_query(collection_name=collection_name)
-                            .skip(skip)
-                            .take(page_size)
-                        )
+                        with self.timer.phase('server'), page_latency.time():
+                            docs = list(
+                                session.advanced.document_query(collection_name=collection_name)
+                                .skip(skip)
+                                .take(page_size)
+                            )
                         
                         if not docs:
                             break
@@ -259,7 +703,7 @@ class RavenBenchmark(DatabaseBenchmark):
                                                if not k.startswith('_')}
                                 else:
                                     doc_dict = dict(doc) if isinstance(doc, dict) else {}
-                                f.write(json.dumps(doc_dict, default=str) + "\n")
+                                write(dumps_line(doc_dict))
                                 total_exported += 1
                             except Exception:
                                 continue